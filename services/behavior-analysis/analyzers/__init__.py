@@ -5,6 +5,15 @@ from .hand_gesture_analyzer import HandGestureAnalyzer, HandGestureMetrics
 from .audio_analyzer import AudioAnalyzer, AudioMetrics
 from .stress_heatmap import StressHeatmapGenerator, HeatmapFrame
 from .confidence_stress_engine import ConfidenceStressEngine, ConfidenceIndex, BehaviorSnapshot, BehaviorAlert
+from .model_pool import ModelPool, face_mesh_pool, face_detection_pool, hands_pool, holistic_pool
+from .frame_preprocessor import AnalysisFrame, FramePreprocessor
+from .landmark_predictor import LandmarkPredictor
+from .holistic_analyzer import HolisticAnalyzer, LandmarkSet, PostureMetrics
+from .inference_backend import InferenceBackend, Landmarks, MediaPipeBackend, get_backend
+from .micro_batcher import MicroBatcher
+from .audio_frontend import AudioFeatures, AudioFrontend, AudioRingBuffer
+from .pitch_engine import PitchEngine, get_pitch_engine
+from .voice_activity import VoiceActivityDetector
 
 __all__ = [
     "FaceAnalyzer", "FaceSnapshot", "EyeMetrics", "MicroExpressionMetrics",
@@ -12,4 +21,10 @@ __all__ = [
     "AudioAnalyzer", "AudioMetrics",
     "StressHeatmapGenerator", "HeatmapFrame",
     "ConfidenceStressEngine", "ConfidenceIndex", "BehaviorSnapshot", "BehaviorAlert",
+    "ModelPool", "face_mesh_pool", "face_detection_pool", "hands_pool", "holistic_pool",
+    "AnalysisFrame", "FramePreprocessor", "LandmarkPredictor",
+    "HolisticAnalyzer", "LandmarkSet", "PostureMetrics",
+    "InferenceBackend", "Landmarks", "MediaPipeBackend", "get_backend", "MicroBatcher",
+    "AudioFeatures", "AudioFrontend", "AudioRingBuffer", "PitchEngine", "get_pitch_engine",
+    "VoiceActivityDetector",
 ]
@@ -8,6 +8,12 @@ Processes raw PCM/WAV audio chunks for:
   - Volume stability
   - Pitch contour analysis
   - Stress vocal indicators (pressed voice, vocal fry)
+  - Voice activity gating: only speech frames reach pitch / speech-rate analysis
+
+Audio arrives either as self-contained ~1 s chunks (process_chunk) or as
+a stream of chunks of any size (push): streamed samples go into a ring
+buffer and the latest window is analyzed once per hop, so frames that
+straddle chunk boundaries are kept and metrics follow the hop rate.
 """
 
 import time
@@ -17,11 +23,9 @@ from typing import List, Optional
 
 import numpy as np
 
-try:
-    import librosa
-    HAS_LIBROSA = True
-except ImportError:
-    HAS_LIBROSA = False
+from .audio_frontend import AudioFeatures, AudioFrontend, AudioRingBuffer
+from .pitch_engine import get_pitch_engine
+from .voice_activity import VoiceActivityDetector
 
 
 @dataclass
@@ -60,18 +64,32 @@ class AudioMetrics:
     # Composite
     vocal_confidence: float               # 0-100
 
+    # Voice activity gate
+    vad_skipped_ratio: float = 0.0        # share of this window's frames kept from pitch analysis
+
 
 class AudioAnalyzer:
     """Real-time audio analysis for behavioral indicators."""
 
     SAMPLE_RATE = 16000          # Expected sample rate
-    CHUNK_DURATION_MS = 1000     # Expected chunk size from client
+    CHUNK_DURATION_MS = 1000     # Expected chunk size from client (= streaming analysis window)
+    STREAM_HOP_MS = 250          # Streaming: analyze the latest window this often
     SILENCE_THRESHOLD_DB = -40   # Below this = silence
     MIN_PITCH_HZ = 50
     MAX_PITCH_HZ = 500
 
-    def __init__(self, sample_rate: int = 16000):
+    def __init__(self, sample_rate: int = 16000, pitch_engine: Optional[str] = None,
+                 window_ms: float = CHUNK_DURATION_MS, hop_ms: float = STREAM_HOP_MS,
+                 vad: bool = True):
         self.sample_rate = sample_rate
+        # One framed rfft per chunk feeds every metric (see audio_frontend.py)
+        self._frontend = AudioFrontend(sample_rate)
+        # F0 tracker (see pitch_engine.py)
+        self._pitch_engine = get_pitch_engine(
+            pitch_engine, sample_rate=sample_rate, fmin=self.MIN_PITCH_HZ, fmax=self.MAX_PITCH_HZ,
+        )
+        # Frame-level speech gate in front of the pitch / speech-rate stages (see voice_activity.py)
+        self._vad = VoiceActivityDetector(self.SILENCE_THRESHOLD_DB) if vad else None
 
         # Rolling state
         self._pitch_history: deque = deque(maxlen=300)  # ~5 min at 1 chunk/sec
@@ -84,25 +102,85 @@ class AudioAnalyzer:
         self._pitch_baseline: Optional[float] = None
         self._frame_count: int = 0
 
+        # Streaming ingest (push): latest window of samples, analyzed every hop
+        self._window = max(1, int(sample_rate * window_ms / 1000))
+        self._hop = max(1, int(sample_rate * hop_ms / 1000))
+        self._ring = AudioRingBuffer(self._window)
+        self._since_hop: int = 0        # samples pushed since the last analysis
+        self._since_record: int = 0     # samples analyzed since the histories last advanced
+
     def process_chunk(self, audio_data: np.ndarray, timestamp: Optional[float] = None) -> AudioMetrics:
         """
         Process a single audio chunk (1D float32 array, mono, 16kHz).
         """
-        now = timestamp or time.time()
-        self._frame_count += 1
+        return self._analyze(self._normalize(audio_data), timestamp or time.time())
 
-        # Ensure float32 normalized
+    def push(self, audio_data: np.ndarray, timestamp: Optional[float] = None) -> List[AudioMetrics]:
+        """
+        Stream samples of any chunk size (e.g. 20 ms WebRTC frames).
+
+        Returns the metrics of every hop completed by these samples (often
+        none), each over the latest window and stamped with the time its
+        hop ended, counting back from `timestamp` (end of this chunk).
+        """
+        now = timestamp or time.time()
+        audio_data = self._normalize(audio_data)
+        results = []
+        offset = 0
+        while offset < len(audio_data):
+            take = min(self._hop - self._since_hop, len(audio_data) - offset)
+            self._ring.write(audio_data[offset:offset + take])
+            offset += take
+            self._since_hop += take
+            if self._since_hop < self._hop:
+                break
+            self._since_hop = 0
+            if self._ring.filled < self._frontend.frame_length:
+                continue    # not one analysis frame yet
+            # Rolling histories and baselines advance once per window of audio, as in chunk mode
+            self._since_record += self._hop
+            record = self._since_record >= self._window
+            if record:
+                self._since_record -= self._window
+            at = now - (len(audio_data) - offset) / self.sample_rate
+            results.append(self._analyze(self._ring.latest(), at, record))
+        return results
+
+    def vad_stats(self) -> dict:
+        """Voice activity gate counters (empty with the gate off)."""
+        return self._vad.stats() if self._vad is not None else {}
+
+    @staticmethod
+    def _normalize(audio_data: np.ndarray) -> np.ndarray:
+        """Ensure float32 normalized."""
         if audio_data.dtype != np.float32:
             audio_data = audio_data.astype(np.float32)
-        if np.max(np.abs(audio_data)) > 1.0:
+        if len(audio_data) and np.max(np.abs(audio_data)) > 1.0:
             audio_data = audio_data / 32768.0
+        return audio_data
+
+    def _analyze(self, audio_data: np.ndarray, now: float, record: bool = True) -> AudioMetrics:
+        """Metrics over one window; `record` advances the rolling histories and baselines."""
+        if record:
+            self._frame_count += 1
+
+        features = self._frontend.analyze(audio_data)
+
+        # ── Voice activity ───────────────────────────────────────────────
+        speaking, skipped = True, 0.0
+        if self._vad is not None:
+            features.active = self._vad.detect(features)
+            speaking = bool(features.active.any())
+            if features.n_frames:
+                skipped = 1.0 - float(features.active.mean())
 
         # ── Volume analysis ──────────────────────────────────────────────
-        rms = float(np.sqrt(np.mean(audio_data ** 2)) + 1e-10)
+        rms = features.rms
         rms_db = 20 * np.log10(rms + 1e-10)
-        self._volume_history.append(rms_db)
+        if record:
+            self._volume_history.append(rms_db)
 
-        if self._frame_count <= 30 and rms_db > self.SILENCE_THRESHOLD_DB:
+        if record and self._frame_count <= 30 and rms_db > self.SILENCE_THRESHOLD_DB:
             if self._volume_baseline is None:
                 self._volume_baseline = rms_db
             else:
@@ -131,11 +209,14 @@ class AudioAnalyzer:
         silence_ratio = sum(d for _, d in silence_30s) / 30000 if silence_30s else 0
 
         # ── Pitch analysis ───────────────────────────────────────────────
-        pitch_mean, pitch_std, jitter, shimmer = self._analyze_pitch(audio_data)
-        if pitch_mean > 0:
+        if speaking:
+            pitch_mean, pitch_std, jitter, shimmer = self._analyze_pitch(features)
+        else:
+            pitch_mean, pitch_std, jitter, shimmer = 0.0, 0.0, 0.0, 0.0
+        if record and pitch_mean > 0:
             self._pitch_history.append(pitch_mean)
 
-        if self._frame_count <= 30 and pitch_mean > 0:
+        if record and self._frame_count <= 30 and pitch_mean > 0:
             if self._pitch_baseline is None:
                 self._pitch_baseline = pitch_mean
             else:
@@ -144,8 +225,9 @@ class AudioAnalyzer:
         tremor_score = self._compute_tremor_score(jitter, shimmer)
 
         # ── Speech rate estimation ───────────────────────────────────────
-        speech_rate, syllable_rate = self._estimate_speech_rate(audio_data)
-        self._speech_rate_history.append(speech_rate)
+        speech_rate, syllable_rate = self._estimate_speech_rate(features) if speaking else (0.0, 0.0)
+        if record:
+            self._speech_rate_history.append(speech_rate)
         rate_stability = self._compute_rate_stability()
 
         # ── Prosody ──────────────────────────────────────────────────────
@@ -179,29 +261,17 @@ class AudioAnalyzer:
             vocal_fry_detected=vocal_fry,
             pressed_voice_detected=pressed,
             vocal_confidence=round(confidence, 1),
+            vad_skipped_ratio=round(skipped, 3),
         )
 
-    # ── Pitch analysis (F0 via autocorrelation) ──────────────────────────────────
+    # ── Pitch analysis (F0 via the pitch engine) ─────────────────────────────────
 
-    def _analyze_pitch(self, audio: np.ndarray) -> tuple:
+    def _analyze_pitch(self, features: AudioFeatures) -> tuple:
         """Extract F0, jitter, shimmer from audio chunk."""
-        if len(audio) < 512:
+        if len(features.audio) < 512:
             return 0.0, 0.0, 0.0, 0.0
 
-        if HAS_LIBROSA:
-            try:
-                f0, voiced, _ = librosa.pyin(
-                    audio,
-                    fmin=self.MIN_PITCH_HZ,
-                    fmax=self.MAX_PITCH_HZ,
-                    sr=self.sample_rate,
-                    frame_length=2048,
-                )
-                valid_f0 = f0[voiced & ~np.isnan(f0)] if f0 is not None else np.array([])
-            except Exception:
-                valid_f0 = np.array([])
-        else:
-            valid_f0 = self._autocorrelation_pitch(audio)
+        valid_f0 = self._pitch_engine.track(features)
 
         if len(valid_f0) < 2:
             return 0.0, 0.0, 0.0, 0.0
@@ -213,50 +283,40 @@ class AudioAnalyzer:
         periods = 1.0 / (valid_f0 + 1e-6)
         jitter = float(np.mean(np.abs(np.diff(periods))) / (np.mean(periods) + 1e-6) * 100)
 
-        # Shimmer: amplitude variation (approximated)
+        # Shimmer: amplitude variation (approximated), peak |amplitude| per pitch period,
+        # within each contiguous voice-active run so no period spans a gap
         frame_size = int(self.sample_rate / (pitch_mean + 1e-6))
-        if frame_size > 0 and frame_size < len(audio):
-            amplitudes = []
-            for start in range(0, len(audio) - frame_size, frame_size):
-                amplitudes.append(np.max(np.abs(audio[start:start + frame_size])))
-            if len(amplitudes) > 1:
-                amps = np.array(amplitudes)
-                shimmer = float(np.mean(np.abs(np.diff(amps))) / (np.mean(amps) + 1e-6) * 100)
-            else:
-                shimmer = 0.0
+        amp_sum, diff_sum, n_amps, n_diffs = 0.0, 0.0, 0, 0
+        for start, end in features.active_runs() if frame_size > 0 else ():
+            n_periods = (end - start) // frame_size
+            if n_periods < 2:
+                continue
+            segment = features.audio[start:start + n_periods * frame_size]
+            amps = np.abs(segment).reshape(n_periods, frame_size).max(axis=1)
+            amp_sum += float(amps.sum())
+            diff_sum += float(np.abs(np.diff(amps)).sum())
+            n_amps += n_periods
+            n_diffs += n_periods - 1
+        if n_diffs:
+            shimmer = diff_sum / n_diffs / (amp_sum / n_amps + 1e-6) * 100
         else:
             shimmer = 0.0
 
         return pitch_mean, pitch_std, jitter, shimmer
 
-    def _autocorrelation_pitch(self, audio: np.ndarray) -> np.ndarray:
-        """Fallback pitch detection via autocorrelation (no librosa)."""
-        # Simple frame-by-frame autocorrelation
-        frame_len = 2048
-        hop = 512
-        pitches = []
-
-        for start in range(0, len(audio) - frame_len, hop):
-            frame = audio[start:start + frame_len]
-            frame = frame * np.hanning(len(frame))
-            corr = np.correlate(frame, frame, mode='full')
-            corr = corr[len(corr) // 2:]
-
-            # Find first peak after minimum lag
-            min_lag = int(self.sample_rate / self.MAX_PITCH_HZ)
-            max_lag = int(self.sample_rate / self.MIN_PITCH_HZ)
-            if max_lag >= len(corr):
-                continue
-            segment = corr[min_lag:max_lag]
-            if len(segment) == 0 or np.max(segment) < 0.1 * corr[0]:
-                continue
-            peak = np.argmax(segment) + min_lag
-            if peak > 0:
-                f0 = self.sample_rate / peak
-                if self.MIN_PITCH_HZ <= f0 <= self.MAX_PITCH_HZ:
-                    pitches.append(f0)
+    # ── Voice tremor ─────────────────────────────────────────────────────────────
 
-        return np.array(pitches) if pitches else np.array([])
+    def _compute_tremor_score(self, jitter: float, shimmer: float) -> float:
+        """0-100 from frame-to-frame F0 jitter and per-period shimmer (a steady voice stays low).
+
+        Each measure counts from just above what a steady voice reads through
+        the frontend (≤0.3% jitter, ≤1% shimmer); jitter saturates just under the
+        5% at which vocal fry is flagged. Jitter weighs more: a
+        4–7 Hz physiological tremor shows in F0 before it shows in amplitude.
+        """
+        jitter_score = (jitter - 0.5) * 25       # ≤0.5% is steady, 4.5% saturates
+        shimmer_score = (shimmer - 3.0) * 5      # ≤3% is steady, 23% saturates
+        return float(max(0, min(100, 0.6 * jitter_score + 0.4 * shimmer_score)))
 
     # ── Volume stability ─────────────────────────────────────────────────────────
 
@@ -277,28 +337,23 @@ class AudioAnalyzer:
 
     # ── Speech rate estimation ───────────────────────────────────────────────────
 
-    def _estimate_speech_rate(self, audio: np.ndarray) -> tuple:
+    def _estimate_speech_rate(self, features: AudioFeatures) -> tuple:
         """Estimate WPM from energy envelope peaks (syllable counting)."""
-        # Compute envelope
-        abs_audio = np.abs(audio)
-        # Smooth with moving average
-        kernel_size = max(1, int(self.sample_rate * 0.02))  # 20ms window
-        if len(abs_audio) > kernel_size:
-            kernel = np.ones(kernel_size) / kernel_size
-            envelope = np.convolve(abs_audio, kernel, mode='same')
-        else:
-            envelope = abs_audio
+        # Per-frame RMS envelope (16 ms hop) from the shared frontend
+        envelope = features.envelope
+        if len(envelope) < 2:
+            return 0.0, 0.0
 
         # Find peaks above threshold (syllable nuclei)
         threshold = np.mean(envelope) * 1.2
         above = envelope > threshold
 
-        # Count transitions (rising edges = syllable onsets)
-        transitions = np.diff(above.astype(int))
-        syllable_count = np.sum(transitions == 1)
+        # Count transitions (rising edges = syllable onsets) that come with spectral change
+        onsets = np.flatnonzero(np.diff(above.astype(int)) == 1) + 1
+        syllable_count = int(np.count_nonzero(features.flux[onsets] > 0))
 
         # Duration in seconds
-        duration_s = len(audio) / self.sample_rate
+        duration_s = features.duration_s
         syllable_rate = syllable_count / (duration_s + 1e-6)
 
         # Approximate WPM (avg 1.5 syllables per word)
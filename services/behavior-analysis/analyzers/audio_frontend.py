@@ -0,0 +1,220 @@
+"""
+Audio Frontend — One spectral pass per audio chunk, shared by every metric.
+
+Volume, silence, syllable onsets, pitch and tremor used to walk the raw
+samples separately (RMS, a 20 ms moving-average envelope, 2048-sample
+pitch frames, ...). AudioFrontend frames a chunk once (64 ms Hann
+windows, 16 ms hop) and runs one rfft; AudioFeatures derives everything
+else from that spectrum, each feature at most once and only when read:
+
+  - frame_energy / envelope: per-frame mean square (Parseval) and its root
+  - flux: half-wave rectified spectral flux (spectral change per frame)
+  - flatness: spectral flatness over the speech band (noise → 1, voice → 0)
+  - autocorrelation: per-frame autocorrelation (irfft of the power
+    spectrum), normalized; only for the voice-active frames once a VAD
+    mask is set (voice_activity.py)
+  - periodicity: the autocorrelation divided by the window's own, so a
+    periodic frame peaks near 1 at its period (Boersma, 1993)
+
+AudioRingBuffer is the streaming ingest side: it holds the latest
+analysis window of samples so chunks of any size can be analyzed on an
+overlapping hop.
+"""
+
+from functools import cached_property, lru_cache
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+
+def frame_signal(audio: np.ndarray, frame_length: int, hop: int) -> np.ndarray:
+    """Read-only (n_frames, frame_length) view of `audio`, one row per hop."""
+    audio = np.ascontiguousarray(audio)
+    n_frames = 1 + (len(audio) - frame_length) // hop
+    if n_frames <= 0:
+        return np.empty((0, frame_length), dtype=audio.dtype)
+    stride = audio.strides[0]
+    return as_strided(audio, shape=(n_frames, frame_length), strides=(hop * stride, stride), writeable=False)
+
+
+def fft_size(n: int) -> int:
+    return 1 << (n - 1).bit_length()
+
+
+@lru_cache(maxsize=8)
+def _window(n: int) -> np.ndarray:
+    """Hann window, built once per length and shared (read-only)."""
+    window = np.hanning(n).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
+@lru_cache(maxsize=8)
+def _window_acf(n: int, n_fft: int) -> np.ndarray:
+    """Normalized autocorrelation of the Hann window, lags 0..n//2."""
+    spectrum = np.fft.rfft(_window(n), n_fft)
+    acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n_fft)[:n // 2 + 1]
+    acf = acf / acf[0]
+    acf.flags.writeable = False
+    return acf
+
+
+class AudioFeatures:
+    """Features of one chunk, derived lazily from a single framed rfft."""
+
+    def __init__(self, audio: np.ndarray, sample_rate: int, frame_length: int, hop: int):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop = hop
+        self.n_fft = fft_size(frame_length + frame_length // 2)  # no circular wrap up to the max lag
+        self.active: Optional[np.ndarray] = None     # VAD mask over frames; None → every frame
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    @property
+    def frame_rate(self) -> float:
+        return self.sample_rate / self.hop
+
+    @cached_property
+    def rms(self) -> float:
+        return float(np.sqrt(np.mean(self.audio ** 2)) + 1e-10) if len(self.audio) else 1e-10
+
+    @cached_property
+    def frames(self) -> np.ndarray:
+        return frame_signal(self.audio, self.frame_length, self.hop)
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.frames)
+
+    def active_rows(self, per_frame: np.ndarray) -> np.ndarray:
+        """Rows of a per-frame array that belong to voice-active frames."""
+        return per_frame if self.active is None else per_frame[self.active]
+
+    def active_runs(self) -> list:
+        """(start, end) sample spans of the contiguous runs of voice-active frames."""
+        if self.active is None:
+            return [(0, len(self.audio))] if len(self.audio) else []
+        edges = np.diff(np.concatenate(([0], self.active.astype(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        return [(int(i) * self.hop, (int(j) - 1) * self.hop + self.frame_length) for i, j in zip(starts, ends)]
+
+    def frame_at(self, samples: np.ndarray) -> np.ndarray:
+        """Index of the frame centred nearest to each sample position."""
+        index = np.rint((np.asarray(samples) - self.frame_length / 2) / self.hop).astype(int)
+        return np.clip(index, 0, max(0, self.n_frames - 1))
+
+    # ── The transform ────────────────────────────────────────────────────────────
+
+    @cached_property
+    def spectrum(self) -> np.ndarray:
+        return np.fft.rfft(self.frames * _window(self.frame_length), self.n_fft, axis=1)
+
+    @cached_property
+    def power(self) -> np.ndarray:
+        return self.spectrum.real ** 2 + self.spectrum.imag ** 2
+
+    # ── Derived features ─────────────────────────────────────────────────────────
+
+    @cached_property
+    def frame_energy(self) -> np.ndarray:
+        """Window-weighted mean square per frame (Parseval on the power spectrum)."""
+        power = self.power
+        total = 2 * power.sum(axis=1) - power[:, 0] - power[:, -1]
+        window = _window(self.frame_length)
+        return total / self.n_fft / float(np.dot(window, window))
+
+    @cached_property
+    def envelope(self) -> np.ndarray:
+        """Per-frame RMS amplitude."""
+        return np.sqrt(self.frame_energy)
+
+    @cached_property
+    def flux(self) -> np.ndarray:
+        """Half-wave rectified spectral flux per frame (0 for the first)."""
+        magnitude = np.sqrt(self.power)
+        flux = np.zeros(self.n_frames)
+        if self.n_frames > 1:
+            flux[1:] = np.maximum(np.diff(magnitude, axis=0), 0.0).sum(axis=1) / self.n_fft
+        return flux
+
+    @cached_property
+    def flatness(self) -> np.ndarray:
+        """Spectral flatness (geometric / arithmetic mean power), 100 Hz – 4 kHz."""
+        bins = self.sample_rate / self.n_fft
+        band = self.power[:, max(1, int(100 / bins)):int(4000 / bins) + 1] + 1e-12
+        return np.exp(np.mean(np.log(band), axis=1)) / np.mean(band, axis=1)
+
+    @cached_property
+    def autocorrelation(self) -> np.ndarray:
+        """Normalized autocorrelation of the windowed active frames, lags 0..frame_length//2."""
+        max_lag = self.frame_length // 2
+        acf = np.fft.irfft(self.active_rows(self.power), self.n_fft, axis=1)[:, :max_lag + 1]
+        return acf / np.maximum(acf[:, :1], 1e-12)
+
+    @cached_property
+    def periodicity(self) -> np.ndarray:
+        """autocorrelation divided by the window's own, so long lags are not tapered."""
+        return self.autocorrelation / np.maximum(_window_acf(self.frame_length, self.n_fft), 1e-3)
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 sample ring holding the most recent `capacity` samples."""
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(max(1, capacity), dtype=np.float32)
+        self._pos: int = 0          # next write index
+        self.filled: int = 0        # valid samples, ≤ capacity
+        self.total: int = 0         # samples ever written
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def write(self, samples: np.ndarray):
+        n, cap = len(samples), len(self._buf)
+        if n >= cap:
+            self._buf[:] = samples[-cap:]
+            self._pos = 0
+        else:
+            end = self._pos + n
+            if end <= cap:
+                self._buf[self._pos:end] = samples
+            else:
+                split = cap - self._pos
+                self._buf[self._pos:] = samples[:split]
+                self._buf[:n - split] = samples[split:]
+            self._pos = end % cap
+        self.filled = min(cap, self.filled + n)
+        self.total += n
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """The most recent `n` samples (default: all buffered), oldest first, as a copy."""
+        cap = len(self._buf)
+        n = self.filled if n is None else min(n, self.filled)
+        start = (self._pos - n) % cap
+        if start + n <= cap:
+            return self._buf[start:start + n].copy()
+        return np.concatenate((self._buf[start:], self._buf[:self._pos]))
+
+    def clear(self):
+        self._pos = self.filled = 0
+
+
+class AudioFrontend:
+    """Frames chunks for AudioFeatures; one instance per analyzer."""
+
+    FRAME_LENGTH = 1024      # 64 ms at 16 kHz: ≥ 3 periods at the 50 Hz pitch floor
+    HOP = 256                # 16 ms
+
+    def __init__(self, sample_rate: int = 16000, frame_length: int = FRAME_LENGTH, hop: int = HOP):
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.hop = hop
+
+    def analyze(self, audio: np.ndarray) -> AudioFeatures:
+        return AudioFeatures(audio, self.sample_rate, self.frame_length, self.hop)
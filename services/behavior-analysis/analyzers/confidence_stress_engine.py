@@ -16,6 +16,7 @@ from .face_analyzer import FaceSnapshot
 from .hand_gesture_analyzer import HandGestureMetrics
 from .audio_analyzer import AudioMetrics
 from .stress_heatmap import HeatmapFrame
+from .holistic_analyzer import PostureMetrics
 
 
 @dataclass
@@ -61,6 +62,7 @@ class BehaviorSnapshot:
     face_metrics: Optional[dict] = None
     hand_metrics: Optional[dict] = None
     audio_metrics: Optional[dict] = None
+    posture_metrics: Optional[dict] = None   # holistic mode only
 
 
 class ConfidenceStressEngine:
@@ -103,6 +105,7 @@ class ConfidenceStressEngine:
         hands: Optional[HandGestureMetrics],
         audio: Optional[AudioMetrics],
         heatmap: Optional[HeatmapFrame],
+        posture: Optional[PostureMetrics] = None,
     ) -> BehaviorSnapshot:
         """Compute full behavior snapshot from all inputs."""
         now = time.time()
@@ -230,6 +233,7 @@ class ConfidenceStressEngine:
 
         hand_dict = hands.__dict__ if hands else None
         audio_dict = audio.__dict__ if audio else None
+        posture_dict = posture.__dict__ if posture and posture.pose_detected else None
 
         return BehaviorSnapshot(
             timestamp=now,
@@ -239,6 +243,7 @@ class ConfidenceStressEngine:
             face_metrics=face_dict,
             hand_metrics=hand_dict,
             audio_metrics=audio_dict,
+            posture_metrics=posture_dict,
         )
 
     # ── Stress trend ─────────────────────────────────────────────────────────────
@@ -7,18 +7,26 @@ Uses MediaPipe Face Mesh (478 3D landmarks) for:
   - Micro-expression detection (AU-based: surprise, fear, disgust, contempt)
   - Facial tension mapping
   - Lip compression / mouth dryness indicators
+
+While no face is in view the analyzer drops to a two-tier mode: after
+`absent_after` consecutive Face Mesh misses it only runs a lightweight
+BlazeFace detector every `probe_interval_s`, and re-engages the full mesh
+(with iris refinement) once that detector finds a face again.
 """
 
 import math
 import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Optional, Union
 
 import cv2
-import mediapipe as mp
 import numpy as np
 
+from .frame_preprocessor import AnalysisFrame, as_analysis_frame
+from .landmark_predictor import LandmarkPredictor
+from .model_pool import ModelPool, face_mesh_pool, face_detection_pool
+
 # ─── MediaPipe landmark indices ──────────────────────────────────────────────────
 
 # Eye landmarks (Face Mesh 478 model)
@@ -81,19 +89,31 @@ class FaceSnapshot:
     head_yaw: float = 0.0      # degrees (shake)
     head_roll: float = 0.0     # degrees (tilt)
     facial_tension: float = 0.0  # 0-100 overall tension score
+    landmarks: Optional[np.ndarray] = None  # 478×3 pixel coords (for hand-to-face checks)
+    predicted: bool = False    # landmarks extrapolated, not inferred
 
 
 class FaceAnalyzer:
     """Real-time face analysis using MediaPipe Face Mesh."""
 
-    def __init__(self, max_faces: int = 1, min_detection: float = 0.5, min_tracking: float = 0.5):
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=max_faces,
-            refine_landmarks=True,  # Enables iris landmarks
-            min_detection_confidence=min_detection,
-            min_tracking_confidence=min_tracking,
-        )
+    def __init__(self, max_faces: int = 1, min_detection: float = 0.5, min_tracking: float = 0.5,
+                 pool: Optional[ModelPool] = None, predictor: Optional[LandmarkPredictor] = None,
+                 detector_pool: Optional[ModelPool] = None, absent_after: int = 10,
+                 probe_interval_s: float = 0.5):
+        # Shared graphs are checked out per frame; without a pool, own a private one
+        self._owns_pool = pool is None
+        self._pool = pool or face_mesh_pool(1, max_faces, min_detection, min_tracking)
+        self._owns_detector = detector_pool is None
+        self._detector_pool = detector_pool or face_detection_pool(1, min_detection)
+
+        # Presence gate: after `absent_after` mesh misses, probe with the detector only
+        self._absent_after = absent_after
+        self._probe_interval_s = probe_interval_s
+        self._misses: int = 0
+        self._absent: bool = False
+        self._next_probe: float = 0.0
+        self.probes: int = 0
+        self.gated_frames: int = 0     # frames answered without any inference
 
         # State tracking
         self._blink_history: deque = deque(maxlen=300)  # ~10s at 30fps
@@ -104,30 +124,103 @@ class FaceAnalyzer:
         self._baseline_landmarks: Optional[np.ndarray] = None
         self._frame_count: int = 0
 
-    def process_frame(self, frame: np.ndarray) -> FaceSnapshot:
+        # Between inferences, metrics can run on extrapolated landmarks
+        self._predictor = predictor or LandmarkPredictor()
+        self._frame_size: tuple = (0, 0)
+
+    def process_frame(self, frame: Union[AnalysisFrame, np.ndarray], now: Optional[float] = None) -> FaceSnapshot:
         """
-        Process a single BGR video frame.
+        Process a single video frame (AnalysisFrame, or a raw BGR array).
         Returns a FaceSnapshot with all metrics.
         """
-        now = time.time()
+        now = now or time.time()
+        gated = self.absent_snapshot(now)
+        if gated is not None:
+            return gated
+        frame = as_analysis_frame(frame)
+
+        if self._absent:
+            # Cheap presence probe; the full mesh only runs once a face is back
+            self._next_probe = now + self._probe_interval_s
+            self.probes += 1
+            with self._detector_pool.checkout(self) as detector:
+                found = detector.process(frame.rgb)
+            if not found:
+                return FaceSnapshot(timestamp=now, face_detected=False)
+            self._absent = False
+            self._misses = 0
+
+        with self._pool.checkout(self) as face_mesh:
+            faces = face_mesh.process(frame.rgb)
+
+        h, w = frame.height, frame.width
+        if not faces:
+            self._misses += 1
+            if self._misses >= self._absent_after:
+                self._absent = True
+                self._next_probe = now + self._probe_interval_s
+            return self.process_landmarks(None, w, h, now)
+        self._misses = 0
+
+        pts = faces[0].points * (w, h, w)
+        return self.process_landmarks(pts, w, h, now)
+
+    def process_landmarks(self, pts: Optional[np.ndarray], w: int, h: int,
+                          now: Optional[float] = None) -> FaceSnapshot:
+        """
+        Metrics from landmarks inferred elsewhere (e.g. one Holistic graph):
+        pts is the 478×3 pixel-coordinate array, or None when no face was found.
+        """
+        now = now or time.time()
         self._frame_count += 1
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb)
-
-        if not results.multi_face_landmarks:
+        if pts is None:
+            self._predictor.reset()
             return FaceSnapshot(timestamp=now, face_detected=False)
+        self._predictor.update(pts, now)
+        self._frame_size = (w, h)
 
-        landmarks = results.multi_face_landmarks[0]
-        h, w = frame.shape[:2]
-        pts = np.array([(lm.x * w, lm.y * h, lm.z * w) for lm in landmarks.landmark])
-
-        # Calibrate baseline from first 30 frames
+        # Calibrate baseline from first 30 frames (real landmarks only)
         if self._frame_count <= 30:
             if self._baseline_landmarks is None:
                 self._baseline_landmarks = pts.copy()
             else:
                 self._baseline_landmarks = 0.9 * self._baseline_landmarks + 0.1 * pts
 
+        return self._snapshot(pts, w, h, now)
+
+    def absent_snapshot(self, now: Optional[float] = None) -> Optional[FaceSnapshot]:
+        """
+        The no-face result for a frame the presence gate answers without any
+        inference (face absent, next probe not yet due); None when the frame
+        is needed. Lets callers skip decoding the frame altogether.
+        """
+        now = now or time.time()
+        if not self._absent or now >= self._next_probe:
+            return None
+        self.gated_frames += 1
+        return FaceSnapshot(timestamp=now, face_detected=False)
+
+    @property
+    def face_absent(self) -> bool:
+        return self._absent
+
+    def predict_frame(self, now: Optional[float] = None) -> Optional[FaceSnapshot]:
+        """
+        Metrics for a frame where inference is skipped, from extrapolated
+        landmarks. Returns None when the prediction's error bound is too
+        large — the caller must then run process_frame() on the real frame.
+        """
+        now = now or time.time()
+        if not self._predictor.tracking:
+            # No face at the last inference; assume still absent until the next one
+            return FaceSnapshot(timestamp=now, face_detected=False, predicted=True)
+        pts = self._predictor.predict(now)
+        if pts is None:
+            return None
+        w, h = self._frame_size
+        return self._snapshot(pts, w, h, now, predicted=True)
+
+    def _snapshot(self, pts: np.ndarray, w: int, h: int, now: float, predicted: bool = False) -> FaceSnapshot:
         eye = self._analyze_eyes(pts, now)
         expression = self._analyze_expression(pts)
         pitch, yaw, roll = self._estimate_head_pose(pts, w, h)
@@ -142,6 +235,8 @@ class FaceAnalyzer:
             head_yaw=yaw,
             head_roll=roll,
             facial_tension=tension,
+            landmarks=pts,
+            predicted=predicted,
         )
 
     # ── Eye Analysis ─────────────────────────────────────────────────────────────
@@ -315,7 +410,11 @@ class FaceAnalyzer:
     # ── Head Pose Estimation ─────────────────────────────────────────────────────
 
     def _estimate_head_pose(self, pts: np.ndarray, w: int, h: int) -> tuple:
-        """Estimate head pitch/yaw/roll using solvePnP."""
+        """
+        Estimate head pitch/yaw/roll using solvePnP.
+        `w`/`h` must be the analysis frame size the landmarks were scaled to
+        (not the client's source size), so the camera matrix matches `pts`.
+        """
         # 6-point model for PnP
         model_points = np.array([
             (0.0, 0.0, 0.0),        # Nose tip
@@ -367,5 +466,12 @@ class FaceAnalyzer:
         return round(min(100, max(0, tension)), 1)
 
     def release(self):
-        """Release MediaPipe resources."""
-        self.face_mesh.close()
+        """Release MediaPipe resources (or this session's hold on the shared pool)."""
+        if self._owns_pool:
+            self._pool.close()
+        else:
+            self._pool.release_owner(self)
+        if self._owns_detector:
+            self._detector_pool.close()
+        else:
+            self._detector_pool.release_owner(self)
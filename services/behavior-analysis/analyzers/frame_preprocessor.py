@@ -0,0 +1,137 @@
+"""
+Frame Preprocessor — Decode each video frame once for every analyzer.
+
+The face and hand analyzers used to convert BGR→RGB separately on every
+frame. The preprocessor decodes the JPEG once, converts it to RGB once and
+hands the same read-only AnalysisFrame to all downstream analyzers.
+
+Frames are brought down to the analysis width (per deployment, or per
+session) before any per-pixel work: the JPEG header is parsed for its size,
+libjpeg decodes directly at 1/2, 1/4 or 1/8 scale (IMREAD_REDUCED_COLOR_*)
+when the source is at least that much larger than the target, and an
+INTER_AREA resize covers the remaining factor. Frames are never upscaled.
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AnalysisFrame:
+    """One decoded video frame, shared read-only by all analyzers."""
+    rgb: np.ndarray          # H×W×3 uint8, RGB, not writeable
+    width: int
+    height: int
+    timestamp: float
+    source_width: int = 0    # size of the frame as sent by the client
+    source_height: int = 0
+
+    @classmethod
+    def from_rgb(cls, rgb: np.ndarray, timestamp: Optional[float] = None,
+                 source_size: Optional[Tuple[int, int]] = None) -> "AnalysisFrame":
+        rgb = np.ascontiguousarray(rgb)
+        rgb.flags.writeable = False
+        h, w = rgb.shape[:2]
+        src_w, src_h = source_size or (w, h)
+        return cls(rgb=rgb, width=w, height=h, timestamp=timestamp or time.time(),
+                   source_width=src_w, source_height=src_h)
+
+    @classmethod
+    def from_bgr(cls, bgr: np.ndarray, timestamp: Optional[float] = None,
+                 source_size: Optional[Tuple[int, int]] = None) -> "AnalysisFrame":
+        return cls.from_rgb(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB), timestamp, source_size)
+
+
+def as_analysis_frame(frame: Union[AnalysisFrame, np.ndarray]) -> AnalysisFrame:
+    """Accept either an AnalysisFrame or a raw BGR array (standalone analyzer use)."""
+    if isinstance(frame, AnalysisFrame):
+        return frame
+    return AnalysisFrame.from_bgr(frame)
+
+
+# ── JPEG header ──────────────────────────────────────────────────────────────────
+
+# Start-of-frame markers (baseline, progressive, lossless, arithmetic variants)
+_SOF_MARKERS = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+_STANDALONE_MARKERS = frozenset((0x01, *range(0xD0, 0xD9)))
+
+
+def jpeg_size(buf) -> Optional[Tuple[int, int]]:
+    """(width, height) from the JPEG SOF segment, without decoding; None if not a JPEG."""
+    view = memoryview(buf)
+    n = len(view)
+    if n < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return None
+    i = 2
+    while i + 4 <= n:
+        if view[i] != 0xFF:
+            return None
+        marker = view[i + 1]
+        if marker == 0xFF:          # fill byte
+            i += 1
+            continue
+        if marker in _STANDALONE_MARKERS:
+            i += 2
+            continue
+        if marker in _SOF_MARKERS:
+            if i + 9 > n:
+                return None
+            height, width = struct.unpack_from("!HH", view, i + 5)
+            return width, height
+        if marker == 0xDA:          # start of scan before any SOF
+            return None
+        i += 2 + struct.unpack_from("!H", view, i + 2)[0]
+    return None
+
+
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def reduced_decode_flag(source_width: int, target_width: int) -> Tuple[int, int]:
+    """(imdecode flag, factor) for the largest libjpeg reduction that stays >= target."""
+    for factor, flag in _REDUCED_FLAGS:
+        if source_width // factor >= target_width:
+            return flag, factor
+    return cv2.IMREAD_COLOR, 1
+
+
+# ── Preprocessor ─────────────────────────────────────────────────────────────────
+
+class FramePreprocessor:
+    """Decodes encoded frames (JPEG/PNG bytes or any buffer) into AnalysisFrames."""
+
+    def __init__(self, target_width: int = 640):
+        self.target_width = target_width
+        self.decoded: int = 0
+        self.failed: int = 0
+        self.reduced: int = 0       # frames decoded at 1/2, 1/4 or 1/8 scale
+
+    def decode(self, frame_bytes, timestamp: Optional[float] = None,
+               target_width: Optional[int] = None) -> Optional[AnalysisFrame]:
+        """Decode at (at most) the analysis width. Returns None if not a decodable image."""
+        target = target_width or self.target_width
+        size = jpeg_size(frame_bytes)
+        flag, factor = reduced_decode_flag(size[0], target) if size else (cv2.IMREAD_COLOR, 1)
+
+        bgr = cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), flag)
+        if bgr is None:
+            self.failed += 1
+            return None
+        self.decoded += 1
+        if factor > 1:
+            self.reduced += 1
+
+        h, w = bgr.shape[:2]
+        source_size = size or (w, h)
+        if w > target:
+            bgr = cv2.resize(bgr, (target, max(1, round(h * target / w))), interpolation=cv2.INTER_AREA)
+        return AnalysisFrame.from_bgr(bgr, timestamp, source_size)
@@ -7,16 +7,27 @@ Uses MediaPipe Hands (21 landmarks per hand) for:
   - Hand-to-face touches (stress indicator)
   - Finger tremor detection
   - Gesture confidence scoring
+
+Hand cost scales with hand activity rather than frame rate:
+  - no hands for `absent_after` inferences → full-frame detection only at
+    a low probe rate; frames in between are answered without inference
+  - hands present → Hands runs on a crop around the last known hand boxes,
+    plus the resting zone (the heatmap's LEFT_HAND / RIGHT_HAND region) of
+    a hand not currently seen; a hand lost inside the crop is re-checked on
+    the full frame before the analyzer gives up on it
 """
 
 import time
 from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Union
 
-import mediapipe as mp
 import numpy as np
 
+from .frame_preprocessor import AnalysisFrame, as_analysis_frame
+from .landmark_predictor import LandmarkPredictor
+from .model_pool import ModelPool, hands_pool
+
 
 @dataclass
 class HandGestureMetrics:
@@ -27,7 +38,7 @@ class HandGestureMetrics:
     right_hand_visible: bool
 
     # Movement instability
-    movement_speed_left: float            # pixels/frame
+    movement_speed_left: float            # pixels per frame (normalized to 30 fps)
     movement_speed_right: float
     jitter_score: float                   # 0-100 (100 = extreme jitter)
     tremor_score: float                   # 0-100 (high-freq oscillation)
@@ -46,93 +57,292 @@ class HandGestureMetrics:
 
     # Confidence
     gesture_confidence: float             # 0-100 overall hand composure
+    predicted: bool = False               # landmarks extrapolated, not inferred
 
 
 class HandGestureAnalyzer:
     """Real-time hand and gesture analysis using MediaPipe Hands."""
 
-    def __init__(self, max_hands: int = 2, min_detection: float = 0.5, min_tracking: float = 0.5):
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=max_hands,
-            min_detection_confidence=min_detection,
-            min_tracking_confidence=min_tracking,
-        )
+    # Pixel thresholds below were tuned on 640-px-wide frames; they are
+    # scaled by (analysis width / REFERENCE_WIDTH) so any resolution works
+    REFERENCE_WIDTH = 640
+    # Speeds are pixels per 30-fps frame, whatever rate the analyzer actually runs at
+    REFERENCE_DT = 1 / 30
+
+    # Analysis windows in seconds (what their sample counts spanned at 30 fps).
+    # Hands run at the scheduler's adaptive rate, so windows are cut by sample
+    # time and direction changes are counted per second. Each statistic still
+    # needs its *_MIN_SAMPLES (the baseline's history minimum) and always uses
+    # at least that many recent samples, so a slow rate widens the window
+    # rather than computing on too few points.
+    # Oscillations faster than half the hands rate are not observable: tapping
+    # (>8 Hz reversals) needs HANDS_RATE_HZ ≳ 17.
+    JITTER_WINDOW_S = 15 * REFERENCE_DT
+    FIDGET_WINDOW_S = 20 * REFERENCE_DT
+    GESTURE_WINDOW_S = 10 * REFERENCE_DT
+    TREMOR_WINDOW_S = 15 * REFERENCE_DT
+    TAP_WINDOW_S = 10 * REFERENCE_DT
+    TAP_REVERSALS_PER_S = 5 / (9 * REFERENCE_DT)   # >5 reversals across 10 samples at 30 fps
+    JITTER_MIN_SAMPLES = 5
+    GESTURE_MIN_SAMPLES = 5
+    TREMOR_MIN_SAMPLES = 10
+    FIDGET_MIN_SAMPLES = 10
+    TAP_MIN_SAMPLES = 10
+
+    # Resting zones (y_start, y_end, x_start, x_end) as frame fractions; same
+    # as StressHeatmapGenerator.REGIONS['LEFT_HAND'] / ['RIGHT_HAND']
+    HAND_ZONES = {
+        0: (0.60, 1.00, 0.00, 0.20),
+        1: (0.60, 1.00, 0.80, 1.00),
+    }
+    # A crop covering more of the frame than this isn't worth it; use the full frame
+    MAX_ROI_AREA = 0.6
+
+    def __init__(self, max_hands: int = 2, min_detection: float = 0.5, min_tracking: float = 0.5,
+                 pool: Optional[ModelPool] = None, max_prediction_error: float = 0.03,
+                 absent_after: int = 10, probe_interval_s: float = 0.5, roi_margin: float = 0.05):
+        # Shared graphs are checked out per frame; without a pool, own a private one
+        self._owns_pool = pool is None
+        self._pool = pool or hands_pool(1, max_hands, min_detection, min_tracking)
+
+        # Detection throttling / ROI tracking
+        self._absent_after = absent_after
+        self._probe_interval_s = probe_interval_s
+        self._roi_margin = roi_margin          # crop padding, fraction of frame width
+        self._misses: int = 0
+        self._absent: bool = False
+        self._next_probe: float = 0.0
+        self._boxes: dict = {}                 # hand idx -> (x1, y1, x2, y2) last known box
+        self._roi: Optional[tuple] = None      # crop the graph is currently tracking in
+        self.probes: int = 0
+        self.roi_frames: int = 0
+        self.full_frames: int = 0
+        self.gated_frames: int = 0             # frames answered without any inference
 
         # Tracking state per hand (indexed by 0=left, 1=right)
         self._position_history: dict = {0: deque(maxlen=60), 1: deque(maxlen=60)}  # ~2s
         self._speed_history: dict = {0: deque(maxlen=60), 1: deque(maxlen=60)}
+        self._speed_times: dict = {0: deque(maxlen=60), 1: deque(maxlen=60)}
         self._finger_tip_history: dict = {0: deque(maxlen=30), 1: deque(maxlen=30)}
+        self._tip_times: dict = {0: deque(maxlen=30), 1: deque(maxlen=30)}
         self._tap_history: deque = deque(maxlen=30)
         self._last_positions: dict = {}
+        self._last_seen: dict = {}      # hand idx -> time of last detection
         self._baseline_positions: dict = {}
         self._frame_count: int = 0
-
-    def process_frame(self, frame: np.ndarray, face_landmarks: Optional[np.ndarray] = None) -> HandGestureMetrics:
+        self._px: float = 1.0       # pixel-threshold scale for the current frame
+
+        # Between inferences, positional metrics can run on extrapolated landmarks
+        self._predictors: dict = {
+            0: LandmarkPredictor(max_error=max_prediction_error),
+            1: LandmarkPredictor(max_error=max_prediction_error),
+        }
+        self._frame_h: int = 0
+
+    def process_frame(self, frame: Union[AnalysisFrame, np.ndarray],
+                      face_landmarks: Optional[np.ndarray] = None,
+                      now: Optional[float] = None) -> HandGestureMetrics:
         """
-        Process a single BGR video frame.
+        Process a single video frame (AnalysisFrame, or a raw BGR array).
         face_landmarks: optional 478x3 array from face analyzer for self-touch detection.
         """
-        import cv2
-        now = time.time()
+        now = now or time.time()
+        idle = self.absent_metrics(now)
+        if idle is not None:
+            return idle
+        frame = as_analysis_frame(frame)
+        h, w = frame.height, frame.width
+
+        if self._absent:
+            self._next_probe = now + self._probe_interval_s
+            self.probes += 1
+        roi = self._region_of_interest(w, h)
+        hands_data = self._detect(frame, roi)
+        if roi is not None and not hands_data:
+            # Lost inside the crop (e.g. a fast move out of it): confirm on the full frame
+            hands_data = self._detect(frame, None)
+
+        self._boxes = {idx: self._hand_box(pts) for idx, pts in hands_data.items()}
+        if hands_data:
+            self._misses = 0
+            self._absent = False
+        else:
+            self._misses += 1
+            if not self._absent and self._misses >= self._absent_after:
+                self._absent = True
+                self._next_probe = now + self._probe_interval_s
+        return self.process_landmarks(hands_data, face_landmarks, w, h, now)
+
+    def process_landmarks(self, hands_data: dict, face_landmarks: Optional[np.ndarray],
+                          w: int, h: int, now: Optional[float] = None) -> HandGestureMetrics:
+        """
+        Metrics from landmarks inferred elsewhere (e.g. one Holistic graph):
+        hands_data maps hand idx (0=left, 1=right, Hands' label convention)
+        to its 21×3 pixel-coordinate array; absent hands are left out.
+        """
+        now = now or time.time()
         self._frame_count += 1
-        h, w = frame.shape[:2]
-
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb)
-
-        if not results.multi_hand_landmarks:
-            return HandGestureMetrics(
-                timestamp=now, hands_detected=0,
-                left_hand_visible=False, right_hand_visible=False,
-                movement_speed_left=0, movement_speed_right=0,
-                jitter_score=0, tremor_score=0,
-                fidgeting_score=0, self_touch_detected=False,
-                tapping_detected=False, hand_wringing_detected=False,
-                hand_position_zone='NEUTRAL', hand_elevation='MID',
-                hands_clasped=False, gesturing_actively=False,
-                gesture_confidence=80,
-            )
+        self._px = w / self.REFERENCE_WIDTH
+        self._frame_h = h
+
+        for idx, predictor in self._predictors.items():
+            if idx in hands_data:
+                predictor.update(hands_data[idx], now)
+            else:
+                predictor.reset()
+
+        if not hands_data:
+            return self._no_hands(now)
+        return self._metrics(hands_data, face_landmarks, h, now)
+
+    def absent_metrics(self, now: Optional[float] = None) -> Optional[HandGestureMetrics]:
+        """
+        The no-hands result for a frame the detection throttle answers without
+        inference (no hands seen lately, next probe not yet due); None when the
+        frame is needed. Lets callers skip decoding the frame altogether.
+        """
+        now = now or time.time()
+        if not self._absent or now >= self._next_probe:
+            return None
+        self.gated_frames += 1
+        return self._no_hands(now)
+
+    @property
+    def hands_absent(self) -> bool:
+        return self._absent
+
+    # ── Detection / ROI tracking ─────────────────────────────────────────────────
+
+    def _detect(self, frame: AnalysisFrame, roi: Optional[tuple]) -> dict:
+        """Run Hands on the frame or a crop of it; landmarks come back in full-frame pixels."""
+        x1, y1, x2, y2 = roi or (0, 0, frame.width, frame.height)
+        cw, ch = x2 - x1, y2 - y1
+        image = frame.rgb if roi is None else np.ascontiguousarray(frame.rgb[y1:y2, x1:x2])
+        if roi is None:
+            self.full_frames += 1
+        else:
+            self.roi_frames += 1
+
+        with self._pool.checkout(self) as hands:
+            if roi != self._roi:
+                # MediaPipe tracks in image coordinates; a new crop invalidates them
+                hands.reset()
+                self._roi = roi
+            detected = hands.process(image)
 
         # Parse handedness
         hands_data = {}
-        for i, hand_lm in enumerate(results.multi_hand_landmarks):
-            handedness = results.multi_handedness[i].classification[0]
-            idx = 0 if handedness.label == 'Left' else 1
-            pts = np.array([(lm.x * w, lm.y * h, lm.z * w) for lm in hand_lm.landmark])
-            hands_data[idx] = pts
+        for hand in detected:
+            idx = 0 if hand.label == 'Left' else 1
+            hands_data[idx] = hand.points * (cw, ch, cw) + (x1, y1, 0)
+        return hands_data
+
+    @staticmethod
+    def _hand_box(pts: np.ndarray) -> tuple:
+        """Landmark bounding box, padded by half the hand size for the next frame's motion."""
+        x1, y1 = pts[:, :2].min(axis=0)
+        x2, y2 = pts[:, :2].max(axis=0)
+        pad = 0.5 * max(x2 - x1, y2 - y1)
+        return (x1 - pad, y1 - pad, x2 + pad, y2 + pad)
+
+    def _region_of_interest(self, w: int, h: int) -> Optional[tuple]:
+        """Crop (x1, y1, x2, y2) covering the known hands and the free resting zones; None → full frame."""
+        if not self._boxes:
+            return None
+        boxes = list(self._boxes.values())
+        for idx, (zy1, zy2, zx1, zx2) in self.HAND_ZONES.items():
+            if idx not in self._boxes:
+                boxes.append((zx1 * w, zy1 * h, zx2 * w, zy2 * h))
+        m = self._roi_margin * w
+        x1 = max(0, int(min(b[0] for b in boxes) - m))
+        y1 = max(0, int(min(b[1] for b in boxes) - m))
+        x2 = min(w, int(max(b[2] for b in boxes) + m))
+        y2 = min(h, int(max(b[3] for b in boxes) + m))
+        if (x2 - x1) * (y2 - y1) > self.MAX_ROI_AREA * w * h:
+            return None
+
+        # Hysteresis: keep the current crop while it still contains the new one,
+        # so MediaPipe's tracking isn't reset on every small movement
+        cur = self._roi
+        if cur is not None and cur[0] <= x1 and cur[1] <= y1 and cur[2] >= x2 and cur[3] >= y2:
+            return cur
+        return (x1, y1, x2, y2)
+
+    def predict_frame(self, face_landmarks: Optional[np.ndarray] = None,
+                      now: Optional[float] = None) -> Optional[HandGestureMetrics]:
+        """
+        Metrics for a frame where inference is skipped, from extrapolated
+        landmarks. Returns None when any tracked hand's prediction error bound
+        is too large — the caller must then run process_frame().
+        Jitter/tremor/fidget histories are fed by real inferences only, since
+        smooth extrapolated motion would bias those noise measures down.
+        """
+        now = now or time.time()
+        hands_data = {}
+        for idx, predictor in self._predictors.items():
+            if predictor.tracking:
+                pts = predictor.predict(now)
+                if pts is None:
+                    return None
+                hands_data[idx] = pts
+        if not hands_data:
+            return self._no_hands(now, predicted=True)
+        return self._metrics(hands_data, face_landmarks, self._frame_h, now, predicted=True)
+
+    def _no_hands(self, now: float, predicted: bool = False) -> HandGestureMetrics:
+        return HandGestureMetrics(
+            timestamp=now, hands_detected=0,
+            left_hand_visible=False, right_hand_visible=False,
+            movement_speed_left=0, movement_speed_right=0,
+            jitter_score=0, tremor_score=0,
+            fidgeting_score=0, self_touch_detected=False,
+            tapping_detected=False, hand_wringing_detected=False,
+            hand_position_zone='NEUTRAL', hand_elevation='MID',
+            hands_clasped=False, gesturing_actively=False,
+            gesture_confidence=80, predicted=predicted,
+        )
 
+    def _metrics(self, hands_data: dict, face_landmarks: Optional[np.ndarray], h: int,
+                 now: float, predicted: bool = False) -> HandGestureMetrics:
         # ── Movement analysis per hand ───────────────────────────────────
         speeds = {0: 0.0, 1: 0.0}
         for idx, pts in hands_data.items():
+            if predicted:
+                hist = self._speed_history[idx]
+                speeds[idx] = float(hist[-1]) if hist else 0.0
+                continue
             wrist = pts[0][:2]
             self._position_history[idx].append(wrist)
 
             if idx in self._last_positions:
-                speed = np.linalg.norm(wrist - self._last_positions[idx])
+                dt = min(0.5, max(1 / 120, now - self._last_seen[idx]))
+                speed = np.linalg.norm(wrist - self._last_positions[idx]) * self.REFERENCE_DT / dt
                 speeds[idx] = float(speed)
                 self._speed_history[idx].append(speed)
+                self._speed_times[idx].append(now)
 
             self._last_positions[idx] = wrist
+            self._last_seen[idx] = now
 
             # Track fingertip positions for tremor
             tips = pts[[4, 8, 12, 16, 20]][:, :2]  # thumb, index, middle, ring, pinky
             self._finger_tip_history[idx].append(tips)
+            self._tip_times[idx].append(now)
 
         # ── Jitter score ─────────────────────────────────────────────────
-        jitter = self._compute_jitter(hands_data)
+        jitter = self._compute_jitter(hands_data, now)
 
         # ── Tremor score ─────────────────────────────────────────────────
-        tremor = self._compute_tremor(hands_data)
+        tremor = self._compute_tremor(hands_data, now)
 
         # ── Fidgeting ────────────────────────────────────────────────────
-        fidgeting = self._compute_fidgeting(hands_data)
+        fidgeting = self._compute_fidgeting(hands_data, now)
 
         # ── Self-touch detection ─────────────────────────────────────────
         self_touch, zone = self._detect_self_touch(hands_data, face_landmarks, h)
 
         # ── Tapping detection ────────────────────────────────────────────
-        tapping = self._detect_tapping(hands_data)
+        tapping = self._detect_tapping(hands_data, now)
 
         # ── Hand wringing ────────────────────────────────────────────────
         wringing = self._detect_wringing(hands_data)
@@ -141,7 +351,7 @@ class HandGestureAnalyzer:
         clasped = self._detect_clasped(hands_data)
 
         # ── Active gesturing ─────────────────────────────────────────────
-        active = self._detect_active_gesturing(hands_data)
+        active = self._detect_active_gesturing(hands_data, now)
 
         # ── Elevation ────────────────────────────────────────────────────
         elevation = self._compute_elevation(hands_data, h)
@@ -167,56 +377,69 @@ class HandGestureAnalyzer:
             hands_clasped=clasped,
             gesturing_actively=active,
             gesture_confidence=round(confidence, 1),
+            predicted=predicted,
         )
 
+    # ── Time windows ─────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _recent(values: deque, times: deque, now: float, window_s: float, min_samples: int) -> tuple:
+        """Samples from the last `window_s` seconds (at least `min_samples`) and their times."""
+        stamps = np.fromiter(times, dtype=float, count=len(times))
+        n = min(len(values), max(min_samples, int(np.count_nonzero(stamps > now - window_s))))
+        return np.array(list(values)[-n:]), stamps[-n:]
+
     # ── Jitter (high-frequency noise in position) ────────────────────────────────
 
-    def _compute_jitter(self, hands_data: dict) -> float:
+    def _compute_jitter(self, hands_data: dict, now: float) -> float:
         jitters = []
         for idx in hands_data:
-            hist = list(self._speed_history[idx])
-            if len(hist) < 5:
+            if len(self._speed_history[idx]) < self.JITTER_MIN_SAMPLES:
                 continue
-            recent = np.array(hist[-15:])
+            recent, _ = self._recent(
+                self._speed_history[idx], self._speed_times[idx], now, self.JITTER_WINDOW_S, self.JITTER_MIN_SAMPLES,
+            )
             # Jitter = variance of speed (stable hand has consistent speed)
-            jitter = float(np.std(recent)) * 5
+            jitter = float(np.std(recent)) / self._px * 5
             jitters.append(min(100, jitter))
         return np.mean(jitters) if jitters else 0
 
     # ── Tremor (oscillating small movements) ─────────────────────────────────────
 
-    def _compute_tremor(self, hands_data: dict) -> float:
+    def _compute_tremor(self, hands_data: dict, now: float) -> float:
         tremors = []
         for idx in hands_data:
-            tips_hist = list(self._finger_tip_history[idx])
-            if len(tips_hist) < 10:
+            if len(self._finger_tip_history[idx]) < self.TREMOR_MIN_SAMPLES:
                 continue
             # Track index finger tip oscillation
-            positions = np.array([t[1] for t in tips_hist[-15:]])  # index fingertip
-            if len(positions) < 5:
+            tips, times = self._recent(
+                self._finger_tip_history[idx], self._tip_times[idx], now, self.TREMOR_WINDOW_S, self.TREMOR_MIN_SAMPLES,
+            )
+            positions = np.array([t[1] for t in tips])  # index fingertip
+            span = times[-1] - times[0]
+            if span <= 0:
                 continue
             # Compute direction changes (sign changes in velocity)
             velocities = np.diff(positions, axis=0)
-            if len(velocities) < 3:
-                continue
             signs = np.sign(velocities[:, 0])  # x-direction
             direction_changes = np.sum(np.abs(np.diff(signs)) > 0)
-            # More direction changes in short window = more tremor
-            tremor = min(100, (direction_changes / len(signs)) * 200)
+            # More direction changes per second = more tremor (200 × changes per 30-fps frame)
+            tremor = min(100, direction_changes / span * self.REFERENCE_DT * 200)
             tremors.append(tremor)
         return float(np.mean(tremors)) if tremors else 0
 
     # ── Fidgeting (rapid small-amplitude movements) ──────────────────────────────
 
-    def _compute_fidgeting(self, hands_data: dict) -> float:
+    def _compute_fidgeting(self, hands_data: dict, now: float) -> float:
         scores = []
         for idx in hands_data:
-            hist = list(self._speed_history[idx])
-            if len(hist) < 10:
+            if len(self._speed_history[idx]) < self.FIDGET_MIN_SAMPLES:
                 continue
-            recent = np.array(hist[-20:])
+            recent, _ = self._recent(
+                self._speed_history[idx], self._speed_times[idx], now, self.FIDGET_WINDOW_S, self.FIDGET_MIN_SAMPLES,
+            )
             # Fidgeting = many small movements (speed > 2 but < 20)
-            small_moves = np.sum((recent > 2) & (recent < 20))
+            small_moves = np.sum((recent > 2 * self._px) & (recent < 20 * self._px))
             fidget = min(100, (small_moves / len(recent)) * 150)
             scores.append(fidget)
         return float(np.mean(scores)) if scores else 0
@@ -236,14 +459,15 @@ class HandGestureAnalyzer:
                 chin = face_lm[152][:2]
                 forehead = face_lm[10][:2]
 
+                px = self._px
                 for tip in fingertips:
-                    if np.linalg.norm(tip - nose) < 60:
+                    if np.linalg.norm(tip - nose) < 60 * px:
                         touching = True
                         zone = 'FACE'
-                    elif np.linalg.norm(tip - forehead) < 80:
+                    elif np.linalg.norm(tip - forehead) < 80 * px:
                         touching = True
                         zone = 'HAIR'
-                    elif np.linalg.norm(tip - chin) < 50:
+                    elif np.linalg.norm(tip - chin) < 50 * px:
                         touching = True
                         zone = 'FACE'
             else:
@@ -257,19 +481,22 @@ class HandGestureAnalyzer:
 
     # ── Tapping detection ────────────────────────────────────────────────────────
 
-    def _detect_tapping(self, hands_data: dict) -> bool:
+    def _detect_tapping(self, hands_data: dict, now: float) -> bool:
         for idx in hands_data:
-            tips = list(self._finger_tip_history[idx])
-            if len(tips) < 10:
+            if len(self._finger_tip_history[idx]) < self.TAP_MIN_SAMPLES:
                 continue
             # Check index finger rapid vertical oscillation
-            y_positions = [t[1][1] for t in tips[-10:]]
-            if len(y_positions) < 5:
+            tips, times = self._recent(
+                self._finger_tip_history[idx], self._tip_times[idx], now, self.TAP_WINDOW_S, self.TAP_MIN_SAMPLES,
+            )
+            span = times[-1] - times[0]
+            if span <= 0:
                 continue
+            y_positions = [t[1][1] for t in tips]
             velocities = np.diff(y_positions)
             signs = np.sign(velocities)
             changes = np.sum(np.abs(np.diff(signs)) > 0)
-            if changes > 5:  # Multiple direction changes = tapping
+            if changes / span > self.TAP_REVERSALS_PER_S:  # Rapid direction changes = tapping
                 return True
         return False
 
@@ -286,7 +513,8 @@ class HandGestureAnalyzer:
         left_speed = list(self._speed_history[0])[-1] if self._speed_history[0] else 0
         right_speed = list(self._speed_history[1])[-1] if self._speed_history[1] else 0
 
-        return dist < 80 and left_speed > 3 and right_speed > 3
+        px = self._px
+        return dist < 80 * px and left_speed > 3 * px and right_speed > 3 * px
 
     # ── Clasped hands ────────────────────────────────────────────────────────────
 
@@ -300,17 +528,20 @@ class HandGestureAnalyzer:
         left_speed = list(self._speed_history[0])[-1] if self._speed_history[0] else 0
         right_speed = list(self._speed_history[1])[-1] if self._speed_history[1] else 0
 
-        return dist < 50 and left_speed < 3 and right_speed < 3
+        px = self._px
+        return dist < 50 * px and left_speed < 3 * px and right_speed < 3 * px
 
     # ── Active gesturing ─────────────────────────────────────────────────────────
 
-    def _detect_active_gesturing(self, hands_data: dict) -> bool:
+    def _detect_active_gesturing(self, hands_data: dict, now: float) -> bool:
         for idx in hands_data:
-            hist = list(self._speed_history[idx])
-            if len(hist) < 5:
+            if len(self._speed_history[idx]) < self.GESTURE_MIN_SAMPLES:
                 continue
-            avg_speed = np.mean(hist[-10:])
-            if avg_speed > 15:  # Meaningful movement
+            recent, _ = self._recent(
+                self._speed_history[idx], self._speed_times[idx], now, self.GESTURE_WINDOW_S, self.GESTURE_MIN_SAMPLES,
+            )
+            avg_speed = np.mean(recent)
+            if avg_speed > 15 * self._px:  # Meaningful movement
                 return True
         return False
 
@@ -343,4 +574,8 @@ class HandGestureAnalyzer:
         return max(0, min(100, score))
 
     def release(self):
-        self.hands.close()
+        """Release MediaPipe resources (or this session's hold on the shared pool)."""
+        if self._owns_pool:
+            self._pool.close()
+        else:
+            self._pool.release_owner(self)
@@ -0,0 +1,197 @@
+"""
+Holistic Analyzer — Face, hands and pose from one MediaPipe graph per frame.
+
+The default path runs Face Mesh and Hands as two independent graphs, each
+with its own detector. In holistic mode a single Holistic invocation
+yields all three landmark sets; they are packed into one LandmarkSet
+tensor and fed to the existing FaceAnalyzer / HandGestureAnalyzer metric
+code through their process_landmarks() entry points, so every face and
+hand metric is computed exactly as before.
+
+Pose landmarks come for free with that call and drive PostureMetrics:
+  - Shoulder tilt (degrees from level)
+  - Slouch (neck height vs. the calibrated baseline)
+  - Lean (shoulder width vs. baseline: + = toward the camera)
+  - Torso sway (shoulder-midpoint wander over ~2s)
+
+Handedness: Hands labels hands as if the image were mirrored, Holistic
+names them from the subject's point of view, so Holistic's right hand is
+Hands' 'Left' (idx 0) on the same image.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from .face_analyzer import FaceAnalyzer, FaceSnapshot
+from .frame_preprocessor import AnalysisFrame, as_analysis_frame
+from .hand_gesture_analyzer import HandGestureAnalyzer, HandGestureMetrics
+from .model_pool import ModelPool, holistic_pool
+
+# ─── LandmarkSet row layout ──────────────────────────────────────────────────────
+
+FACE_ROWS = slice(0, 478)
+HAND_ROWS = {0: slice(478, 499), 1: slice(499, 520)}
+POSE_ROWS = slice(520, 553)
+N_ROWS = 553
+
+# Pose landmark indices
+POSE_NOSE = 0
+POSE_LEFT_SHOULDER = 11
+POSE_RIGHT_SHOULDER = 12
+
+
+class LandmarkSet:
+    """All landmarks of one frame in one (553, 3) pixel-coordinate tensor."""
+
+    __slots__ = ('points', 'pose_visibility', 'face_present', 'hands_present', 'pose_present')
+
+    def __init__(self):
+        self.points = np.zeros((N_ROWS, 3))
+        self.pose_visibility = np.zeros(POSE_ROWS.stop - POSE_ROWS.start)
+        self.face_present: bool = False
+        self.hands_present: dict = {0: False, 1: False}
+        self.pose_present: bool = False
+
+    @classmethod
+    def from_results(cls, results, w: int, h: int) -> "LandmarkSet":
+        """Pack a Holistic result; normalized coordinates are scaled to pixels in one pass."""
+        ls = cls()
+        if results.face_landmarks is not None:
+            ls._fill(FACE_ROWS, results.face_landmarks)
+            ls.face_present = True
+        for idx, hand in ((0, results.right_hand_landmarks), (1, results.left_hand_landmarks)):
+            if hand is not None:
+                ls._fill(HAND_ROWS[idx], hand)
+                ls.hands_present[idx] = True
+        if results.pose_landmarks is not None:
+            ls._fill(POSE_ROWS, results.pose_landmarks)
+            ls.pose_visibility[:] = [lm.visibility for lm in results.pose_landmarks.landmark]
+            ls.pose_present = True
+        ls.points *= (w, h, w)
+        return ls
+
+    def _fill(self, rows: slice, landmark_list):
+        self.points[rows] = [(lm.x, lm.y, lm.z) for lm in landmark_list.landmark]
+
+    @property
+    def face(self) -> Optional[np.ndarray]:
+        return self.points[FACE_ROWS] if self.face_present else None
+
+    @property
+    def hands(self) -> dict:
+        return {idx: self.points[rows] for idx, rows in HAND_ROWS.items() if self.hands_present[idx]}
+
+    @property
+    def pose(self) -> Optional[np.ndarray]:
+        return self.points[POSE_ROWS] if self.pose_present else None
+
+
+@dataclass
+class PostureMetrics:
+    """Upper-body posture from pose landmarks."""
+    timestamp: float
+    pose_detected: bool
+    shoulder_tilt: float = 0.0     # degrees from level (+ = image-right shoulder lower)
+    slouch: float = 0.0            # 0-100 (neck height lost vs. baseline)
+    lean: float = 0.0              # relative shoulder-width change vs. baseline (+ = toward camera)
+    sway: float = 0.0              # 0-100 torso sway over ~2s
+    posture_score: float = 100.0   # 0-100 (level, upright, still)
+
+
+class HolisticAnalyzer:
+    """One Holistic graph per frame feeding the face, hand and posture metrics."""
+
+    MIN_SHOULDER_VISIBILITY = 0.5
+
+    def __init__(self, face_analyzer: Optional[FaceAnalyzer] = None,
+                 hand_analyzer: Optional[HandGestureAnalyzer] = None,
+                 pool: Optional[ModelPool] = None, min_detection: float = 0.5,
+                 min_tracking: float = 0.5, model_complexity: int = 1):
+        # Shared graphs are checked out per frame; without a pool, own a private one
+        self._owns_pool = pool is None
+        self._pool = pool or holistic_pool(1, min_detection, min_tracking, model_complexity)
+        self.face_analyzer = face_analyzer or FaceAnalyzer()
+        self.hand_analyzer = hand_analyzer or HandGestureAnalyzer()
+
+        # Posture state
+        self._sway_history: deque = deque(maxlen=60)   # ~2s of shoulder midpoints
+        self._baseline_neck: Optional[float] = None
+        self._baseline_width: Optional[float] = None
+        self._pose_frames: int = 0
+
+    def process_frame(self, frame: Union[AnalysisFrame, np.ndarray], now: Optional[float] = None
+                      ) -> Tuple[FaceSnapshot, HandGestureMetrics, PostureMetrics]:
+        """
+        Process a single video frame (AnalysisFrame, or a raw BGR array) with
+        one graph call. Returns (FaceSnapshot, HandGestureMetrics, PostureMetrics).
+        """
+        now = now or time.time()
+        frame = as_analysis_frame(frame)
+        w, h = frame.width, frame.height
+        with self._pool.checkout(self) as holistic:
+            results = holistic.process(frame.rgb)
+
+        landmarks = LandmarkSet.from_results(results, w, h)
+        face = self.face_analyzer.process_landmarks(landmarks.face, w, h, now)
+        hands = self.hand_analyzer.process_landmarks(landmarks.hands, landmarks.face, w, h, now)
+        posture = self._analyze_posture(landmarks, now)
+        return face, hands, posture
+
+    # ── Posture ──────────────────────────────────────────────────────────────────
+
+    def _analyze_posture(self, landmarks: LandmarkSet, now: float) -> PostureMetrics:
+        pose = landmarks.pose
+        vis = landmarks.pose_visibility
+        if pose is None or min(vis[POSE_LEFT_SHOULDER], vis[POSE_RIGHT_SHOULDER]) < self.MIN_SHOULDER_VISIBILITY:
+            return PostureMetrics(timestamp=now, pose_detected=False)
+
+        left = pose[POSE_LEFT_SHOULDER][:2]
+        right = pose[POSE_RIGHT_SHOULDER][:2]
+        span = left - right
+        if span[0] < 0:
+            span = -span            # mirrored input; measure left-to-right in the image
+        width = float(np.hypot(*span)) + 1e-6
+        mid = (left + right) / 2
+
+        tilt = math.degrees(math.atan2(span[1], span[0]))
+        # Neck height in shoulder widths, so distance to the camera cancels out
+        neck = (mid[1] - pose[POSE_NOSE][1]) / width
+
+        # Calibrate baseline from first 30 pose frames
+        self._pose_frames += 1
+        if self._baseline_neck is None:
+            self._baseline_neck, self._baseline_width = neck, width
+        elif self._pose_frames <= 30:
+            self._baseline_neck = 0.9 * self._baseline_neck + 0.1 * neck
+            self._baseline_width = 0.9 * self._baseline_width + 0.1 * width
+
+        slouch = min(100.0, max(0.0, (self._baseline_neck - neck) / max(self._baseline_neck, 1e-3) * 200))
+        lean = width / self._baseline_width - 1
+
+        self._sway_history.append(mid / width)
+        sway = 0.0
+        if len(self._sway_history) >= 10:
+            sway = min(100.0, float(np.std(np.array(self._sway_history), axis=0).sum()) * 1000)
+
+        score = max(0.0, min(100.0, 100 - abs(tilt) * 2 - slouch * 0.4 - sway * 0.3))
+        return PostureMetrics(
+            timestamp=now,
+            pose_detected=True,
+            shoulder_tilt=round(tilt, 1),
+            slouch=round(slouch, 1),
+            lean=round(lean, 3),
+            sway=round(sway, 1),
+            posture_score=round(score, 1),
+        )
+
+    def release(self):
+        """Release MediaPipe resources (or this session's hold on the shared pool)."""
+        if self._owns_pool:
+            self._pool.close()
+        else:
+            self._pool.release_owner(self)
@@ -0,0 +1,169 @@
+"""
+Inference Backend — Where the landmark graphs come from.
+
+Analyzers never call mp.solutions directly: they check graphs out of a
+ModelPool whose factory asks the deployment's backend (INFERENCE_BACKEND)
+for one.
+
+  - 'mediapipe' (default): the MediaPipe solutions graphs
+  - 'onnx': ONNX Runtime on exported detector / landmark models
+    (analyzers/onnx_backend.py), with explicit thread counts, optional
+    int8 weights and any ORT execution provider (e.g. OpenVINO)
+
+Every graph has the same surface: process(rgb) → List[Landmarks], reset()
+and close(). Landmarks are in MediaPipe's normalized image coordinates
+(x, y in 0..1, z on the x scale), so analyzer metric code is backend
+independent.
+"""
+
+from abc import ABC, abstractmethod
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import mediapipe as mp
+    HAS_MEDIAPIPE = True
+except ImportError:     # onnx-only deployments
+    HAS_MEDIAPIPE = False
+
+logger = logging.getLogger("behavior-analysis.inference-backend")
+
+
+@dataclass
+class Landmarks:
+    """One detected face / hand (or a detection's keypoints)."""
+    points: np.ndarray       # N×3 normalized x, y, z
+    label: str = ''          # hands: 'Left' | 'Right', MediaPipe Hands' (mirrored) convention
+    score: float = 1.0
+
+
+class InferenceBackend(ABC):
+    """Builds the three kinds of graph the analyzers use."""
+
+    name = 'base'
+
+    def batching_stats(self) -> dict:
+        """Per-model cross-session batching stats (empty when not batching)."""
+        return {}
+
+    @abstractmethod
+    def face_detector(self, min_detection: float = 0.5):
+        """Cheap face-presence detector; results carry the detection keypoints."""
+
+    @abstractmethod
+    def face_landmarker(self, max_faces: int = 1, min_detection: float = 0.5, min_tracking: float = 0.5):
+        """478-point face mesh (468 + iris)."""
+
+    @abstractmethod
+    def hand_landmarker(self, max_hands: int = 2, min_detection: float = 0.5, min_tracking: float = 0.5):
+        """21-point hands with handedness."""
+
+    def holistic(self, min_detection: float = 0.5, min_tracking: float = 0.5, model_complexity: int = 1):
+        """Face mesh (with iris), both hands and pose in one graph; process() returns the raw results."""
+        raise NotImplementedError(f"The '{self.name}' inference backend has no holistic graph")
+
+
+# ── MediaPipe solutions ──────────────────────────────────────────────────────────
+
+def _points(landmark_list) -> np.ndarray:
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmark_list.landmark])
+
+
+def _faces(results) -> List[Landmarks]:
+    return [Landmarks(_points(face)) for face in results.multi_face_landmarks or []]
+
+
+def _hands(results) -> List[Landmarks]:
+    hands = []
+    for hand, handedness in zip(results.multi_hand_landmarks or [], results.multi_handedness or []):
+        cls = handedness.classification[0]
+        hands.append(Landmarks(_points(hand), label=cls.label, score=cls.score))
+    return hands
+
+
+def _detections(results) -> List[Landmarks]:
+    return [
+        Landmarks(
+            np.array([(kp.x, kp.y, 0.0) for kp in det.location_data.relative_keypoints]),
+            score=det.score[0],
+        )
+        for det in results.detections or []
+    ]
+
+
+class _MediaPipeGraph:
+    """Adapts an mp.solutions graph to the backend graph surface."""
+
+    def __init__(self, graph, convert):
+        self._graph = graph
+        self._convert = convert
+
+    def process(self, rgb: np.ndarray) -> List[Landmarks]:
+        return self._convert(self._graph.process(rgb))
+
+    def reset(self):
+        self._graph.reset()
+
+    def close(self):
+        self._graph.close()
+
+
+class MediaPipeBackend(InferenceBackend):
+    """The MediaPipe solutions graphs (TFLite, XNNPACK, MediaPipe's own threading)."""
+
+    name = 'mediapipe'
+
+    def __init__(self):
+        if not HAS_MEDIAPIPE:
+            raise RuntimeError("The 'mediapipe' inference backend needs the mediapipe package")
+
+    def face_detector(self, min_detection: float = 0.5):
+        return _MediaPipeGraph(mp.solutions.face_detection.FaceDetection(
+            model_selection=0,      # BlazeFace short range
+            min_detection_confidence=min_detection,
+        ), _detections)
+
+    def face_landmarker(self, max_faces: int = 1, min_detection: float = 0.5, min_tracking: float = 0.5):
+        return _MediaPipeGraph(mp.solutions.face_mesh.FaceMesh(
+            max_num_faces=max_faces,
+            refine_landmarks=True,  # Enables iris landmarks
+            min_detection_confidence=min_detection,
+            min_tracking_confidence=min_tracking,
+        ), _faces)
+
+    def hand_landmarker(self, max_hands: int = 2, min_detection: float = 0.5, min_tracking: float = 0.5):
+        return _MediaPipeGraph(mp.solutions.hands.Hands(
+            max_num_hands=max_hands,
+            min_detection_confidence=min_detection,
+            min_tracking_confidence=min_tracking,
+        ), _hands)
+
+    def holistic(self, min_detection: float = 0.5, min_tracking: float = 0.5, model_complexity: int = 1):
+        # Unadapted: LandmarkSet.from_results reads face, hands and pose off the raw results
+        return mp.solutions.holistic.Holistic(
+            model_complexity=model_complexity,
+            refine_face_landmarks=True,  # 478 points, same as FaceMesh(refine_landmarks=True)
+            min_detection_confidence=min_detection,
+            min_tracking_confidence=min_tracking,
+        )
+
+
+# ── Selection ────────────────────────────────────────────────────────────────────
+
+BACKENDS = ('mediapipe', 'onnx')
+
+
+def get_backend(name: Optional[str] = None, **options) -> InferenceBackend:
+    """Backend by name; `options` configure the ONNX backend (see OnnxBackend)."""
+    name = (name or 'mediapipe').lower()
+    if name == 'mediapipe':
+        if options.get('max_batch', 1) > 1:
+            logger.warning("The 'mediapipe' backend runs one frame per graph call; max_batch is ignored")
+        return MediaPipeBackend()
+    if name == 'onnx':
+        from .onnx_backend import OnnxBackend
+        return OnnxBackend(**options)
+    raise ValueError(f"Unknown inference backend '{name}' (expected one of {BACKENDS})")
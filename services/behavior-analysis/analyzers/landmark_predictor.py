@@ -0,0 +1,89 @@
+"""
+Landmark Predictor — Constant-velocity extrapolation between inferences.
+
+Face (478×3) and hand (21×3) landmarks move smoothly between two MediaPipe
+calls, so on frames where inference is skipped the analyzers can run their
+metrics on predicted points instead of reusing a stale result.
+
+Each track keeps the last observed points and a smoothed per-point
+velocity. The predictor also measures itself: on every real observation
+the prediction for that instant is compared to the truth, and the error
+(RMS, relative to the landmark set's size) is tracked as an EWMA. The
+error bound for a prediction grows linearly with the horizon relative to
+the typical observation interval; past `max_error` (or `max_horizon_s`)
+predict() returns None and the caller must run a real inference.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class LandmarkPredictor:
+    """Per-track constant-velocity landmark predictor with an error bound."""
+
+    VELOCITY_ALPHA = 0.6    # weight of the newest velocity estimate
+    ERROR_ALPHA = 0.3
+
+    def __init__(self, max_error: float = 0.03, max_horizon_s: float = 0.25):
+        self.max_error = max_error
+        self.max_horizon_s = max_horizon_s
+        self.reset()
+
+        # Stats (survive reset)
+        self.predictions: int = 0
+        self.refusals: int = 0
+
+    def reset(self):
+        """Forget the track (e.g. face or hand lost)."""
+        self._pts: Optional[np.ndarray] = None
+        self._t: float = 0.0
+        self._velocity: Optional[np.ndarray] = None
+        self._interval: float = 0.0          # EWMA of time between observations
+        self.error: float = 0.0               # EWMA of relative prediction error
+        self._observations: int = 0
+
+    @staticmethod
+    def _scale(pts: np.ndarray) -> float:
+        """Size of the landmark set (bbox diagonal) so errors are resolution independent."""
+        span = pts[:, :2].max(axis=0) - pts[:, :2].min(axis=0)
+        return float(np.hypot(*span)) + 1e-6
+
+    def update(self, pts: np.ndarray, t: float):
+        """Feed a real observation."""
+        pts = np.asarray(pts, dtype=np.float64)
+        if self._pts is not None and self._pts.shape == pts.shape and t > self._t:
+            dt = t - self._t
+            if self._velocity is not None:
+                predicted = self._pts + self._velocity * dt
+                rms = float(np.sqrt(np.mean(np.sum((predicted[:, :2] - pts[:, :2]) ** 2, axis=1))))
+                self.error += self.ERROR_ALPHA * (rms / self._scale(pts) - self.error)
+            velocity = (pts - self._pts) / dt
+            self._velocity = velocity if self._velocity is None else (
+                self.VELOCITY_ALPHA * velocity + (1 - self.VELOCITY_ALPHA) * self._velocity
+            )
+            self._interval = dt if self._observations < 2 else self._interval + 0.3 * (dt - self._interval)
+        elif self._pts is not None and self._pts.shape != pts.shape:
+            self.reset()
+        self._pts, self._t = pts, t
+        self._observations += 1
+
+    def error_bound(self, t: float) -> float:
+        """Expected relative error of a prediction at time `t`."""
+        if self._velocity is None or self._interval <= 0 or self._observations < 3:
+            return float('inf')     # no measured error yet
+        return self.error * max(1.0, (t - self._t) / self._interval)
+
+    def predict(self, t: float) -> Optional[np.ndarray]:
+        """Extrapolated points at `t`, or None if the prediction can't be trusted."""
+        horizon = t - self._t
+        if (self._velocity is None or horizon < 0 or horizon > self.max_horizon_s
+                or self.error_bound(t) > self.max_error):
+            self.refusals += 1
+            return None
+        self.predictions += 1
+        return self._pts + self._velocity * horizon
+
+    @property
+    def tracking(self) -> bool:
+        return self._pts is not None
@@ -0,0 +1,142 @@
+"""
+Micro Batcher — Cross-session batching for landmark model calls.
+
+Analysis lanes run sessions concurrently, but each lane infers its own
+frame at batch size 1. A MicroBatcher wraps one model (same run() / size
+surface) and merges the inputs of concurrent callers into a single model
+call, bounded by `max_batch` items or `max_wait_s` after the first
+arrival, then scatters each caller's slice of the outputs back to it.
+
+There is no batching thread: the first caller of a round becomes its
+leader, waits for the batch to fill (or the deadline), runs the model
+and wakes the others; callers arriving meanwhile start the next round.
+Only models exported with a dynamic batch axis actually run batched, so
+OnnxBackend wraps only those; MediaPipe graphs never batch.
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("behavior-analysis.micro-batcher")
+
+
+class _Request:
+    __slots__ = ('inputs', 'outputs', 'error', 'done', 'queued_at')
+
+    def __init__(self, inputs: np.ndarray):
+        self.inputs = inputs
+        self.outputs: Optional[List[np.ndarray]] = None
+        self.error: Optional[BaseException] = None
+        self.done: bool = False
+        self.queued_at: float = time.perf_counter()
+
+
+class MicroBatcher:
+    """Size/deadline-bounded batching of concurrent run() calls on one model."""
+
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, model, max_batch: int = 8, max_wait_s: float = 0.010, name: str = ''):
+        self.model = model
+        self.size = model.size
+        self.max_batch = max(1, max_batch)
+        self.max_wait_s = max_wait_s
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending: List[_Request] = []
+        self._pending_items: int = 0
+        self._collecting: bool = False
+        if getattr(model, 'fixed_batch', False):
+            logger.warning(f"{name}: model has a fixed batch of 1; batched calls run item by item")
+
+        # Stats
+        self.batches: int = 0
+        self.items: int = 0
+        self.max_seen: int = 0
+        self.wait_ms_avg: float = 0.0
+        self.run_ms_avg: float = 0.0
+        self._started = time.time()
+
+    def run(self, batch: np.ndarray) -> List[np.ndarray]:
+        """Same contract as the wrapped model's run(): B inputs in, B-row outputs back."""
+        request = _Request(batch)
+        with self._cond:
+            self._pending.append(request)
+            self._pending_items += len(batch)
+            if self._collecting:
+                # A leader is filling this round; wait for our slice
+                if self._pending_items >= self.max_batch:
+                    self._cond.notify_all()
+                while not request.done:
+                    self._cond.wait()
+                return self._result(request)
+
+            # Lead this round: wait for it to fill or for the deadline
+            self._collecting = True
+            deadline = request.queued_at + self.max_wait_s
+            while self._pending_items < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            requests, self._pending, self._pending_items = self._pending, [], 0
+            self._collecting = False
+
+        self._execute(requests)
+        with self._cond:
+            self._cond.notify_all()
+        return self._result(request)
+
+    def _execute(self, requests: List[_Request]):
+        started = time.perf_counter()
+        try:
+            outputs = self.model.run(np.concatenate([r.inputs for r in requests]))
+            offset = 0
+            for r in requests:
+                n = len(r.inputs)
+                r.outputs = [o[offset:offset + n] for o in outputs]
+                offset += n
+        except Exception as e:
+            for r in requests:
+                r.error = e
+        finished = time.perf_counter()
+
+        n_items = sum(len(r.inputs) for r in requests)
+        wait_ms = sum(started - r.queued_at for r in requests) / len(requests) * 1000
+        run_ms = (finished - started) * 1000
+        self.batches += 1
+        self.items += n_items
+        self.max_seen = max(self.max_seen, n_items)
+        if self.batches == 1:
+            self.wait_ms_avg, self.run_ms_avg = wait_ms, run_ms
+        else:
+            self.wait_ms_avg += self.EWMA_ALPHA * (wait_ms - self.wait_ms_avg)
+            self.run_ms_avg += self.EWMA_ALPHA * (run_ms - self.run_ms_avg)
+        for r in requests:
+            r.done = True
+
+    @staticmethod
+    def _result(request: _Request) -> List[np.ndarray]:
+        if request.error is not None:
+            raise request.error
+        return request.outputs
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        elapsed = max(1e-9, time.time() - self._started)
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': round(self.max_wait_s * 1000, 2),
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'max_batch_seen': self.max_seen,
+            'wait_ms_avg': round(self.wait_ms_avg, 2),
+            'run_ms_avg': round(self.run_ms_avg, 2),
+            'items_per_s': round(self.items / elapsed, 1),
+        }
@@ -0,0 +1,176 @@
+"""
+Model Pool — Process-wide, pre-warmed landmark inference graphs.
+
+Building a face-mesh / hands graph loads its models and costs tens of MB
+per instance, so graphs are not owned by sessions. The graphs themselves
+come from the deployment's inference backend (see inference_backend.py). Analyzers check one
+out per frame instead; the per-session tracking state (blink history,
+hand trajectories, baselines, ...) stays in the analyzers.
+
+  - Affinity: a session gets back the graph it used last when it is free,
+    so the graph's own landmark tracking keeps working across frames.
+  - A graph that changes owner is reset() first, so one candidate's
+    landmarks are never tracked into another candidate's frame.
+  - warm() builds every graph and runs one inference on a blank frame,
+    outside the pool lock, so stats() and release_owner() never wait on
+    model loading.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+from .inference_backend import InferenceBackend, MediaPipeBackend
+
+logger = logging.getLogger("behavior-analysis.model-pool")
+
+
+class _Slot:
+    __slots__ = ('graph', 'owner', 'busy', 'checkouts', 'resets')
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.owner: Optional[int] = None    # id() of the last analyzer that used it
+        self.busy: bool = False
+        self.checkouts: int = 0
+        self.resets: int = 0
+
+
+class ModelPool:
+    """Fixed-size pool of one kind of inference graph."""
+
+    WARM_FRAME = (240, 320, 3)
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: int = 1):
+        self.name = name
+        self.size = max(1, size)
+        self._factory = factory
+        self._slots: List[_Slot] = []
+        self._cond = threading.Condition()
+        self.ready: bool = False
+        self._warming: bool = False
+        self.waits: int = 0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────────
+
+    def warm(self):
+        """Build all graphs and run a throwaway inference on each (idempotent)."""
+        with self._cond:
+            while self._warming:        # another thread is building; use its graphs
+                self._cond.wait()
+            if self.ready:
+                return
+            self._warming = True
+            missing = self.size - len(self._slots)
+        built: List[_Slot] = []
+        try:
+            blank = np.zeros(self.WARM_FRAME, dtype=np.uint8)
+            for _ in range(missing):
+                graph = self._factory()
+                graph.process(blank)
+                graph.reset()
+                built.append(_Slot(graph))
+        finally:
+            with self._cond:
+                self._slots.extend(built)
+                self._warming = False
+                self.ready = len(self._slots) >= self.size
+                self._cond.notify_all()
+        logger.info(f"Model pool '{self.name}' warm: {self.size} graph(s)")
+
+    def close(self):
+        with self._cond:
+            for slot in self._slots:
+                slot.graph.close()
+            self._slots.clear()
+            self.ready = False
+
+    # ── Checkout ─────────────────────────────────────────────────────────────────
+
+    @contextmanager
+    def checkout(self, owner: object):
+        """Borrow a graph for one frame; prefers the graph `owner` used last."""
+        if not self.ready:
+            self.warm()
+        key = id(owner)
+        with self._cond:
+            slot = self._pick(key)
+            while slot is None:
+                self.waits += 1
+                self._cond.wait()
+                slot = self._pick(key)
+            slot.busy = True
+        try:
+            if slot.owner != key:
+                if slot.owner is not None:
+                    slot.graph.reset()
+                    slot.resets += 1
+                slot.owner = key
+            slot.checkouts += 1
+            yield slot.graph
+        finally:
+            with self._cond:
+                slot.busy = False
+                self._cond.notify()
+
+    def _pick(self, key: int) -> Optional[_Slot]:
+        free = [s for s in self._slots if not s.busy]
+        if not free:
+            return None
+        for slot in free:
+            if slot.owner == key:
+                return slot
+        # Prefer a graph nobody is tracking with, then any free one
+        return next((s for s in free if s.owner is None), free[0])
+
+    def release_owner(self, owner: object):
+        """Forget `owner`'s affinity (session ended)."""
+        key = id(owner)
+        with self._cond:
+            for slot in self._slots:
+                if slot.owner == key and not slot.busy:
+                    slot.graph.reset()
+                    slot.owner = None
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            'size': self.size,
+            'ready': self.ready,
+            'busy': sum(s.busy for s in self._slots),
+            'checkouts': sum(s.checkouts for s in self._slots),
+            'owner_switches': sum(s.resets for s in self._slots),
+            'waits': self.waits,
+        }
+
+
+# ── Factories ────────────────────────────────────────────────────────────────────
+
+def face_mesh_pool(size: int, max_faces: int = 1, min_detection: float = 0.5,
+                   min_tracking: float = 0.5, backend: Optional[InferenceBackend] = None) -> ModelPool:
+    backend = backend or MediaPipeBackend()
+    return ModelPool('face_mesh', lambda: backend.face_landmarker(max_faces, min_detection, min_tracking), size)
+
+
+def face_detection_pool(size: int, min_detection: float = 0.5,
+                        backend: Optional[InferenceBackend] = None) -> ModelPool:
+    """BlazeFace short-range detector: a cheap presence probe while no face is in view."""
+    backend = backend or MediaPipeBackend()
+    return ModelPool('face_detection', lambda: backend.face_detector(min_detection), size)
+
+
+def holistic_pool(size: int, min_detection: float = 0.5, min_tracking: float = 0.5,
+                  model_complexity: int = 1, backend: Optional[InferenceBackend] = None) -> ModelPool:
+    """One graph for face mesh (with iris), both hands and pose (MediaPipe only)."""
+    backend = backend or MediaPipeBackend()
+    return ModelPool('holistic', lambda: backend.holistic(min_detection, min_tracking, model_complexity), size)
+
+
+def hands_pool(size: int, max_hands: int = 2, min_detection: float = 0.5,
+               min_tracking: float = 0.5, backend: Optional[InferenceBackend] = None) -> ModelPool:
+    backend = backend or MediaPipeBackend()
+    return ModelPool('hands', lambda: backend.hand_landmarker(max_hands, min_detection, min_tracking), size)
@@ -0,0 +1,436 @@
+"""
+ONNX Runtime Backend — CPU landmark inference on exported MediaPipe models.
+
+Runs the same two-stage pipelines as the MediaPipe solutions, on models
+exported to ONNX (e.g. tf2onnx on the .tflite files) found in `model_dir`:
+
+  face_detection_short_range.onnx   BlazeFace, 128×128, 896 anchors
+  face_landmarks_detector.onnx      478-point mesh incl. iris (from face_landmarker.task)
+  palm_detection_full.onnx          palm detector, 192×192, 2016 anchors
+  hand_landmark_full.onnx           21 points + presence + handedness
+
+  - Detection runs only while there is nothing (or not enough) to track;
+    otherwise each frame's ROIs come from the previous frame's landmarks
+    (rotated square crops, like MediaPipe's *_landmarks_to_roi graphs)
+  - All ROIs of a frame go through the landmark model as one batch
+  - `threads` sets ORT's intra-op threads per session (1 → one core per
+    lane); `providers` picks execution providers, e.g. OpenVINO's
+  - `int8` loads `<model>.int8.onnx`, quantizing the weights dynamically on
+    first use if the file is missing (no calibration data needed); check
+    the drift with benchmarks/backend_parity.py before enabling it
+  - `max_batch` > 1 routes each model exported with a dynamic batch axis
+    through a MicroBatcher, so frames of concurrently running sessions
+    share one batched call. Models pinned to a batch of 1 (tf2onnx's
+    default) are left unbatched: a merged batch would only run item by
+    item after waiting for it to fill
+
+Input size and layout (NHWC / NCHW) are read from each model. A missing
+onnxruntime package or model file fails OnnxBackend() itself, so a
+misconfigured deployment stops at startup rather than in an analysis lane
+(install with requirements-onnx.txt).
+"""
+
+import logging
+import math
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from .inference_backend import InferenceBackend, Landmarks
+from .micro_batcher import MicroBatcher
+
+try:
+    import onnxruntime as ort
+    HAS_ORT = True
+except ImportError:
+    HAS_ORT = False
+
+logger = logging.getLogger("behavior-analysis.onnx-backend")
+
+FACE_DETECTOR = 'face_detection_short_range.onnx'
+FACE_LANDMARKS = 'face_landmarks_detector.onnx'
+PALM_DETECTOR = 'palm_detection_full.onnx'
+HAND_LANDMARKS = 'hand_landmark_full.onnx'
+MODELS = (FACE_DETECTOR, FACE_LANDMARKS, PALM_DETECTOR, HAND_LANDMARKS)
+
+FACE_POINTS = 478
+HAND_POINTS = 21
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-np.clip(x, -100, 100)))
+
+
+def _prob(x: float) -> float:
+    """Exports differ in whether the final sigmoid is inside the graph."""
+    return float(x) if 0.0 <= x <= 1.0 else float(_sigmoid(x))
+
+
+# ── Models ───────────────────────────────────────────────────────────────────────
+
+class _OrtModel:
+    """One ORT session; runs uint8 RGB batches already at the model's input size."""
+
+    def __init__(self, session, value_range: Tuple[float, float]):
+        self.session = session
+        inp = session.get_inputs()[0]
+        self.input_name = inp.name
+        shape = inp.shape
+        self.nchw = shape[1] == 3
+        h, w = (shape[2], shape[3]) if self.nchw else (shape[1], shape[2])
+        self.size = (int(w), int(h))
+        self.fixed_batch = shape[0] == 1      # tf2onnx exports usually pin the batch to 1
+        lo, hi = value_range
+        self._scale = (hi - lo) / 255.0
+        self._offset = lo
+
+    def run(self, batch: np.ndarray) -> List[np.ndarray]:
+        """B×H×W×3 uint8 → outputs, each with a leading B axis."""
+        x = batch.astype(np.float32) * self._scale + self._offset
+        if self.nchw:
+            x = x.transpose(0, 3, 1, 2)
+        if self.fixed_batch and len(x) > 1:
+            runs = [self.session.run(None, {self.input_name: x[i:i + 1]}) for i in range(len(x))]
+            return [np.concatenate(outs) for outs in zip(*runs)]
+        return self.session.run(None, {self.input_name: x})
+
+
+def _by_size(outputs: List[np.ndarray], batch: int, size: int) -> List[np.ndarray]:
+    """Outputs with `size` values per batch item, flattened to B×size, in graph order."""
+    return [o.reshape(batch, -1) for o in outputs if o.size == batch * size]
+
+
+# ── Detection ────────────────────────────────────────────────────────────────────
+
+def ssd_anchors(input_size: int, strides: Sequence[int]) -> np.ndarray:
+    """
+    Anchor centers (N×2, normalized) as MediaPipe's SsdAnchorsCalculator builds
+    them for fixed-size anchors: 2 per cell per layer, and consecutive layers
+    with the same stride share one grid.
+    """
+    anchors = []
+    i = 0
+    while i < len(strides):
+        stride, per_cell = strides[i], 0
+        while i < len(strides) and strides[i] == stride:
+            per_cell += 2
+            i += 1
+        cells = math.ceil(input_size / stride)
+        ys, xs = np.mgrid[0:cells, 0:cells]
+        centers = np.stack([(xs + 0.5) / cells, (ys + 0.5) / cells], axis=-1).reshape(-1, 2)
+        anchors.append(np.repeat(centers, per_cell, axis=0))
+    return np.concatenate(anchors).astype(np.float32)
+
+
+def _nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> List[int]:
+    area = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        i, rest = order[0], order[1:]
+        keep.append(int(i))
+        xx1 = np.maximum(boxes[i, 0], boxes[rest, 0])
+        yy1 = np.maximum(boxes[i, 1], boxes[rest, 1])
+        xx2 = np.minimum(boxes[i, 2], boxes[rest, 2])
+        yy2 = np.minimum(boxes[i, 3], boxes[rest, 3])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        order = rest[inter / (area[i] + area[rest] - inter + 1e-9) <= iou_threshold]
+    return keep
+
+
+class _Detector:
+    """SSD detector (BlazeFace / palm) on a letterboxed frame."""
+
+    IOU_THRESHOLD = 0.3
+
+    def __init__(self, model: _OrtModel, strides: Sequence[int], num_keypoints: int):
+        self.model = model
+        self.anchors = ssd_anchors(model.size[0], strides)
+        self.num_keypoints = num_keypoints
+
+    def detect(self, rgb: np.ndarray, min_score: float) -> List[tuple]:
+        """[(box x1,y1,x2,y2, keypoints K×2, score)] in image pixels, best first."""
+        h, w = rgb.shape[:2]
+        side = max(w, h)
+        pad_x, pad_y = (side - w) // 2, (side - h) // 2
+        square = cv2.copyMakeBorder(rgb, pad_y, side - h - pad_y, pad_x, side - w - pad_x,
+                                    cv2.BORDER_CONSTANT, value=0)
+        size = self.model.size[0]
+        outputs = self.model.run(cv2.resize(square, (size, size), interpolation=cv2.INTER_AREA)[None])
+        regs, scores = (outputs[1], outputs[0]) if outputs[0].shape[-1] == 1 else (outputs[0], outputs[1])
+        regs = regs.reshape(-1, regs.shape[-1])
+        scores = _sigmoid(scores.reshape(-1))
+
+        keep = scores >= min_score
+        if not keep.any():
+            return []
+        regs, scores, anchors = regs[keep] / size, scores[keep], self.anchors[keep]
+        cx, cy = regs[:, 0] + anchors[:, 0], regs[:, 1] + anchors[:, 1]
+        half_w, half_h = regs[:, 2] / 2, regs[:, 3] / 2
+        boxes = np.stack([cx - half_w, cy - half_h, cx + half_w, cy + half_h], axis=1)
+        k = self.num_keypoints
+        kps = regs[:, 4:4 + 2 * k].reshape(-1, k, 2) + anchors[:, None, :]
+
+        # Letterboxed square (normalized) → image pixels
+        boxes = boxes * side - (pad_x, pad_y, pad_x, pad_y)
+        kps = kps * side - (pad_x, pad_y)
+        return [(boxes[i], kps[i], float(scores[i])) for i in _nms(boxes, scores, self.IOU_THRESHOLD)]
+
+
+# ── ROI geometry ─────────────────────────────────────────────────────────────────
+# An ROI is a rotated square (cx, cy, size, angle) in pixels; its x axis is
+# (cos, sin) and its y axis (-sin, cos), so angle 0 is an upright crop.
+
+def _roi_from_box(box: np.ndarray, angle: float, scale: float, shift_y: float = 0.0) -> tuple:
+    w, h = box[2] - box[0], box[3] - box[1]
+    cx, cy = (box[0] + box[2]) / 2, (box[1] + box[3]) / 2
+    cx -= shift_y * h * math.sin(angle)
+    cy += shift_y * h * math.cos(angle)
+    return (cx, cy, max(w, h) * scale, angle)
+
+
+def _roi_from_points(xy: np.ndarray, angle: float, scale: float, shift_y: float = 0.0) -> tuple:
+    """Bounding square of points in the rotated frame, shifted along its y and scaled."""
+    u = np.array([math.cos(angle), math.sin(angle)])
+    v = np.array([-math.sin(angle), math.cos(angle)])
+    pu, pv = xy @ u, xy @ v
+    size = max(pu.max() - pu.min(), pv.max() - pv.min())
+    center = (pu.max() + pu.min()) / 2 * u + ((pv.max() + pv.min()) / 2 + shift_y * size) * v
+    return (center[0], center[1], size * scale, angle)
+
+
+def _crop(rgb: np.ndarray, roi: tuple, out_size: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Warp the ROI to the model input; returns the crop and the crop→image affine."""
+    cx, cy, size, angle = roi
+    half = size / 2
+    u = np.array([math.cos(angle), math.sin(angle)]) * half
+    v = np.array([-math.sin(angle), math.cos(angle)]) * half
+    c = np.array([cx, cy])
+    src = np.float32([c - u - v, c + u - v, c - u + v])
+    w, h = out_size
+    m = cv2.getAffineTransform(src, np.float32([[0, 0], [w, 0], [0, h]]))
+    crop = cv2.warpAffine(rgb, m, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+    return crop, cv2.invertAffineTransform(m)
+
+
+def _project(points: np.ndarray, inverse: np.ndarray, roi_size: float, model_w: int,
+             w: int, h: int) -> np.ndarray:
+    """Model-input pixel landmarks → MediaPipe-normalized image landmarks."""
+    xy = points[:, :2] @ inverse[:, :2].T + inverse[:, 2]
+    z = points[:, 2] * roi_size / model_w
+    return np.column_stack([xy[:, 0] / w, xy[:, 1] / h, z / w])
+
+
+def _overlaps(a: tuple, b: tuple) -> bool:
+    return math.hypot(a[0] - b[0], a[1] - b[1]) < max(a[2], b[2]) / 2
+
+
+# ── Graphs ───────────────────────────────────────────────────────────────────────
+
+class _FaceDetectorGraph:
+    """BlazeFace only (presence probe)."""
+
+    def __init__(self, detector: _Detector, min_detection: float):
+        self._detector = detector
+        self._min_detection = min_detection
+
+    def process(self, rgb: np.ndarray) -> List[Landmarks]:
+        h, w = rgb.shape[:2]
+        return [
+            Landmarks(np.column_stack([kps[:, 0] / w, kps[:, 1] / h, np.zeros(len(kps))]), score=score)
+            for _, kps, score in self._detector.detect(rgb, self._min_detection)
+        ]
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _TrackingGraph:
+    """Detector → landmark model, tracking ROIs from the previous frame's landmarks."""
+
+    def __init__(self, detector: _Detector, landmarker: _OrtModel, max_objects: int,
+                 min_detection: float, min_tracking: float):
+        self._detector = detector
+        self._landmarker = landmarker
+        self._max = max_objects
+        self._min_detection = min_detection
+        self._min_tracking = min_tracking
+        self._rois: List[tuple] = []
+
+    def process(self, rgb: np.ndarray) -> List[Landmarks]:
+        h, w = rgb.shape[:2]
+        rois = list(self._rois)
+        if len(rois) < self._max:
+            for box, kps, _ in self._detector.detect(rgb, self._min_detection):
+                if len(rois) >= self._max:
+                    break
+                roi = self._detection_roi(box, kps)
+                if not any(_overlaps(roi, r) for r in rois):
+                    rois.append(roi)
+        self._rois = []
+        if not rois:
+            return []
+
+        crops, inverses = zip(*(_crop(rgb, roi, self._landmarker.size) for roi in rois))
+        outputs = self._landmarker.run(np.stack(crops))
+        results = []
+        for i, (roi, inverse) in enumerate(zip(rois, inverses)):
+            points, score, label = self._parse(outputs, len(rois), i)
+            if score < self._min_tracking:
+                continue
+            norm = _project(points, inverse, roi[2], self._landmarker.size[0], w, h)
+            results.append(Landmarks(norm, label=label, score=score))
+            self._rois.append(self._landmark_roi(norm[:, :2] * (w, h)))
+        return results
+
+    def reset(self):
+        self._rois = []
+
+    def close(self):
+        self._rois = []
+
+    def _detection_roi(self, box: np.ndarray, kps: np.ndarray) -> tuple:
+        raise NotImplementedError
+
+    def _landmark_roi(self, xy: np.ndarray) -> tuple:
+        raise NotImplementedError
+
+    def _parse(self, outputs: List[np.ndarray], batch: int, i: int) -> tuple:
+        """(points N×3 in model-input pixels, presence score, label) for batch item i."""
+        raise NotImplementedError
+
+
+class _FaceLandmarkGraph(_TrackingGraph):
+    ROI_SCALE = 1.5
+
+    def _detection_roi(self, box, kps):
+        # Keypoints 0 / 1: right / left eye → level the eye line
+        (rx, ry), (lx, ly) = kps[0], kps[1]
+        return _roi_from_box(box, math.atan2(ly - ry, lx - rx), self.ROI_SCALE)
+
+    def _landmark_roi(self, xy):
+        # Outer eye corners 33 (right) / 263 (left)
+        (rx, ry), (lx, ly) = xy[33], xy[263]
+        return _roi_from_points(xy, math.atan2(ly - ry, lx - rx), self.ROI_SCALE)
+
+    def _parse(self, outputs, batch, i):
+        points = _by_size(outputs, batch, FACE_POINTS * 3)[0][i].reshape(FACE_POINTS, 3)
+        flag = _by_size(outputs, batch, 1)[0][i, 0]
+        return points, float(_sigmoid(flag)), ''
+
+
+class _HandLandmarkGraph(_TrackingGraph):
+    PALM_SCALE, PALM_SHIFT = 2.6, -0.5
+    TRACK_SCALE, TRACK_SHIFT = 2.0, -0.1
+
+    @staticmethod
+    def _hand_angle(wrist: np.ndarray, middle: np.ndarray) -> float:
+        """Rotation that puts the wrist → middle-finger direction straight up in the crop."""
+        dx, dy = middle - wrist
+        return math.atan2(dx, -dy)
+
+    def _detection_roi(self, box, kps):
+        # Palm keypoints 0 / 2: wrist / middle-finger base
+        return _roi_from_box(box, self._hand_angle(kps[0], kps[2]), self.PALM_SCALE, self.PALM_SHIFT)
+
+    def _landmark_roi(self, xy):
+        return _roi_from_points(xy, self._hand_angle(xy[0], xy[9]), self.TRACK_SCALE, self.TRACK_SHIFT)
+
+    def _parse(self, outputs, batch, i):
+        # Screen landmarks come before world landmarks, presence before handedness
+        points = _by_size(outputs, batch, HAND_POINTS * 3)[0][i].reshape(HAND_POINTS, 3)
+        presence, handedness = (o[i, 0] for o in _by_size(outputs, batch, 1)[:2])
+        right = _prob(handedness)
+        return points, _prob(presence), 'Right' if right > 0.5 else 'Left'
+
+
+# ── Backend ──────────────────────────────────────────────────────────────────────
+
+def quantize_model(path: str) -> str:
+    """`<model>.int8.onnx` next to `path`, created by dynamic weight quantization if missing."""
+    out = (path[:-5] if path.endswith('.onnx') else path) + '.int8.onnx'
+    if not os.path.exists(out):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        logger.info(f"Quantizing {os.path.basename(path)} → {os.path.basename(out)}")
+        quantize_dynamic(path, out, weight_type=QuantType.QUInt8)
+    return out
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime sessions, shared by every graph this backend builds."""
+
+    name = 'onnx'
+
+    def __init__(self, model_dir: str = 'models', int8: bool = False, threads: int = 1,
+                 providers: Optional[Sequence[str]] = None, max_batch: int = 1,
+                 batch_wait_ms: float = 10.0):
+        if not HAS_ORT:
+            raise RuntimeError("The 'onnx' inference backend needs the onnxruntime package "
+                               "(pip install -r requirements-onnx.txt)")
+        self.model_dir = model_dir
+        self.int8 = int8
+        missing = [name for name in MODELS if not self._model_file_exists(name)]
+        if missing:
+            raise FileNotFoundError(f"The 'onnx' inference backend is missing {', '.join(missing)} "
+                                    f"in model_dir '{model_dir}'")
+        self.threads = max(1, threads)
+        self.providers = list(providers or ['CPUExecutionProvider'])
+        self.max_batch = max(1, max_batch)
+        self.batch_wait_s = batch_wait_ms / 1000
+        self._models: dict = {}
+        self._lock = threading.Lock()
+
+    def _model_file_exists(self, filename: str) -> bool:
+        path = os.path.join(self.model_dir, filename)
+        return os.path.exists(path) or (self.int8 and os.path.exists(path[:-5] + '.int8.onnx'))
+
+    def _model(self, filename: str, value_range: Tuple[float, float]):
+        with self._lock:
+            if filename not in self._models:
+                path = os.path.join(self.model_dir, filename)
+                if self.int8:
+                    path = quantize_model(path)
+                options = ort.SessionOptions()
+                options.intra_op_num_threads = self.threads
+                options.inter_op_num_threads = 1
+                options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                session = ort.InferenceSession(path, sess_options=options, providers=self.providers)
+                model = _OrtModel(session, value_range)
+                if self.max_batch > 1 and model.fixed_batch:
+                    logger.warning(f"{filename} has a fixed batch of 1; not batching it "
+                                   f"(re-export with a dynamic batch axis to batch)")
+                elif self.max_batch > 1:
+                    model = MicroBatcher(model, self.max_batch, self.batch_wait_s, name=filename)
+                self._models[filename] = model
+                logger.info(f"Loaded {os.path.basename(path)} on {session.get_providers()[0]}")
+            return self._models[filename]
+
+    def batching_stats(self) -> dict:
+        with self._lock:
+            return {name: m.stats() for name, m in self._models.items() if isinstance(m, MicroBatcher)}
+
+    def _face_detector(self) -> _Detector:
+        return _Detector(self._model(FACE_DETECTOR, (-1.0, 1.0)), (8, 16, 16, 16), num_keypoints=6)
+
+    def face_detector(self, min_detection: float = 0.5):
+        return _FaceDetectorGraph(self._face_detector(), min_detection)
+
+    def face_landmarker(self, max_faces: int = 1, min_detection: float = 0.5, min_tracking: float = 0.5):
+        return _FaceLandmarkGraph(
+            self._face_detector(), self._model(FACE_LANDMARKS, (0.0, 1.0)),
+            max_faces, min_detection, min_tracking,
+        )
+
+    def hand_landmarker(self, max_hands: int = 2, min_detection: float = 0.5, min_tracking: float = 0.5):
+        palm = _Detector(self._model(PALM_DETECTOR, (0.0, 1.0)), (8, 16, 16, 16), num_keypoints=7)
+        return _HandLandmarkGraph(
+            palm, self._model(HAND_LANDMARKS, (0.0, 1.0)),
+            max_hands, min_detection, min_tracking,
+        )
@@ -0,0 +1,200 @@
+"""
+Pitch Engine — F0 tracking for the audio analyzer.
+
+AudioAnalyzer used to run librosa.pyin on every chunk; pyin's Viterbi
+decoding over a probabilistic YIN grid costs hundreds of ms of CPU per
+second of audio. Pitch tracking now goes through an engine chosen by the
+deployment (PITCH_ENGINE):
+
+  - 'yin' (default): YIN's cumulative mean normalized difference over all
+    frames of a chunk at once
+  - 'acf': autocorrelation peak picking
+  - 'pyin': librosa.pyin, the slow high-accuracy option; 'yin' stands in
+    for it when librosa is not installed
+
+'yin' and 'acf' add no transform of their own: both read the frontend's
+autocorrelation features (audio_frontend.py), i.e. the chunk's one rfft. Every
+engine has the same surface: track(features) → F0 in Hz of the voiced
+frames, so jitter and the pitch statistics are engine independent.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from .audio_frontend import AudioFeatures
+
+try:
+    import librosa
+    HAS_LIBROSA = True
+except ImportError:
+    HAS_LIBROSA = False
+
+logger = logging.getLogger("behavior-analysis.pitch-engine")
+
+
+def _parabolic(curve: np.ndarray, idx: np.ndarray) -> np.ndarray:
+    """Sub-sample offset of the extremum at curve[row, idx] from its two neighbours."""
+    rows = np.arange(len(curve))
+    idx = np.clip(idx, 1, curve.shape[1] - 2)
+    a, b, c = curve[rows, idx - 1], curve[rows, idx], curve[rows, idx + 1]
+    denom = a - 2 * b + c
+    safe = np.where(np.abs(denom) > 1e-12, denom, 1.0)
+    return np.where(np.abs(denom) > 1e-12, 0.5 * (a - c) / safe, 0.0)
+
+
+class PitchEngine:
+    """Frame-level F0 tracker over the features of one chunk."""
+
+    name = 'base'
+
+    def __init__(self, sample_rate: int = 16000, fmin: float = 50, fmax: float = 500):
+        self.sample_rate = sample_rate
+        self.fmin = fmin
+        self.fmax = fmax
+        self.min_lag = max(2, int(sample_rate / fmax))
+        self.max_lag = int(sample_rate / fmin)
+
+    def track(self, features: AudioFeatures) -> np.ndarray:
+        """F0 (Hz) of the voiced frames of the chunk (VAD-active ones only), in frame order."""
+        raise NotImplementedError
+
+    def _lags(self, features: AudioFeatures) -> tuple:
+        """Periodicity over lags 0..max_lag, and the usable max lag."""
+        max_lag = min(self.max_lag, features.frame_length // 2)
+        return features.periodicity[:, :max_lag + 1], max_lag
+
+    def _in_range(self, f0: np.ndarray) -> np.ndarray:
+        return f0[(f0 >= self.fmin) & (f0 <= self.fmax)]
+
+
+# ── YIN ──────────────────────────────────────────────────────────────────────────
+
+class YinEngine(PitchEngine):
+    """YIN (de Cheveigné & Kawahara, 2002), vectorized over the frames of a chunk."""
+
+    name = 'yin'
+    THRESHOLD = 0.15         # CMNDF dip that counts as periodic
+    MIN_ENERGY = 1e-6        # mean square below this = silent frame
+
+    def track(self, features: AudioFeatures) -> np.ndarray:
+        acf, max_lag = self._lags(features)
+        if len(acf) == 0:
+            return np.array([])
+
+        # Difference function from the normalized autocorrelation: d(τ) = 2 (r(0) − r(τ))
+        diff = np.maximum(2.0 * (1.0 - acf), 0.0)
+
+        # Cumulative mean normalized difference
+        lags = np.arange(1, max_lag + 1)
+        running = np.cumsum(diff[:, 1:], axis=1)
+        cmnd = np.ones_like(diff)
+        cmnd[:, 1:] = diff[:, 1:] * lags / np.maximum(running, 1e-12)
+
+        # First dip below the threshold, then down to its local minimum;
+        # frames without one fall back to the global minimum if it is clear enough
+        search = cmnd[:, self.min_lag:max_lag]
+        below = search < self.THRESHOLD
+        first = np.argmax(below, axis=1)
+        rising = np.ones_like(below)
+        rising[:, :-1] = search[:, 1:] >= search[:, :-1]
+        cols = np.arange(search.shape[1])
+        settle = np.argmax(rising & (cols >= first[:, None]), axis=1)
+        voiced = below.any(axis=1)
+        best = np.where(voiced, settle, np.argmin(search, axis=1))
+        rows = np.arange(len(search))
+        voiced |= search[rows, best] < 2 * self.THRESHOLD
+        voiced &= features.active_rows(features.frame_energy) > self.MIN_ENERGY
+
+        lag = best + self.min_lag
+        f0 = self.sample_rate / (lag + _parabolic(cmnd, lag))
+        return self._in_range(f0[voiced])
+
+
+# ── Autocorrelation ──────────────────────────────────────────────────────────────
+
+class AcfEngine(PitchEngine):
+    """Highest autocorrelation peak in the pitch range.
+
+    Reads the window-tapered autocorrelation, not the periodicity feature:
+    dividing out the window's taper lifts the subharmonic peaks at long
+    lags to the height of the true one, and the argmax then picks them.
+    """
+
+    name = 'acf'
+    MIN_CLARITY = 0.1        # peak must reach this fraction of the zero-lag energy
+
+    def track(self, features: AudioFeatures) -> np.ndarray:
+        max_lag = min(self.max_lag, features.frame_length // 2)
+        acf = features.autocorrelation[:, :max_lag + 1]
+        if len(acf) == 0:
+            return np.array([])
+
+        segment = acf[:, self.min_lag:max_lag]
+        peak = np.argmax(segment, axis=1)
+        rows = np.arange(len(segment))
+        voiced = segment[rows, peak] >= self.MIN_CLARITY
+
+        lag = peak + self.min_lag
+        f0 = self.sample_rate / (lag + _parabolic(acf, lag))
+        return self._in_range(f0[voiced])
+
+
+# ── pyin ─────────────────────────────────────────────────────────────────────────
+
+class PyinEngine(PitchEngine):
+    """librosa.pyin: probabilistic YIN with Viterbi voicing (slow, most accurate)."""
+
+    name = 'pyin'
+
+    FRAME_LENGTH = 2048
+    HOP = 512
+
+    def track(self, features: AudioFeatures) -> np.ndarray:
+        # pyin frames the raw window itself (the shared spectrum is not used);
+        # its output is then masked with the VAD frames nearest each pyin frame
+        if len(features.audio) < self.FRAME_LENGTH:
+            return np.array([])
+        try:
+            f0, voiced, _ = librosa.pyin(
+                features.audio,
+                fmin=self.fmin,
+                fmax=self.fmax,
+                sr=self.sample_rate,
+                frame_length=self.FRAME_LENGTH,
+                hop_length=self.HOP,
+            )
+        except Exception:
+            return np.array([])
+        if f0 is None:
+            return np.array([])
+        keep = voiced & ~np.isnan(f0)
+        if features.active is not None and features.n_frames:
+            centres = np.arange(len(f0)) * self.HOP       # pyin frames are centred
+            keep &= features.active[features.frame_at(centres)]
+        return f0[keep]
+
+
+# ── Selection ────────────────────────────────────────────────────────────────────
+
+PITCH_ENGINES = ('yin', 'acf', 'pyin')
+
+
+def get_pitch_engine(name: Optional[str] = None, **options) -> PitchEngine:
+    """Engine by name; `options` are PitchEngine's constructor arguments.
+
+    'pyin' without librosa installed falls back to 'yin', the closest in
+    accuracy of the engines that need no librosa.
+    """
+    name = (name or 'yin').lower()
+    if name == 'yin':
+        return YinEngine(**options)
+    if name == 'acf':
+        return AcfEngine(**options)
+    if name == 'pyin':
+        if not HAS_LIBROSA:
+            logger.warning("pyin pitch engine needs librosa; using 'yin'")
+            return YinEngine(**options)
+        return PyinEngine(**options)
+    raise ValueError(f"Unknown pitch engine '{name}' (expected one of {PITCH_ENGINES})")
@@ -5,11 +5,19 @@ Generates a 2D stress heatmap overlaying the candidate's face/body,
 showing areas of highest behavioral stress indicators.
 
 Output: 64x48 grid of stress intensity values (0-255) for frontend rendering.
+
+Temporal model is time-based, not call-based: between updates the grid
+relaxes toward the newly painted target with retention exp(-dt·ln2 / T½),
+so the result no longer depends on how often generate() is called and the
+generator can run at its own low cadence. T½ is HEATMAP_HALF_LIFE_MS,
+passed in by the orchestrator.
 """
 
+import math
 import time
 from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -23,12 +31,17 @@ from .audio_analyzer import AudioMetrics
 class HeatmapFrame:
     """Single frame of the stress heatmap."""
     timestamp: float
-    grid: list                    # 2D list [rows][cols] of 0-255 values
+    pixels: np.ndarray            # uint8 [rows, cols] of 0-255 values
     resolution: tuple             # (width, height)
     peak_zones: list              # List of { zone, intensity, x, y }
     overall_stress_level: float   # 0-100
     dominant_indicator: str       # Which indicator is causing most stress
 
+    @property
+    def grid(self) -> list:
+        """Legacy 2D list [rows][cols] — only built when a client asks for it."""
+        return self.pixels.tolist()
+
 
 class StressHeatmapGenerator:
     """
@@ -59,28 +72,46 @@ class StressHeatmapGenerator:
         'RIGHT_HAND':   (0.60, 1.00, 0.80, 1.00),
     }
 
-    def __init__(self, resolution: tuple = (64, 48)):
+    REGION_NAMES = tuple(REGIONS)
+    REGION_INDEX = {name: i for i, name in enumerate(REGION_NAMES)}
+
+    # Calibration point for painting: the original per-call retention of 0.85
+    # (at 30 calls/s). New paint is scaled so that retention paints as before.
+    REFERENCE_RETENTION = 0.85
+
+    def __init__(self, resolution: tuple = (64, 48), *, half_life_s: float):
         self.width, self.height = resolution
-        self._history: deque = deque(maxlen=60)  # ~2s at 30fps
-        self._decay_rate = 0.85  # Temporal smoothing (previous frame retention)
+        self._history: deque = deque(maxlen=60)
+        self._decay_per_s = math.log(2) / max(1e-3, half_life_s)
         self._current_grid: Optional[np.ndarray] = None
+        self._last_update: Optional[float] = None
+        self._masks, self._region_boxes, self._box_weights = _region_kernels(self.width, self.height)
 
     def generate(
         self,
         face: Optional[FaceSnapshot],
         hands: Optional[HandGestureMetrics],
         audio: Optional[AudioMetrics],
+        now: Optional[float] = None,
     ) -> HeatmapFrame:
-        """Generate a single heatmap frame from all analyzer outputs."""
-        now = time.time()
+        """Generate a heatmap frame from the current analyzer outputs at time `now`."""
+        now = now or time.time()
 
-        # Start with decayed previous grid or zeros
+        # Start with the previous grid decayed by the elapsed time, or zeros
         if self._current_grid is not None:
-            grid = self._current_grid * self._decay_rate
+            dt = max(0.0, now - self._last_update)
+            retention = math.exp(-self._decay_per_s * dt)
+            grid = self._current_grid * retention
         else:
+            retention = self.REFERENCE_RETENTION
             grid = np.zeros((self.height, self.width), dtype=np.float32)
+        self._last_update = now
+        # Relax toward the painted target: new paint weighs (1 - retention),
+        # normalized so the reference cadence paints exactly as before
+        paint_gain = (1.0 - retention) / (1.0 - self.REFERENCE_RETENTION)
 
         indicators = {}
+        intensities = np.zeros(len(self.REGION_NAMES), dtype=np.float32)
 
         # ── Map face metrics to regions ──────────────────────────────────
         if face and face.face_detected and face.eye:
@@ -90,8 +121,8 @@ class StressHeatmapGenerator:
                 min(100, face.eye.blink_rate_per_min * 2) * 0.3 +
                 (50 if face.eye.saccade_detected else 0) * 0.3
             )
-            self._paint_region(grid, 'LEFT_EYE', eye_stress)
-            self._paint_region(grid, 'RIGHT_EYE', eye_stress)
+            self._paint_region(intensities, 'LEFT_EYE', eye_stress)
+            self._paint_region(intensities, 'RIGHT_EYE', eye_stress)
             indicators['eye_stress'] = eye_stress
 
             # Forehead: eyebrow raise (surprise/fear) + head movement
@@ -101,7 +132,7 @@ class StressHeatmapGenerator:
                     face.expression.fear_score * 0.4 +
                     min(100, abs(face.head_pitch) * 2) * 0.3
                 )
-                self._paint_region(grid, 'FOREHEAD', forehead_stress)
+                self._paint_region(intensities, 'FOREHEAD', forehead_stress)
                 indicators['forehead_stress'] = forehead_stress
 
                 # Mouth: lip compression + jaw clench
@@ -111,13 +142,13 @@ class StressHeatmapGenerator:
                     face.expression.anger_score * 0.15 +
                     face.expression.disgust_score * 0.15
                 )
-                self._paint_region(grid, 'MOUTH', mouth_stress)
+                self._paint_region(intensities, 'MOUTH', mouth_stress)
                 indicators['mouth_stress'] = mouth_stress
 
                 # Cheeks: facial tension (asymmetry)
                 cheek_stress = face.facial_tension * 0.6 + face.expression.contempt_score * 0.4
-                self._paint_region(grid, 'LEFT_CHEEK', cheek_stress)
-                self._paint_region(grid, 'RIGHT_CHEEK', cheek_stress * (0.7 + face.expression.contempt_score * 0.003))
+                self._paint_region(intensities, 'LEFT_CHEEK', cheek_stress)
+                self._paint_region(intensities, 'RIGHT_CHEEK', cheek_stress * (0.7 + face.expression.contempt_score * 0.003))
                 indicators['cheek_stress'] = cheek_stress
 
         # ── Map audio metrics to throat region ───────────────────────────
@@ -129,8 +160,8 @@ class StressHeatmapGenerator:
                 (30 if audio.vocal_fry_detected else 0) * 0.1 +
                 (30 if audio.pressed_voice_detected else 0) * 0.1
             )
-            self._paint_region(grid, 'THROAT', throat_stress)
-            self._paint_region(grid, 'CHIN', throat_stress * 0.5)
+            self._paint_region(intensities, 'THROAT', throat_stress)
+            self._paint_region(intensities, 'CHIN', throat_stress * 0.5)
             indicators['vocal_stress'] = throat_stress
 
         # ── Map hand metrics to hand regions ─────────────────────────────
@@ -143,11 +174,15 @@ class StressHeatmapGenerator:
                 (25 if hands.tapping_detected else 0) * 0.15
             )
             if hands.left_hand_visible:
-                self._paint_region(grid, 'LEFT_HAND', hand_stress)
+                self._paint_region(intensities, 'LEFT_HAND', hand_stress)
             if hands.right_hand_visible:
-                self._paint_region(grid, 'RIGHT_HAND', hand_stress)
+                self._paint_region(intensities, 'RIGHT_HAND', hand_stress)
             indicators['hand_stress'] = hand_stress
 
+        # One weighted sum of the cached region masks
+        if intensities.any():
+            grid += np.tensordot(intensities * paint_gain, self._masks, axes=1)
+
         # Clip and store
         grid = np.clip(grid, 0, 255)
         self._current_grid = grid
@@ -165,7 +200,7 @@ class StressHeatmapGenerator:
 
         return HeatmapFrame(
             timestamp=now,
-            grid=grid.astype(np.uint8).tolist(),
+            pixels=grid.astype(np.uint8),
             resolution=(self.width, self.height),
             peak_zones=peak_zones,
             overall_stress_level=round(overall, 1),
@@ -174,38 +209,22 @@ class StressHeatmapGenerator:
 
     # ── Private ──────────────────────────────────────────────────────────────────
 
-    def _paint_region(self, grid: np.ndarray, region_name: str, intensity: float):
-        """Paint a region on the grid with given intensity (additive, Gaussian falloff)."""
-        if region_name not in self.REGIONS:
-            return
-        y1f, y2f, x1f, x2f = self.REGIONS[region_name]
-        y1, y2 = int(y1f * self.height), int(y2f * self.height)
-        x1, x2 = int(x1f * self.width), int(x2f * self.width)
-
-        # Create Gaussian blob
-        cy = (y1 + y2) // 2
-        cx = (x1 + x2) // 2
-        ry = max(1, (y2 - y1) // 2)
-        rx = max(1, (x2 - x1) // 2)
-
-        for y in range(max(0, y1), min(self.height, y2)):
-            for x in range(max(0, x1), min(self.width, x2)):
-                dy = (y - cy) / ry
-                dx = (x - cx) / rx
-                falloff = np.exp(-0.5 * (dx ** 2 + dy ** 2))
-                grid[y, x] += intensity * falloff * 2.55  # scale 0-100 → 0-255
+    def _paint_region(self, intensities: np.ndarray, region_name: str, intensity: float):
+        """Queue a region paint (additive); applied as one tensordot over the cached masks."""
+        idx = self.REGION_INDEX.get(region_name)
+        if idx is not None:
+            intensities[idx] += intensity
 
     def _find_peak_zones(self, grid: np.ndarray) -> list:
         """Find the top stress zones on the heatmap."""
         peaks = []
-        for name, (y1f, y2f, x1f, x2f) in self.REGIONS.items():
-            y1, y2 = int(y1f * self.height), int(y2f * self.height)
-            x1, x2 = int(x1f * self.width), int(x2f * self.width)
-            region = grid[y1:y2, x1:x2]
-            if region.size == 0:
+        means = self._box_weights @ grid.ravel()   # every region mean in one product
+        for (name, y1, y2, x1, x2, nonempty), intensity in zip(self._region_boxes, means):
+            if not nonempty:
                 continue
-            intensity = float(np.mean(region))
+            intensity = float(intensity)
             if intensity > 15:
+                region = grid[y1:y2, x1:x2]
                 max_pos = np.unravel_index(np.argmax(region), region.shape)
                 peaks.append({
                     'zone': name,
@@ -214,3 +233,48 @@ class StressHeatmapGenerator:
                     'y': int(y1 + max_pos[0]),
                 })
         return sorted(peaks, key=lambda p: p['intensity'], reverse=True)[:5]
+
+
+# ── Region kernels ───────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=8)
+def _region_kernels(width: int, height: int) -> tuple:
+    """
+    Precompute (once per resolution) the Gaussian falloff mask of every
+    region, scaled 0-100 → 0-255, plus the region boxes and the
+    box-mean weights used by peak-zone search. Shared read-only by every
+    session and executor lane; lru_cache keeps the lookup thread-safe and
+    bounds the number of resolutions held.
+    """
+    regions = StressHeatmapGenerator.REGIONS
+    names = StressHeatmapGenerator.REGION_NAMES
+    masks = np.zeros((len(names), height, width), dtype=np.float32)
+    box_weights = np.zeros((len(names), height * width), dtype=np.float32)
+    boxes = []
+    ys = np.arange(height, dtype=np.float64)[:, None]
+    xs = np.arange(width, dtype=np.float64)[None, :]
+
+    for i, name in enumerate(names):
+        y1f, y2f, x1f, x2f = regions[name]
+        y1, y2 = int(y1f * height), int(y2f * height)
+        x1, x2 = int(x1f * width), int(x2f * width)
+
+        # Gaussian blob centred on the region, confined to its box
+        cy, cx = (y1 + y2) // 2, (x1 + x2) // 2
+        ry, rx = max(1, (y2 - y1) // 2), max(1, (x2 - x1) // 2)
+        falloff = np.exp(-0.5 * (((xs - cx) / rx) ** 2 + ((ys - cy) / ry) ** 2))
+        py1, py2 = max(0, y1), min(height, y2)
+        px1, px2 = max(0, x1), min(width, x2)
+        masks[i, py1:py2, px1:px2] = falloff[py1:py2, px1:px2] * 2.55
+
+        # Peak-zone box (same slicing as the grid lookup)
+        box = np.zeros((height, width), dtype=np.float32)
+        box[y1:y2, x1:x2] = 1.0
+        size = box.sum()
+        if size > 0:
+            box_weights[i] = box.ravel() / size
+        boxes.append((name, y1, y2, x1, x2, size > 0))
+
+    masks.setflags(write=False)
+    box_weights.setflags(write=False)
+    return masks, tuple(boxes), box_weights
@@ -0,0 +1,71 @@
+"""
+Voice Activity — Frame-level speech gate in front of the audio engines.
+
+Candidates are silent for long stretches (GTO planning phases), yet every
+window used to go through full pitch tracking and speech-rate estimation.
+VoiceActivityDetector marks the frames of a window that carry voice, read
+straight from the shared frontend (audio_frontend.py), no extra pass:
+
+  - energy: frame level above the silence threshold
+  - spectral flatness: noise-like frames (hiss, fans, breath) have a flat
+    spectrum (→ 1 for white noise), voiced speech a peaky harmonic one
+
+A short hangover keeps syllable tails and brief dips inside a voiced
+segment. Only active frames reach the pitch / jitter / shimmer engines;
+a window without any skips them and speech-rate estimation altogether.
+Volume and silence bookkeeping always run.
+"""
+
+import numpy as np
+
+from .audio_frontend import AudioFeatures
+
+
+class VoiceActivityDetector:
+    """Energy + spectral-flatness speech / non-speech decision per frame."""
+
+    MAX_FLATNESS = 0.3       # above = noise-like frame
+    HANGOVER_FRAMES = 3      # frames kept active after the last voiced one (~50 ms)
+
+    def __init__(self, threshold_db: float = -40):
+        self.threshold_db = threshold_db
+
+        # Stats
+        self.frames: int = 0
+        self.active_frames: int = 0
+        self.windows: int = 0
+        self.skipped_windows: int = 0
+
+    def detect(self, features: AudioFeatures) -> np.ndarray:
+        """Boolean activity mask over the frames of `features`."""
+        n = features.n_frames
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        energy_db = 10 * np.log10(features.frame_energy + 1e-12)
+        active = (energy_db > self.threshold_db) & (features.flatness < self.MAX_FLATNESS)
+
+        if self.HANGOVER_FRAMES and active.any():
+            held = np.convolve(active, np.ones(self.HANGOVER_FRAMES + 1, dtype=int))[:n]
+            active = held > 0
+
+        self.frames += n
+        self.active_frames += int(active.sum())
+        self.windows += 1
+        self.skipped_windows += not active.any()
+        return active
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    @property
+    def skipped_ratio(self) -> float:
+        """Share of analyzed frames kept away from the pitch engines."""
+        return 1.0 - self.active_frames / self.frames if self.frames else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'frames': self.frames,
+            'active_frames': self.active_frames,
+            'skipped_ratio': round(self.skipped_ratio, 3),
+            'windows': self.windows,
+            'skipped_windows': self.skipped_windows,
+        }
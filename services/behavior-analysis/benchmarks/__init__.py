@@ -0,0 +1 @@
+"""Benchmarks — run as modules from services/behavior-analysis (python -m benchmarks.<name>)."""
@@ -0,0 +1,130 @@
+"""
+Benchmark — Inference backend parity and throughput.
+
+Runs the face and hand landmark graphs of the reference backend
+(MediaPipe) and a candidate backend (ONNX Runtime, optionally int8) over
+the same recorded frames and reports, per graph:
+
+  - drift: mean / p95 landmark distance between the backends, in units of
+    the reference's inter-ocular distance (face) or wrist→middle-MCP
+    length (hands), on frames where both found the face / same hand
+  - agreement: share of frames where both agree on presence (and handedness)
+  - frames/sec per core: frames over process CPU time, so backends that
+    spread work over several threads are compared fairly
+
+Exits with status 1 when a graph's mean drift exceeds --max-drift, so it
+doubles as the parity check before switching a deployment's backend:
+
+    python -m benchmarks.backend_parity interview.mp4 --model-dir models --int8
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from analyzers.inference_backend import MediaPipeBackend, get_backend
+from benchmarks.holistic_vs_split import load_frames
+
+
+def run_graph(graph, frames: list) -> dict:
+    results = []
+    cpu, wall = time.process_time(), time.perf_counter()
+    for frame in frames:
+        results.append(graph.process(frame.rgb))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    graph.close()
+    return {
+        'results': results,
+        'fps': len(frames) / wall,
+        'fps_per_core': len(frames) / max(cpu, 1e-9),
+    }
+
+
+def face_drift(ref: list, cand: list, w: int, h: int) -> tuple:
+    errors, agree = [], 0
+    for r, c in zip(ref, cand):
+        agree += bool(r) == bool(c)
+        if r and c:
+            rp, cp = r[0].points[:, :2] * (w, h), c[0].points[:, :2] * (w, h)
+            scale = np.linalg.norm(rp[33] - rp[263]) + 1e-6
+            errors.append(float(np.linalg.norm(rp - cp, axis=1).mean()) / scale)
+    return errors, agree
+
+
+def hand_drift(ref: list, cand: list, w: int, h: int) -> tuple:
+    errors, agree = [], 0
+    for r, c in zip(ref, cand):
+        r_hands = {hand.label: hand for hand in r}
+        c_hands = {hand.label: hand for hand in c}
+        agree += set(r_hands) == set(c_hands)
+        for label in set(r_hands) & set(c_hands):
+            rp = r_hands[label].points[:, :2] * (w, h)
+            cp = c_hands[label].points[:, :2] * (w, h)
+            scale = np.linalg.norm(rp[0] - rp[9]) + 1e-6
+            errors.append(float(np.linalg.norm(rp - cp, axis=1).mean()) / scale)
+    return errors, agree
+
+
+def compare(name: str, ref: dict, cand: dict, drift_fn, frames: list) -> dict:
+    errors, agree = drift_fn(ref['results'], cand['results'], frames[0].width, frames[0].height)
+    return {
+        'graph': name,
+        'compared_frames': len(errors),
+        'drift_mean': round(float(np.mean(errors)), 4) if errors else None,
+        'drift_p95': round(float(np.percentile(errors, 95)), 4) if errors else None,
+        'agreement': round(agree / len(frames), 3),
+        'reference_fps_per_core': round(ref['fps_per_core'], 1),
+        'candidate_fps_per_core': round(cand['fps_per_core'], 1),
+        'reference_fps': round(ref['fps'], 1),
+        'candidate_fps': round(cand['fps'], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video', help='recorded interview video (any format OpenCV reads)')
+    parser.add_argument('--backend', default='onnx', help='candidate backend')
+    parser.add_argument('--model-dir', default='models')
+    parser.add_argument('--int8', action='store_true')
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--providers', default='CPUExecutionProvider')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--width', type=int, default=640, help='analysis width')
+    parser.add_argument('--max-drift', type=float, default=0.05, help='fail above this mean drift')
+    parser.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames, args.width)
+    reference = MediaPipeBackend()
+    candidate = get_backend(
+        args.backend, model_dir=args.model_dir, int8=args.int8, threads=args.threads,
+        providers=[p.strip() for p in args.providers.split(',') if p.strip()],
+    )
+
+    report = [
+        compare('face', run_graph(reference.face_landmarker(), frames),
+                run_graph(candidate.face_landmarker(), frames), face_drift, frames),
+        compare('hands', run_graph(reference.hand_landmarker(), frames),
+                run_graph(candidate.hand_landmarker(), frames), hand_drift, frames),
+    ]
+    failed = [r['graph'] for r in report if r['drift_mean'] is not None and r['drift_mean'] > args.max_drift]
+
+    if args.json:
+        print(json.dumps({'report': report, 'failed': failed}, indent=2))
+    else:
+        label = f"{args.backend}{' int8' if args.int8 else ''}"
+        print(f"{len(frames)} frames at {frames[0].width}x{frames[0].height}; mediapipe vs {label}")
+        print(f"{'graph':<8}{'frames':>8}{'drift':>9}{'p95':>9}{'agree':>8}{'ref f/s/core':>14}{'cand f/s/core':>15}")
+        for r in report:
+            print(f"{r['graph']:<8}{r['compared_frames']:>8}{str(r['drift_mean']):>9}{str(r['drift_p95']):>9}"
+                  f"{r['agreement']:>8}{r['reference_fps_per_core']:>14}{r['candidate_fps_per_core']:>15}")
+        if failed:
+            print(f"FAIL: mean drift above {args.max_drift} for {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark — One Holistic graph vs. the Face Mesh + Hands two-graph path.
+
+Runs both paths over the same decoded frames of a recorded video and
+reports per-frame latency and detection counts for each:
+
+    python -m benchmarks.holistic_vs_split interview.mp4 --frames 600 --width 640
+
+Run from services/behavior-analysis. Both paths get private graphs (the
+first frame, which builds them, is left out of the timings); the presence
+gates of the two-graph path are disabled so every frame pays for full
+inference, like the Holistic path does.
+"""
+
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+from analyzers import AnalysisFrame, FaceAnalyzer, HandGestureAnalyzer, HolisticAnalyzer
+
+NEVER = 1 << 30     # absent_after that never engages a presence gate
+
+
+def load_frames(path: str, limit: int, width: int) -> list:
+    """Decode up to `limit` frames, resized to the analysis width like the service does."""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, bgr = cap.read()
+        if not ok:
+            break
+        h, w = bgr.shape[:2]
+        if w > width:
+            bgr = cv2.resize(bgr, (width, round(h * width / w)), interpolation=cv2.INTER_AREA)
+        frames.append(AnalysisFrame.from_bgr(bgr))
+    cap.release()
+    if not frames:
+        raise SystemExit(f"No frames decoded from {path}")
+    return frames
+
+
+def run_split(frames: list, fps: float) -> dict:
+    face = FaceAnalyzer(absent_after=NEVER)
+    hands = HandGestureAnalyzer(absent_after=NEVER)
+    times, faces, hand_count = [], 0, 0
+    t0 = time.time()
+    for i, frame in enumerate(frames):
+        now = t0 + i / fps
+        started = time.perf_counter()
+        snap = face.process_frame(frame, now)
+        metrics = hands.process_frame(frame, snap.landmarks, now)
+        times.append(time.perf_counter() - started)
+        faces += snap.face_detected
+        hand_count += metrics.hands_detected
+    face.release()
+    hands.release()
+    return _summary('face_mesh+hands', times, faces, hand_count)
+
+
+def run_holistic(frames: list, fps: float, model_complexity: int) -> dict:
+    holistic = HolisticAnalyzer(model_complexity=model_complexity)
+    times, faces, hand_count, poses = [], 0, 0, 0
+    t0 = time.time()
+    for i, frame in enumerate(frames):
+        now = t0 + i / fps
+        started = time.perf_counter()
+        snap, metrics, posture = holistic.process_frame(frame, now)
+        times.append(time.perf_counter() - started)
+        faces += snap.face_detected
+        hand_count += metrics.hands_detected
+        poses += posture.pose_detected
+    holistic.release()
+    result = _summary(f'holistic(complexity={model_complexity})', times, faces, hand_count)
+    result['pose_frames'] = poses
+    return result
+
+
+def _summary(name: str, times: list, faces: int, hands: int) -> dict:
+    ms = np.array(times[1:] or times) * 1000   # first frame includes graph warm-up
+    return {
+        'path': name,
+        'frames': len(times),
+        'mean_ms': round(float(ms.mean()), 2),
+        'p50_ms': round(float(np.percentile(ms, 50)), 2),
+        'p95_ms': round(float(np.percentile(ms, 95)), 2),
+        'fps': round(1000 / float(ms.mean()), 1),
+        'face_frames': faces,
+        'hand_detections': hands,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video', help='recorded interview video (any format OpenCV reads)')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--width', type=int, default=640, help='analysis width')
+    parser.add_argument('--fps', type=float, default=30.0, help='timestamp spacing for the temporal metrics')
+    parser.add_argument('--model-complexity', type=int, default=1, help='Holistic pose model (0, 1, 2)')
+    parser.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames, args.width)
+    results = [run_split(frames, args.fps), run_holistic(frames, args.fps, args.model_complexity)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(frames)} frames at {frames[0].width}x{frames[0].height}")
+    print(f"{'path':<26}{'mean ms':>9}{'p50 ms':>9}{'p95 ms':>9}{'fps':>8}{'faces':>8}{'hands':>8}")
+    for r in results:
+        print(f"{r['path']:<26}{r['mean_ms']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['fps']:>8}"
+              f"{r['face_frames']:>8}{r['hand_detections']:>8}")
+    split, holistic = results
+    print(f"holistic / split mean latency: {holistic['mean_ms'] / split['mean_ms']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark — Pitch engine accuracy and throughput.
+
+Runs every available pitch engine (analyzers/pitch_engine.py) over the
+same 1 s chunks and reports, per engine:
+
+  - F0 error: synthetic voice (harmonic source with vibrato, shimmer and
+    noise at known F0s) → mean |error| in cents of the tracked frames and
+    the gross error rate (frames more than 20% off, i.e. octave errors);
+    recorded voice → the same against pyin's chunk means, pyin being the
+    reference (skipped without librosa)
+  - voiced: share of chunks where the engine found at least two F0 frames
+    (the analyzer reports no pitch below that)
+  - chunks/sec: chunks over process CPU time, the frontend's transform
+    included (each engine gets fresh features)
+
+Exits with status 1 when an engine's gross error rate exceeds
+--max-gross on any corpus, so an engine that starts tracking subharmonics
+cannot pass silently:
+
+    python -m benchmarks.pitch_engines --wav interview.wav --chunks 120
+
+Run from services/behavior-analysis. WAVs are mixed to mono and must be
+16 kHz, the rate the service analyzes at.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from analyzers.audio_frontend import AudioFrontend
+from analyzers.pitch_engine import HAS_LIBROSA, PITCH_ENGINES, get_pitch_engine
+
+SAMPLE_RATE = 16000
+GROSS_ERROR = 0.2
+
+
+def synthetic_chunks(n: int, seed: int = 7) -> list:
+    """(chunk, true mean F0) pairs: 80–320 Hz voices, 5 Hz vibrato, noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    chunks = []
+    for i in range(n):
+        f0 = 80 * 4 ** (i / max(1, n - 1))
+        inst = f0 * (1 + 0.01 * np.sin(2 * np.pi * 5 * t))
+        phase = 2 * np.pi * np.cumsum(inst) / SAMPLE_RATE
+        voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+        voice *= 1 + 0.05 * np.sin(2 * np.pi * 3 * t)
+        voice = 0.3 * voice / np.max(np.abs(voice)) + 0.01 * rng.standard_normal(len(t))
+        chunks.append((voice.astype(np.float32), float(np.mean(inst))))
+    return chunks
+
+
+def recorded_chunks(path: str, n: int) -> list:
+    import soundfile as sf
+    audio, sr = sf.read(path, dtype='float32', always_2d=True)
+    if sr != SAMPLE_RATE:
+        raise SystemExit(f"{path}: {sr} Hz, expected {SAMPLE_RATE}")
+    audio = audio.mean(axis=1)
+    return [audio[i:i + SAMPLE_RATE] for i in range(0, len(audio) - SAMPLE_RATE + 1, SAMPLE_RATE)][:n]
+
+
+def run_engine(engine, chunks: list) -> dict:
+    frontend = AudioFrontend(SAMPLE_RATE)
+    tracks = []
+    cpu = time.process_time()
+    for chunk in chunks:
+        tracks.append(engine.track(frontend.analyze(chunk)))
+    cpu = time.process_time() - cpu
+    return {'tracks': tracks, 'chunks_per_s': len(chunks) / max(cpu, 1e-9)}
+
+
+def f0_error(tracks: list, truth: list) -> dict:
+    cents, gross, voiced = [], 0, 0
+    for f0, ref in zip(tracks, truth):
+        if len(f0) >= 2:
+            voiced += 1
+        if not ref or len(f0) == 0:
+            continue
+        ratio = f0 / ref
+        cents.extend(np.abs(1200 * np.log2(ratio)))
+        gross += int(np.sum(np.abs(ratio - 1) > GROSS_ERROR))
+    return {
+        'frames': len(cents),
+        'cents_mean': round(float(np.mean(cents)), 1) if cents else None,
+        'gross_error': round(gross / len(cents), 3) if cents else None,
+        'voiced_chunks': round(voiced / max(1, len(tracks)), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--wav', help='recorded voice, 16 kHz')
+    parser.add_argument('--chunks', type=int, default=60, help='1 s chunks per corpus')
+    parser.add_argument('--max-gross', type=float, default=0.02, help='fail above this gross error rate')
+    parser.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    args = parser.parse_args()
+
+    # Without librosa 'pyin' resolves to 'yin'; keep one of each
+    engines = list({e.name: e for e in (get_pitch_engine(n, sample_rate=SAMPLE_RATE) for n in PITCH_ENGINES)}.values())
+    corpora = {'synthetic': synthetic_chunks(args.chunks)}
+    if args.wav:
+        corpora['recorded'] = [(chunk, None) for chunk in recorded_chunks(args.wav, args.chunks)]
+
+    report = []
+    for corpus, pairs in corpora.items():
+        chunks = [c for c, _ in pairs]
+        runs = {e.name: run_engine(e, chunks) for e in engines}
+        if corpus == 'recorded':
+            if not HAS_LIBROSA:
+                print("recorded: no librosa, no pyin reference; F0 error skipped")
+            truth = [float(np.mean(f0)) if len(f0) >= 2 else None for f0 in runs['pyin']['tracks']] \
+                if 'pyin' in runs else [None] * len(chunks)
+        else:
+            truth = [ref for _, ref in pairs]
+        for name, run in runs.items():
+            report.append({
+                'corpus': corpus,
+                'engine': name,
+                **f0_error(run['tracks'], truth),
+                'chunks_per_s': round(run['chunks_per_s'], 1),
+            })
+
+    failed = [f"{r['corpus']}/{r['engine']}" for r in report
+              if r['gross_error'] is not None and r['gross_error'] > args.max_gross]
+
+    if args.json:
+        print(json.dumps({'report': report, 'failed': failed}, indent=2))
+        sys.exit(1 if failed else 0)
+    print(f"{'corpus':<11}{'engine':<7}{'frames':>8}{'cents':>8}{'gross':>8}{'voiced':>8}{'chunks/s':>10}")
+    for r in report:
+        print(f"{r['corpus']:<11}{r['engine']:<7}{r['frames']:>8}{str(r['cents_mean']):>8}"
+              f"{str(r['gross_error']):>8}{r['voiced_chunks']:>8}{r['chunks_per_s']:>10}")
+    if failed:
+        print(f"FAIL: gross error rate above {args.max_gross} for {', '.join(failed)}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -28,16 +28,77 @@ class Settings(BaseModel):
     FACE_MESH_MAX_FACES: int = 1
     FACE_MESH_MIN_DETECTION_CONFIDENCE: float = 0.5
     FACE_MESH_MIN_TRACKING_CONFIDENCE: float = 0.5
+    # Face presence gate: after N mesh misses, only a cheap detector probes for a face
+    FACE_ABSENT_AFTER_MISSES: int = int(os.getenv("BA_FACE_ABSENT_AFTER_MISSES", "10"))
+    FACE_PROBE_INTERVAL_MS: float = float(os.getenv("BA_FACE_PROBE_INTERVAL_MS", "500"))
     HAND_MAX_HANDS: int = 2
     HAND_MIN_DETECTION_CONFIDENCE: float = 0.5
     HAND_MIN_TRACKING_CONFIDENCE: float = 0.5
+    # Hand detection throttle / ROI tracking (analyzers/hand_gesture_analyzer.py)
+    HAND_ABSENT_AFTER_MISSES: int = int(os.getenv("BA_HAND_ABSENT_AFTER_MISSES", "10"))
+    HAND_PROBE_INTERVAL_MS: float = float(os.getenv("BA_HAND_PROBE_INTERVAL_MS", "500"))
+    HAND_ROI_MARGIN: float = 0.05        # crop padding, fraction of frame width
     POSE_MIN_DETECTION_CONFIDENCE: float = 0.5
     POSE_MIN_TRACKING_CONFIDENCE: float = 0.5
+    # One Holistic graph for face + hands + pose instead of Face Mesh + Hands (analyzers/holistic_analyzer.py);
+    # Holistic is MediaPipe-only, so it takes precedence over INFERENCE_BACKEND
+    HOLISTIC_MODE: bool = os.getenv("BA_HOLISTIC_MODE", "false").lower() == "true"
+    HOLISTIC_MODEL_COMPLEXITY: int = int(os.getenv("BA_HOLISTIC_MODEL_COMPLEXITY", "1"))  # pose model: 0 lite, 1 full, 2 heavy
+    # Landmark inference backend (analyzers/inference_backend.py): 'mediapipe' | 'onnx'
+    INFERENCE_BACKEND: str = os.getenv("BA_INFERENCE_BACKEND", "mediapipe")
+    INFERENCE_MODEL_DIR: str = os.getenv("BA_INFERENCE_MODEL_DIR", "models")  # exported .onnx models
+    INFERENCE_INT8: bool = os.getenv("BA_INFERENCE_INT8", "false").lower() == "true"
+    INFERENCE_THREADS: int = int(os.getenv("BA_INFERENCE_THREADS", "1"))  # ORT intra-op threads per session
+    INFERENCE_PROVIDERS: str = os.getenv("BA_INFERENCE_PROVIDERS", "CPUExecutionProvider")  # comma-separated ORT providers
+    # Cross-session micro-batching of model calls; 1 → off. Only the 'onnx' backend batches, only with
+    # thread lanes sharing several graphs, and only models exported with a dynamic batch axis
+    INFERENCE_MAX_BATCH: int = int(os.getenv("BA_INFERENCE_MAX_BATCH", "1"))
+    INFERENCE_BATCH_WAIT_MS: float = float(os.getenv("BA_INFERENCE_BATCH_WAIT_MS", "10"))
+    # Shared graphs per process; 0 → one per analysis lane that can run concurrently
+    MODEL_POOL_SIZE: int = int(os.getenv("BA_MODEL_POOL_SIZE", "0"))
 
     # Analysis config
     FRAME_BUFFER_SIZE: int = 120        # ~4 seconds at 30fps
+    ANALYSIS_WIDTH: int = int(os.getenv("BA_ANALYSIS_WIDTH", "640"))  # frames are decoded/resized down to this width
     METRICS_EMIT_INTERVAL_MS: int = 500  # Emit metrics every 500ms
     HEATMAP_RESOLUTION: tuple = (64, 48) # Stress heatmap grid
+    HEATMAP_FORMAT: str = os.getenv("BA_HEATMAP_FORMAT", "list")  # default wire format (see pipeline/heatmap_codec.py)
+    HEATMAP_KEYFRAME_INTERVAL: int = 10  # delta formats: keyframe every N sent heatmaps
+    HEATMAP_HALF_LIFE_MS: float = 142.0  # time-based decay; ≈ 0.85 retention per frame at 30 fps
+
+    # In-session snapshot history (storage/snapshot_store.py)
+    SNAPSHOT_HEATMAP_INTERVAL: int = 30  # keep one heatmap keyframe every N snapshots
+    SNAPSHOT_MAX_ROWS: int = int(os.getenv("BA_SNAPSHOT_MAX_ROWS", "131072"))  # in-memory rows before spill/decimation
+    SNAPSHOT_SPILL: bool = os.getenv("BA_SNAPSHOT_SPILL", "true").lower() == "true"
+    SNAPSHOT_SPILL_DIR: str = os.getenv("BA_SNAPSHOT_SPILL_DIR", "")  # empty → system temp dir
+
+    # Analysis executor (keeps analyzer work off the asyncio loop)
+    ANALYSIS_EXECUTOR: str = os.getenv("BA_ANALYSIS_EXECUTOR", "thread")  # 'thread' | 'process'
+    ANALYSIS_WORKERS: int = int(os.getenv("BA_ANALYSIS_WORKERS", str(os.cpu_count() or 2)))
+
+    # Per-session stage cadence (stage_scheduler.py); skipped ticks reuse the last result
+    FACE_RATE_HZ: float = float(os.getenv("BA_FACE_RATE_HZ", "15"))
+    HANDS_RATE_HZ: float = float(os.getenv("BA_HANDS_RATE_HZ", "10"))
+    HEATMAP_RATE_HZ: float = float(os.getenv("BA_HEATMAP_RATE_HZ", "5"))
+    FUSION_RATE_HZ: float = float(os.getenv("BA_FUSION_RATE_HZ", "2"))
+    SCHED_LAG_BUDGET_MS: float = float(os.getenv("BA_SCHED_LAG_BUDGET_MS", "250"))
+    SCHED_CPU_BUDGET: float = float(os.getenv("BA_SCHED_CPU_BUDGET", "0.25"))  # lane-seconds per second per session
+    SCHED_MIN_SCALE: float = 0.25        # rates never drop below this fraction of target
+    STAGE_RESULT_TTL_S: float = 2.0      # reused stage results older than this are dropped
+    # Skipped face/hand ticks run on extrapolated landmarks (analyzers/landmark_predictor.py)
+    LANDMARK_PREDICTION: bool = os.getenv("BA_LANDMARK_PREDICTION", "true").lower() == "true"
+    PREDICTION_MAX_ERROR: float = 0.03   # max predicted RMS error, relative to landmark-set size
+
+    # Audio F0 tracking (analyzers/pitch_engine.py): 'yin' | 'acf' | 'pyin' (librosa, slow)
+    PITCH_ENGINE: str = os.getenv("BA_PITCH_ENGINE", "yin")
+    # Streaming audio: chunks of any size feed a ring buffer; the latest 1 s window is analyzed every hop
+    AUDIO_STREAMING: bool = os.getenv("BA_AUDIO_STREAMING", "false").lower() == "true"
+    AUDIO_HOP_MS: float = float(os.getenv("BA_AUDIO_HOP_MS", "250"))
+    # Voice activity gate (analyzers/voice_activity.py): silent frames skip pitch / speech-rate analysis
+    AUDIO_VAD: bool = os.getenv("BA_AUDIO_VAD", "true").lower() == "true"
+
+    # Ingest lanes (video = latest-wins mailbox, audio = flow-controlled FIFO)
+    AUDIO_LANE_SIZE: int = 8             # pause watermark; at 4x the oldest chunk is dropped
 
 
 settings = Settings()
@@ -3,27 +3,41 @@ Behavior Analysis Microservice — FastAPI + WebSocket Server.
 
 Accepts WebRTC video/audio streams via WebSocket, runs real-time
 CV analysis (OpenCV + MediaPipe), and streams behavior metrics back.
+Analyzer work runs on the session-affine AnalysisExecutor, never on
+the event loop.
 
 Endpoints:
   WS  /ws/analyze    — Real-time analysis (video frames + audio chunks)
-  GET /health        — Health check
+  GET /health        — Health check (503 until the model pools are warm)
   GET /sessions      — Active sessions
-  POST /sessions/{id}/summary — Get session summary
+  POST /sessions/{id}/summary — Get session summary (O(1), fine to poll mid-session)
   DELETE /sessions/{id}       — End session + cleanup
 
-Protocol (WebSocket):
+Protocol (WebSocket) — many sessions may share one connection:
   Client → Server:
-    { "type": "start", "session_id": "...", "user_id": "...", "gto_session_id": "..." }
-    { "type": "video_frame", "data": "<base64 JPEG>" }
-    { "type": "audio_chunk", "data": "<base64 PCM16>" }
-    { "type": "combined", "video": "<base64>", "audio": "<base64>" }
-    { "type": "stop" }
-
-  Server → Client:
+    { "type": "start", "session_id": "...", "user_id": "...", "gto_session_id": "...",
+      "emit_interval_ms": 500, "envelope": true, "heatmap_format": "delta-zlib",
+      "analysis_width": 480 }
+    { "type": "video_frame", "session_id": "...", "data": "<base64 JPEG>" }
+    { "type": "audio_chunk", "session_id": "...", "data": "<base64 PCM16>" }
+    { "type": "combined", "session_id": "...", "video": "<base64>", "audio": "<base64>" }
+    { "type": "stop", "session_id": "..." }
+  (`session_id` may be omitted by single-session clients; once two sessions are
+  open at the same time on a connection, every message must carry it.)
+  `emit_interval_ms` is kept within 50-5000 ms; "session_started" reports the
+  interval in effect. Updates whose metrics have not changed are not re-sent.
+  Media may instead be sent as binary frames (see pipeline/protocol.py):
+    [22-byte header | session id | raw JPEG or PCM16] — no base64.
+
+  Server → Client (every message carries "session_id"):
+    Metrics are coalesced to at most one batch per emit interval:
+    { "type": "update", "data": { metrics, heatmap | null, alerts: [...] } }   (envelope: true)
+    or, for legacy clients, the separate messages:
     { "type": "metrics", "data": { ... BehaviorSnapshot ... } }
     { "type": "alert", "data": { ... BehaviorAlert ... } }
-    { "type": "heatmap", "data": { grid, peak_zones, overall_stress } }
+    { "type": "heatmap", "data": { grid | encoding+data, peak_zones, overall_stress } }
     { "type": "session_summary", "data": { ... } }
+    { "type": "flow_control", "lane": "audio", "action": "pause" | "resume" }
     { "type": "error", "message": "..." }
 """
 
@@ -34,7 +48,7 @@ import time
 import uuid
 from contextlib import asynccontextmanager
 from dataclasses import asdict
-from typing import Optional
+from typing import Dict, Optional
 
 import numpy as np
 import orjson
@@ -44,6 +58,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from config import settings
+from pipeline import AnalysisExecutor, OutboundEmitter, SessionIngest
+from pipeline.protocol import MSG_VIDEO_FRAME, ProtocolError, decode_frame, is_binary_frame
 from session_orchestrator import SessionOrchestrator
 from storage import EncryptedMetricsStore
 
@@ -57,7 +73,14 @@ logger = logging.getLogger("behavior-analysis")
 
 # ── Global instances ─────────────────────────────────────────────────────────────
 
-orchestrator = SessionOrchestrator()
+# Thread lanes share one orchestrator, so its model pool needs a graph per lane.
+# Built at import, so a misconfigured inference backend fails before any lane starts.
+orchestrator = SessionOrchestrator(
+    pool_size=settings.MODEL_POOL_SIZE or (settings.ANALYSIS_WORKERS if settings.ANALYSIS_EXECUTOR == 'thread' else 1),
+)
+executor = AnalysisExecutor(orchestrator)
+ingests: Dict[str, SessionIngest] = {}     # session_id → ingest lanes
+emitters: Dict[str, OutboundEmitter] = {}  # session_id → coalescing emitter
 store = EncryptedMetricsStore()
 
 
@@ -66,9 +89,17 @@ async def lifespan(app: FastAPI):
     """Application startup/shutdown."""
     logger.info("Behavior Analysis Microservice starting...")
     await store.connect()
+    executor.start()
+    # Warm MediaPipe graphs in the background; /health reports 503 until done
+    warmup = asyncio.create_task(executor.warm_up())
+    warmup.add_done_callback(
+        lambda t: t.cancelled() or t.exception() is None or logger.error(f"Model warm-up failed: {t.exception()}")
+    )
     logger.info(f"Listening on {settings.HOST}:{settings.PORT}")
     yield
     logger.info("Shutting down...")
+    warmup.cancel()
+    executor.shutdown()
 
 
 # ── FastAPI App ──────────────────────────────────────────────────────────────────
@@ -94,33 +125,35 @@ app.add_middleware(
 
 @app.get("/health")
 async def health():
-    return {
-        "status": "ok",
+    body = {
+        "status": "ok" if executor.models_ready else "warming",
         "service": "behavior-analysis",
-        "active_sessions": orchestrator.active_sessions,
+        "active_sessions": executor.session_count,
+        "executor": executor.stats(),
+        "models": await executor.model_stats(),
         "timestamp": time.time(),
     }
+    return ORJSONResponse(body, status_code=200 if executor.models_ready else 503)
 
 
 @app.get("/sessions")
 async def list_sessions():
-    sessions = []
-    for sid, state in orchestrator._sessions.items():
-        sessions.append({
-            "session_id": sid,
-            "user_id": state.user_id,
-            "gto_session_id": state.gto_session_id,
-            "frame_count": state.frame_count,
-            "audio_chunks": state.audio_chunk_count,
-            "alerts": len(state.all_alerts),
-            "duration_sec": round(time.time() - state.started_at, 1),
-        })
+    sessions = await executor.gather("describe_sessions")
+    for row in sessions:
+        ingest = ingests.get(row["session_id"])
+        if ingest:
+            row["ingest"] = ingest.stats()
+        emitter = emitters.get(row["session_id"])
+        if emitter:
+            row["emitter"] = emitter.stats()
     return {"sessions": sessions, "count": len(sessions)}
 
 
 @app.post("/sessions/{session_id}/summary")
 async def get_summary(session_id: str):
-    summary = orchestrator.get_session_summary(session_id)
+    summary = None
+    if executor.has_session(session_id):
+        summary = await executor.run(session_id, "get_session_summary", session_id)
     if not summary:
         # Try stored summary
         stored = await store.get_session_summary(session_id)
@@ -132,14 +165,11 @@ async def get_summary(session_id: str):
 
 @app.delete("/sessions/{session_id}")
 async def end_session(session_id: str):
-    state = orchestrator.end_session(session_id)
-    if not state:
+    if not executor.has_session(session_id):
         raise HTTPException(404, "Session not found")
 
     # Store summary encrypted
-    summary = orchestrator.get_session_summary(session_id)
-    if summary:
-        await store.store_session_summary(session_id, summary)
+    await _finish_session(session_id)
 
     return {"message": "Session ended", "session_id": session_id}
 
@@ -148,101 +178,186 @@ async def end_session(session_id: str):
 
 @app.websocket("/ws/analyze")
 async def websocket_analyze(ws: WebSocket):
+    """
+    One connection can carry many sessions: inbound messages are routed by
+    their `session_id` and every outbound message is tagged with it. Legacy
+    clients that omit it fall back to the most recently started session, but
+    only until a second session is opened alongside it; media for an unknown
+    session gets an error frame.
+    """
     await ws.accept()
-    session_id: Optional[str] = None
-    metrics_buffer: list = []
-    last_emit = time.time()
+    sessions: Dict[str, SessionIngest] = {}   # sessions owned by this connection
+    default_sid: Optional[str] = None
+    multiplexed = False                       # two sessions were open at once → no default
+    rejected: set = set()                     # unknown session ids already logged
+
+    def route(session_id: Optional[str]) -> Optional[str]:
+        """Explicit session id, else the legacy default (single-session connections only)."""
+        if session_id:
+            return session_id
+        return None if multiplexed else default_sid
+
+    async def reject(sid: Optional[str], what: str):
+        if sid not in rejected:
+            rejected.add(sid)
+            logger.warning(f"{ws.client}: {what} for unknown session {sid!r} dropped")
+        await ws.send_bytes(orjson.dumps({
+            "type": "error",
+            "session_id": sid,
+            "message": f"Unknown session: {sid}" if sid else "Missing session_id",
+        }))
 
     logger.info(f"WebSocket connected: {ws.client}")
 
+    async def on_snapshot(sid: str, snapshot):
+        emitter = emitters.get(sid)
+        if emitter:
+            emitter.push(snapshot)
+
+    async def on_flow(sid: str, paused: bool):
+        await ws.send_bytes(orjson.dumps({
+            "type": "flow_control",
+            "session_id": sid,
+            "lane": "audio",
+            "action": "pause" if paused else "resume",
+        }))
+
     try:
         while True:
-            raw = await ws.receive_bytes()
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            received_at = time.time()
+            raw = message.get("bytes")
+
+            if raw is not None and is_binary_frame(raw):
+                # ── Binary framed media (zero-copy payload) ──────────────
+                try:
+                    frame = decode_frame(raw)
+                except ProtocolError as e:
+                    await ws.send_bytes(orjson.dumps({"type": "error", "message": str(e)}))
+                    continue
+                sid = route(frame.session_id)
+                ingest = sessions.get(sid) if sid else None
+                if not ingest:
+                    await reject(sid, frame.type_name)
+                    continue
+                if frame.msg_type == MSG_VIDEO_FRAME:
+                    ingest.offer_video(frame.payload, received_at, seq=frame.seq)
+                else:
+                    await ingest.offer_audio(frame.payload, received_at)
+                continue
+
+            if raw is not None and raw[:1] != b"{":
+                # Legacy raw binary — bare JPEG for the default session
+                sid = route(None)
+                ingest = sessions.get(sid) if sid else None
+                if ingest:
+                    ingest.offer_video(raw, received_at)
+                else:
+                    await reject(sid, "raw frame")
+                continue
 
-            # Try to parse as JSON first (text messages)
             try:
-                msg = orjson.loads(raw)
-            except (orjson.JSONDecodeError, Exception):
-                # Binary data — treat as video frame if session active
-                if session_id:
-                    snapshot = orchestrator.process_video_frame(session_id, raw)
-                    if snapshot:
-                        await _emit_metrics(ws, snapshot, session_id, store)
+                msg = orjson.loads(raw if raw is not None else message.get("text", ""))
+            except orjson.JSONDecodeError:
+                await ws.send_bytes(orjson.dumps({"type": "error", "message": "Malformed JSON message"}))
                 continue
 
             msg_type = msg.get("type", "")
+            sid = route(msg.get("session_id"))
+            ingest = sessions.get(sid) if sid else None
 
             # ── Start session ────────────────────────────────────────────
             if msg_type == "start":
-                session_id = msg.get("session_id", str(uuid.uuid4()))
+                sid = msg.get("session_id") or str(uuid.uuid4())
                 user_id = msg.get("user_id", "anonymous")
                 gto_id = msg.get("gto_session_id")
-
-                orchestrator.create_session(session_id, user_id, gto_id)
-                logger.info(f"Session started: {session_id} (user: {user_id}, gto: {gto_id})")
+                if sid in sessions:
+                    sessions.pop(sid)
+                    await _finish_session(sid)
+                multiplexed = multiplexed or bool(sessions)
+
+                try:
+                    emitter = OutboundEmitter(
+                        sid, ws.send_bytes, store,
+                        interval_ms=msg.get("emit_interval_ms"),
+                        envelope=bool(msg.get("envelope", False)),
+                        heatmap_format=msg.get("heatmap_format"),
+                    )
+                    analysis_width = int(msg["analysis_width"]) if msg.get("analysis_width") else None
+                except (TypeError, ValueError) as e:
+                    await ws.send_bytes(orjson.dumps({"type": "error", "session_id": sid, "message": str(e)}))
+                    continue
+                await executor.open_session(sid, user_id, gto_id, analysis_width=analysis_width)
+                emitter.start()
+                emitters[sid] = emitter
+                ingest = SessionIngest(sid, executor, on_snapshot, on_flow)
+                ingest.start()
+                sessions[sid] = ingest
+                ingests[sid] = ingest
+                default_sid = sid
+                rejected.discard(sid)
+                logger.info(f"Session started: {sid} (user: {user_id}, gto: {gto_id})")
 
                 await ws.send_bytes(orjson.dumps({
                     "type": "session_started",
-                    "session_id": session_id,
+                    "session_id": sid,
+                    "emit_interval_ms": emitter.interval_ms,
+                    "heatmap_format": emitter.stats()["heatmap_format"],
                     "message": "Behavior analysis active",
                 }))
 
             # ── Video frame ──────────────────────────────────────────────
-            elif msg_type == "video_frame" and session_id:
-                frame_data = base64.b64decode(msg["data"])
-                snapshot = orchestrator.process_video_frame(session_id, frame_data)
-                if snapshot:
-                    await _emit_metrics(ws, snapshot, session_id, store)
+            elif msg_type == "video_frame" and ingest:
+                ingest.offer_video(base64.b64decode(msg["data"]), received_at)
 
             # ── Audio chunk ──────────────────────────────────────────────
-            elif msg_type == "audio_chunk" and session_id:
-                audio_data = base64.b64decode(msg["data"])
-                snapshot = orchestrator.process_audio_chunk(session_id, audio_data)
-                if snapshot:
-                    await _emit_metrics(ws, snapshot, session_id, store)
+            elif msg_type == "audio_chunk" and ingest:
+                await ingest.offer_audio(base64.b64decode(msg["data"]), received_at)
 
             # ── Combined (video + audio) ─────────────────────────────────
-            elif msg_type == "combined" and session_id:
+            elif msg_type == "combined" and ingest:
                 video = base64.b64decode(msg["video"]) if msg.get("video") else None
                 audio = base64.b64decode(msg["audio"]) if msg.get("audio") else None
-                snapshot = orchestrator.process_combined(session_id, video, audio)
-                if snapshot:
-                    await _emit_metrics(ws, snapshot, session_id, store)
+                if audio:
+                    await ingest.offer_audio(audio, received_at, video=video)
+                elif video:
+                    ingest.offer_video(video, received_at)
 
             # ── Stop session ─────────────────────────────────────────────
-            elif msg_type == "stop" and session_id:
-                summary = orchestrator.get_session_summary(session_id)
-                state = orchestrator.end_session(session_id)
+            elif msg_type == "stop" and ingest:
+                sessions.pop(sid, None)
+                if default_sid == sid:
+                    default_sid = next(reversed(sessions), None)
+                summary = await _finish_session(sid)
 
                 if summary:
-                    await store.store_session_summary(session_id, summary)
                     await ws.send_bytes(orjson.dumps({
                         "type": "session_summary",
+                        "session_id": sid,
                         "data": summary,
                     }))
 
-                logger.info(f"Session ended: {session_id}")
-                session_id = None
+                logger.info(f"Session ended: {sid}")
 
             # ── Unknown ──────────────────────────────────────────────────
             else:
                 await ws.send_bytes(orjson.dumps({
                     "type": "error",
-                    "message": f"Unknown message type: {msg_type}",
+                    "session_id": sid,
+                    "message": f"Unknown message type or session: {msg_type}",
                 }))
 
     except WebSocketDisconnect:
-        logger.info(f"WebSocket disconnected: {ws.client}")
-        if session_id:
-            summary = orchestrator.get_session_summary(session_id)
-            if summary:
-                await store.store_session_summary(session_id, summary)
-            orchestrator.end_session(session_id)
+        logger.info(f"WebSocket disconnected: {ws.client} ({len(sessions)} open session(s))")
+        for sid in list(sessions):
+            await _finish_session(sid, flush=False)
 
     except Exception as e:
         logger.error(f"WebSocket error: {e}", exc_info=True)
-        if session_id:
-            orchestrator.end_session(session_id)
+        for sid in list(sessions):
+            await _finish_session(sid, persist=False, flush=False)
         try:
             await ws.send_bytes(orjson.dumps({"type": "error", "message": str(e)}))
         except Exception:
@@ -251,69 +366,21 @@ async def websocket_analyze(ws: WebSocket):
 
 # ── Helpers ──────────────────────────────────────────────────────────────────────
 
-async def _emit_metrics(ws: WebSocket, snapshot, session_id: str, store: EncryptedMetricsStore):
-    """Serialize and emit behavior snapshot to the WebSocket client."""
-    confidence = snapshot.confidence
-
-    # Main metrics payload
-    metrics = {
-        "type": "metrics",
-        "data": {
-            "timestamp": confidence.timestamp,
-            "confidence": {
-                "visual": confidence.visual_confidence,
-                "vocal": confidence.vocal_confidence,
-                "gestural": confidence.gestural_confidence,
-                "emotional": confidence.emotional_confidence,
-                "overall": confidence.overall_confidence,
-            },
-            "stress": {
-                "index": confidence.stress_index,
-                "trend": confidence.stress_trend,
-                "components": confidence.stress_components,
-            },
-            "face": snapshot.face_metrics,
-            "hands": snapshot.hand_metrics,
-            "audio": snapshot.audio_metrics,
-        },
-    }
-    await ws.send_bytes(orjson.dumps(metrics))
-
-    # Heatmap (sent separately to allow frontend to throttle rendering)
-    if snapshot.heatmap:
-        heatmap_msg = {
-            "type": "heatmap",
-            "data": {
-                "grid": snapshot.heatmap.grid,
-                "resolution": snapshot.heatmap.resolution,
-                "peak_zones": snapshot.heatmap.peak_zones,
-                "overall_stress": snapshot.heatmap.overall_stress_level,
-                "dominant_indicator": snapshot.heatmap.dominant_indicator,
-            },
-        }
-        await ws.send_bytes(orjson.dumps(heatmap_msg))
-
-    # Alerts
-    for alert in snapshot.alerts:
-        alert_msg = {
-            "type": "alert",
-            "data": {
-                "alert_type": alert.alert_type,
-                "severity": alert.severity,
-                "indicator": alert.indicator,
-                "value": alert.value,
-                "threshold": alert.threshold,
-                "description": alert.description,
-                "recommendation": alert.recommendation,
-            },
-        }
-        await ws.send_bytes(orjson.dumps(alert_msg))
-
-    # Store encrypted (async, non-blocking)
-    try:
-        await store.store_snapshot(session_id, metrics["data"], confidence.timestamp)
-    except Exception:
-        pass  # Don't fail analysis if storage fails
+async def _finish_session(session_id: str, persist: bool = True, flush: bool = True) -> Optional[dict]:
+    """Stop a session's ingest lanes and emitter, end it on its lane and store the summary."""
+    ingest = ingests.pop(session_id, None)
+    if ingest:
+        await ingest.close()
+    emitter = emitters.pop(session_id, None)
+    if emitter:
+        try:
+            await emitter.close(flush=flush)
+        except Exception as e:
+            logger.debug(f"Final flush failed for {session_id}: {e}")
+    summary = await executor.close_session(session_id)
+    if summary and persist:
+        await store.store_session_summary(session_id, summary)
+    return summary
 
 
 # ── Entry point ──────────────────────────────────────────────────────────────────
@@ -0,0 +1,7 @@
+"""Analysis Pipeline Package — event-loop side plumbing around the orchestrator."""
+from .executor import AnalysisExecutor
+from .ingest import SessionIngest
+from .emitter import OutboundEmitter
+from .heatmap_codec import HeatmapEncoder
+
+__all__ = ["AnalysisExecutor", "SessionIngest", "OutboundEmitter", "HeatmapEncoder"]
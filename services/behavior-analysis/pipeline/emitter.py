@@ -0,0 +1,209 @@
+"""
+Outbound Emitter — Rate-limited, coalesced metrics stream per session.
+
+Analysis can produce a snapshot per processed frame, but clients only
+need an update every METRICS_EMIT_INTERVAL_MS. The emitter keeps the
+latest snapshot, the latest heatmap and every alert raised since the last
+send, and flushes them at most once per interval:
+
+  - envelope mode:  one { "type": "update", data: { metrics, heatmap, alerts } }
+  - legacy mode:    the old "metrics" / "heatmap" / "alert" messages, but
+                    still coalesced to one batch per interval
+
+The first snapshot is sent immediately; alerts are never dropped. The
+client's interval is honoured down to MIN_EMIT_INTERVAL_MS; a flush whose
+metrics are the ones already sent (only the timestamp moved) and that
+carries no new heatmap or alert is skipped, so a short interval never
+repeats unchanged data.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+import orjson
+
+from config import settings
+from .heatmap_codec import HeatmapEncoder
+
+logger = logging.getLogger("behavior-analysis.emitter")
+
+SendCallback = Callable[[bytes], Awaitable[None]]
+
+MIN_EMIT_INTERVAL_MS = 50
+MAX_EMIT_INTERVAL_MS = 5000
+
+# Analyzer metrics may hold numpy scalars (e.g. a dB level from np.log10)
+DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+# ── Serialization ────────────────────────────────────────────────────────────────
+
+def snapshot_metrics(snapshot) -> dict:
+    """Metrics payload for one BehaviorSnapshot."""
+    confidence = snapshot.confidence
+    return {
+        "timestamp": confidence.timestamp,
+        "confidence": {
+            "visual": confidence.visual_confidence,
+            "vocal": confidence.vocal_confidence,
+            "gestural": confidence.gestural_confidence,
+            "emotional": confidence.emotional_confidence,
+            "overall": confidence.overall_confidence,
+        },
+        "stress": {
+            "index": confidence.stress_index,
+            "trend": confidence.stress_trend,
+            "components": confidence.stress_components,
+        },
+        "face": snapshot.face_metrics,
+        "hands": snapshot.hand_metrics,
+        "audio": snapshot.audio_metrics,
+        "posture": snapshot.posture_metrics,
+    }
+
+
+def alert_payload(alert) -> dict:
+    return {
+        "alert_type": alert.alert_type,
+        "severity": alert.severity,
+        "indicator": alert.indicator,
+        "value": alert.value,
+        "threshold": alert.threshold,
+        "description": alert.description,
+        "recommendation": alert.recommendation,
+    }
+
+
+# ── Emitter ──────────────────────────────────────────────────────────────────────
+
+class OutboundEmitter:
+    """Coalesces one session's snapshots into at most one send per interval."""
+
+    def __init__(self, session_id: str, send: SendCallback, store=None,
+                 interval_ms: Optional[int] = None, envelope: bool = False,
+                 heatmap_format: Optional[str] = None):
+        self.session_id = session_id
+        self._send = send
+        self._store = store
+        self.interval_ms = self.clamp_interval(interval_ms)
+        self.envelope = envelope
+        self._heatmap_encoder = HeatmapEncoder(heatmap_format)
+
+        self._latest = None                 # latest BehaviorSnapshot
+        self._heatmap = None                # latest HeatmapFrame since last send
+        self._sent_heatmap = None           # last HeatmapFrame actually sent
+        self._alerts: List = []             # all alerts since last send
+        self._sent_state: Optional[bytes] = None    # last sent metrics, timestamp excluded
+        self._dirty = asyncio.Event()
+        self._last_sent: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.snapshots_in: int = 0
+        self.messages_out: int = 0
+        self.unchanged_skipped: int = 0
+
+    @staticmethod
+    def clamp_interval(interval_ms: Optional[int]) -> int:
+        if not interval_ms:
+            return settings.METRICS_EMIT_INTERVAL_MS
+        return int(min(MAX_EMIT_INTERVAL_MS, max(MIN_EMIT_INTERVAL_MS, interval_ms)))
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────────
+
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name=f"emitter-{self.session_id}")
+
+    async def close(self, flush: bool = True):
+        """Stop the flush loop; optionally send whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if flush and self._latest is not None:
+            await self._flush()
+
+    # ── Producer ─────────────────────────────────────────────────────────────────
+
+    def push(self, snapshot):
+        """Record a new snapshot; it will go out with the next flush."""
+        self.snapshots_in += 1
+        self._latest = snapshot
+        # The heatmap is regenerated at its own cadence; don't resend an unchanged frame
+        if snapshot.heatmap is not None and snapshot.heatmap is not self._sent_heatmap:
+            self._heatmap = snapshot.heatmap
+        if snapshot.alerts:
+            self._alerts.extend(snapshot.alerts)
+        self._dirty.set()
+
+    # ── Flush loop ───────────────────────────────────────────────────────────────
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._dirty.wait()
+            wait = self._last_sent + self.interval_ms / 1000 - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_sent = loop.time()
+            try:
+                await self._flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{self.session_id}] emit failed: {e}")
+
+    async def _flush(self):
+        self._dirty.clear()
+        snapshot, heatmap, alerts = self._latest, self._heatmap, self._alerts
+        self._latest, self._heatmap, self._alerts = None, None, []
+        if snapshot is None:
+            return
+
+        metrics = snapshot_metrics(snapshot)
+        state = orjson.dumps({k: v for k, v in metrics.items() if k != "timestamp"}, option=DUMPS_OPTIONS)
+        if state == self._sent_state and heatmap is None and not alerts:
+            self.unchanged_skipped += 1
+            return
+        self._sent_state = state
+        if heatmap is not None:
+            self._sent_heatmap = heatmap
+
+        if self.envelope:
+            await self._send(orjson.dumps({
+                "type": "update",
+                "session_id": self.session_id,
+                "data": {
+                    "metrics": metrics,
+                    "heatmap": self._heatmap_encoder.encode(heatmap) if heatmap is not None else None,
+                    "alerts": [alert_payload(a) for a in alerts],
+                },
+            }, option=DUMPS_OPTIONS))
+            self.messages_out += 1
+        else:
+            messages = [{"type": "metrics", "data": metrics}]
+            if heatmap is not None:
+                messages.append({"type": "heatmap", "data": self._heatmap_encoder.encode(heatmap)})
+            messages.extend({"type": "alert", "data": alert_payload(a)} for a in alerts)
+            for msg in messages:
+                msg["session_id"] = self.session_id
+                await self._send(orjson.dumps(msg, option=DUMPS_OPTIONS))
+            self.messages_out += len(messages)
+
+        # Store encrypted (one record per emitted update)
+        if self._store:
+            try:
+                await self._store.store_snapshot(self.session_id, metrics, metrics["timestamp"])
+            except Exception:
+                pass  # Don't fail analysis if storage fails
+
+    def stats(self) -> dict:
+        return {
+            "emit_interval_ms": self.interval_ms,
+            "envelope": self.envelope,
+            "heatmap_format": self._heatmap_encoder.format,
+            "snapshots_in": self.snapshots_in,
+            "messages_out": self.messages_out,
+            "unchanged_skipped": self.unchanged_skipped,
+        }
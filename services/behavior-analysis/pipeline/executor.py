@@ -0,0 +1,250 @@
+"""
+Analysis Executor — Runs the blocking analyzer pipeline off the event loop.
+
+MediaPipe inference, JPEG decoding and pitch tracking are CPU-bound and
+would otherwise stall every WebSocket on the single asyncio loop. The
+executor owns N single-worker lanes (threads or processes):
+
+  - Each session is pinned to one lane for its whole lifetime, so its
+    analyzer state is only ever touched by one worker (no locking needed).
+  - New sessions go to the lane with the fewest sessions.
+  - WebSocket coroutines only `await` results.
+
+In 'process' mode every lane runs its own SessionOrchestrator inside the
+worker process; in 'thread' mode all lanes share the in-process one.
+
+Exposes per-lane queue depth, wait time and run time via `stats()`.
+`warm_up()` builds the shared MediaPipe graphs on every orchestrator
+before the service reports ready.
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger("behavior-analysis.executor")
+
+# Worker-process orchestrator (process mode only)
+_worker_orchestrator = None
+
+
+def _init_worker():
+    """Process-lane initializer: build a private orchestrator."""
+    global _worker_orchestrator
+    from session_orchestrator import SessionOrchestrator
+    _worker_orchestrator = SessionOrchestrator()
+
+
+def _invoke(orchestrator, method: str, args: tuple, kwargs: dict, submitted_at: float, keep_result: bool):
+    """Run one orchestrator call and report (result, wait_s, run_s)."""
+    started = time.time()
+    target = orchestrator if orchestrator is not None else _worker_orchestrator
+    result = getattr(target, method)(*args, **kwargs)
+    return (result if keep_result else None), started - submitted_at, time.time() - started
+
+
+class _Lane:
+    """One single-worker lane plus its load statistics."""
+
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, index: int, pool: Executor):
+        self.index = index
+        self.pool = pool
+        self.sessions: int = 0
+        self.pending: int = 0
+        self.completed: int = 0
+        self.failed: int = 0
+        self.wait_ms_avg: float = 0.0
+        self.wait_ms_max: float = 0.0
+        self.run_ms_avg: float = 0.0
+
+    def record(self, wait_s: float, run_s: float):
+        wait_ms = wait_s * 1000
+        run_ms = run_s * 1000
+        self.completed += 1
+        if self.completed == 1:
+            self.wait_ms_avg, self.run_ms_avg = wait_ms, run_ms
+        else:
+            self.wait_ms_avg += self.EWMA_ALPHA * (wait_ms - self.wait_ms_avg)
+            self.run_ms_avg += self.EWMA_ALPHA * (run_ms - self.run_ms_avg)
+        self.wait_ms_max = max(self.wait_ms_max, wait_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            'lane': self.index,
+            'sessions': self.sessions,
+            'queue_depth': self.pending,
+            'completed': self.completed,
+            'failed': self.failed,
+            'wait_ms_avg': round(self.wait_ms_avg, 2),
+            'wait_ms_max': round(self.wait_ms_max, 2),
+            'run_ms_avg': round(self.run_ms_avg, 2),
+        }
+
+
+class AnalysisExecutor:
+    """Session-affine worker pool for SessionOrchestrator calls."""
+
+    MODES = ('thread', 'process')
+    STATS_TIMEOUT_S = 1.0    # a busy worker's model stats fall back to its last answer
+
+    def __init__(self, orchestrator, mode: Optional[str] = None, workers: Optional[int] = None):
+        self.mode = (mode or settings.ANALYSIS_EXECUTOR).lower()
+        if self.mode not in self.MODES:
+            raise ValueError(f"Unknown analysis executor mode: {self.mode}")
+        self.workers = max(1, workers or settings.ANALYSIS_WORKERS)
+        # Shared orchestrator in thread mode; None → worker-local in process mode
+        self._orchestrator = orchestrator if self.mode == 'thread' else None
+        self._lanes: List[_Lane] = []
+        self._assignments: Dict[str, _Lane] = {}
+        self.models_ready: bool = False
+        self._model_stats: list = []        # last per-process model stats (process mode)
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────────
+
+    def start(self):
+        """Spin up the lanes."""
+        for i in range(self.workers):
+            if self.mode == 'process':
+                pool = ProcessPoolExecutor(max_workers=1, initializer=_init_worker)
+            else:
+                pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"analysis-{i}")
+            self._lanes.append(_Lane(i, pool))
+        logger.info(f"Analysis executor started: {self.workers} {self.mode} lane(s)")
+
+    async def warm_up(self):
+        """Warm the model pools: once for the shared orchestrator, or on every worker process."""
+        started = time.time()
+        lanes = self._lanes if self.mode == 'process' else self._lanes[:1]
+        self._model_stats = await asyncio.gather(*(self._submit(lane, 'warm_models', (), {}) for lane in lanes))
+        self.models_ready = True
+        logger.info(f"Models warm in {time.time() - started:.1f}s")
+
+    async def model_stats(self):
+        """Live pool stats: the shared orchestrator's (thread mode) or every worker process's.
+
+        Process lanes are queried through their queues like any other call; a
+        lane that does not answer within STATS_TIMEOUT_S reports its last stats.
+        """
+        if self._orchestrator is not None:
+            return self._orchestrator.model_stats()
+        if not self.models_ready:
+            return self._model_stats
+        fresh = await asyncio.gather(
+            *(asyncio.wait_for(self._submit(lane, 'model_stats', (), {}), self.STATS_TIMEOUT_S) for lane in self._lanes),
+            return_exceptions=True,
+        )
+        self._model_stats = [last if isinstance(stats, BaseException) else stats
+                             for stats, last in zip(fresh, self._model_stats)]
+        return self._model_stats
+
+    def shutdown(self):
+        for lane in self._lanes:
+            lane.pool.shutdown(wait=False, cancel_futures=True)
+        self._lanes.clear()
+        self._assignments.clear()
+
+    # ── Session affinity ─────────────────────────────────────────────────────────
+
+    def _lane_for(self, session_id: str) -> _Lane:
+        lane = self._assignments.get(session_id)
+        if lane is None:
+            # Unassigned (e.g. stray message) — stable hash so it never migrates
+            lane = self._lanes[zlib.crc32(session_id.encode()) % len(self._lanes)]
+        return lane
+
+    def _assign(self, session_id: str) -> _Lane:
+        lane = self._assignments.get(session_id)
+        if lane is None:
+            lane = min(self._lanes, key=lambda l: (l.sessions, l.pending))
+            lane.sessions += 1
+            self._assignments[session_id] = lane
+        return lane
+
+    def _release(self, session_id: str):
+        lane = self._assignments.pop(session_id, None)
+        if lane is not None:
+            lane.sessions -= 1
+
+    # ── Calls ────────────────────────────────────────────────────────────────────
+
+    async def _submit(self, lane: _Lane, method: str, args: tuple, kwargs: dict, keep_result: bool = True) -> Any:
+        loop = asyncio.get_running_loop()
+        if self.mode == 'process':
+            # Zero-copy payload views can't cross the process boundary
+            args = tuple(bytes(a) if isinstance(a, memoryview) else a for a in args)
+        lane.pending += 1
+        try:
+            result, wait_s, run_s = await loop.run_in_executor(
+                lane.pool, _invoke, self._orchestrator, method, args, kwargs, time.time(), keep_result,
+            )
+        except Exception:
+            lane.failed += 1
+            raise
+        finally:
+            lane.pending -= 1
+        lane.record(wait_s, run_s)
+        return result
+
+    async def run(self, session_id: str, method: str, *args, **kwargs) -> Any:
+        """Run `orchestrator.<method>(*args)` on the session's lane."""
+        return await self._submit(self._lane_for(session_id), method, args, kwargs)
+
+    async def open_session(self, session_id: str, user_id: str, gto_session_id: Optional[str] = None,
+                           **options):
+        """Pin a new session to the least-loaded lane and create it there."""
+        lane = self._assign(session_id)
+        await self._submit(lane, 'create_session', (session_id, user_id, gto_session_id), options, keep_result=False)
+
+    async def close_session(self, session_id: str) -> Optional[dict]:
+        """Finish the session on its lane; returns the final summary (if any)."""
+        if session_id not in self._assignments:
+            return None
+        try:
+            return await self.run(session_id, 'finish_session', session_id)
+        finally:
+            self._release(session_id)
+
+    async def gather(self, method: str, *args) -> list:
+        """Call a list-returning orchestrator method on every lane and concatenate.
+
+        Runs on the lanes, never on the event loop, so no session is read while
+        its analysis is mid-update. In thread mode the lanes share one
+        orchestrator and each call covers only the lane's own sessions (the
+        method takes `session_ids`).
+        """
+        if self.mode == 'thread':
+            pinned: Dict[int, list] = {}
+            for session_id, lane in self._assignments.items():
+                pinned.setdefault(lane.index, []).append(session_id)
+            calls = [self._submit(lane, method, args, {'session_ids': pinned[lane.index]})
+                     for lane in self._lanes if lane.index in pinned]
+        else:
+            calls = [self._submit(lane, method, args, {}) for lane in self._lanes]
+        results = await asyncio.gather(*calls)
+        return [item for chunk in results for item in chunk]
+
+    def has_session(self, session_id: str) -> bool:
+        return session_id in self._assignments
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    @property
+    def session_count(self) -> int:
+        return len(self._assignments)
+
+    def stats(self) -> dict:
+        lanes = [lane.to_dict() for lane in self._lanes]
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'queue_depth': sum(l['queue_depth'] for l in lanes),
+            'wait_ms_max': max((l['wait_ms_max'] for l in lanes), default=0.0),
+            'lanes': lanes,
+        }
@@ -0,0 +1,123 @@
+"""
+Heatmap Codec — Negotiable wire formats for the stress heatmap.
+
+The legacy format is a nested JSON list (48×64 boxed ints, ~10 KB of
+text per frame). Clients can pick a compact format at `start` via
+"heatmap_format":
+
+  list         legacy nested list (default)
+  raw          uint8 row-major bytes, base64
+  delta-rle    keyframe / delta vs last keyframe, run-length coded, base64
+  delta-zlib   keyframe / delta vs last keyframe, zlib, base64
+  png | webp   server-side colormapped image (cv2.applyColorMap), base64
+
+Deltas are `(frame - keyframe) mod 256` as uint8, so the client restores a
+frame with `(keyframe + delta) mod 256`. A keyframe is sent first, every
+`keyframe_interval` encoded frames, and whenever the resolution changes.
+RLE output is (run_length, value) byte pairs with runs of at most 255.
+"""
+
+import base64
+import zlib
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from config import settings
+
+FORMATS = ('list', 'raw', 'delta-rle', 'delta-zlib', 'png', 'webp')
+
+
+# ── Run-length coding ────────────────────────────────────────────────────────────
+
+def rle_encode(buf: np.ndarray) -> bytes:
+    """Run-length encode a uint8 array into (run, value) byte pairs."""
+    flat = np.ascontiguousarray(buf, dtype=np.uint8).ravel()
+    if flat.size == 0:
+        return b""
+    starts = np.flatnonzero(np.r_[True, flat[1:] != flat[:-1]])
+    lengths = np.diff(np.r_[starts, flat.size])
+    values = flat[starts]
+
+    # Split runs longer than 255 into 255-sized pieces + remainder
+    pieces = (lengths + 254) // 255
+    values = np.repeat(values, pieces)
+    runs = np.full(values.size, 255, dtype=np.uint8)
+    runs[np.cumsum(pieces) - 1] = lengths - (pieces - 1) * 255
+
+    out = np.empty(values.size * 2, dtype=np.uint8)
+    out[0::2] = runs
+    out[1::2] = values
+    return out.tobytes()
+
+
+def rle_decode(data: bytes) -> np.ndarray:
+    pairs = np.frombuffer(data, dtype=np.uint8).reshape(-1, 2)
+    return np.repeat(pairs[:, 1], pairs[:, 0].astype(np.intp))
+
+
+def apply_delta(keyframe: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """Client-side reconstruction: (keyframe + delta) mod 256."""
+    return (keyframe.astype(np.uint8) + delta.astype(np.uint8)).astype(np.uint8)
+
+
+# ── Encoder ──────────────────────────────────────────────────────────────────────
+
+class HeatmapEncoder:
+    """Per-session encoder; remembers the last keyframe for delta formats."""
+
+    def __init__(self, fmt: Optional[str] = None, keyframe_interval: Optional[int] = None):
+        fmt = (fmt or settings.HEATMAP_FORMAT).lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown heatmap format: {fmt} (expected one of {', '.join(FORMATS)})")
+        self.format = fmt
+        self.keyframe_interval = max(1, keyframe_interval or settings.HEATMAP_KEYFRAME_INTERVAL)
+        self._keyframe: Optional[np.ndarray] = None
+        self._since_key: int = 0
+
+    def reset(self):
+        """Force the next delta frame to be a keyframe (e.g. after a reconnect)."""
+        self._keyframe = None
+
+    def encode(self, heatmap) -> dict:
+        """Wire payload for one HeatmapFrame."""
+        payload = {
+            "resolution": heatmap.resolution,
+            "peak_zones": heatmap.peak_zones,
+            "overall_stress": heatmap.overall_stress_level,
+            "dominant_indicator": heatmap.dominant_indicator,
+        }
+        if self.format == 'list':
+            payload["grid"] = heatmap.grid
+            return payload
+
+        payload["encoding"] = self.format
+        pixels = heatmap.pixels
+
+        if self.format == 'raw':
+            data = pixels.tobytes()
+        elif self.format in ('png', 'webp'):
+            colored = cv2.applyColorMap(pixels, cv2.COLORMAP_JET)
+            ok, buf = cv2.imencode(f'.{self.format}', colored)
+            if not ok:
+                raise RuntimeError(f"cv2.imencode failed for {self.format}")
+            data = buf.tobytes()
+        else:
+            is_key = (
+                self._keyframe is None
+                or self._keyframe.shape != pixels.shape
+                or self._since_key >= self.keyframe_interval
+            )
+            if is_key:
+                self._keyframe = pixels.copy()
+                self._since_key = 0
+                body = pixels
+            else:
+                body = (pixels.astype(np.int16) - self._keyframe).astype(np.uint8)
+            self._since_key += 1
+            payload["keyframe"] = is_key
+            data = rle_encode(body) if self.format == 'delta-rle' else zlib.compress(body.tobytes(), 6)
+
+        payload["data"] = base64.b64encode(data).decode("ascii")
+        return payload
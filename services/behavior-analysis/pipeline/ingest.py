@@ -0,0 +1,209 @@
+"""
+Session Ingest — Per-session input stage in front of the orchestrator.
+
+Two independent lanes per session, each drained by its own task:
+
+  - Video: single-slot "latest wins" mailbox. If analysis falls behind
+    the camera, stale frames are overwritten (and counted) instead of
+    queueing, so metrics always describe what the candidate is doing now.
+  - Audio: flow-controlled FIFO lane. Crossing the high watermark
+    signals the client to pause this session's audio (flow control is
+    per session, so one slow candidate never stalls a shared connection);
+    a resume is signalled once the lane drains below the low watermark.
+    A client that ignores the pause and hits the hard cap loses its
+    oldest queued chunk per new one (counted): the lane never blocks
+    the connection's shared receive loop. With AUDIO_STREAMING,
+    audio-only chunks already queued behind the one being taken are
+    joined into a single executor call, so 20 ms frames do not each pay
+    for a round trip.
+
+Because the lanes are drained separately, a slow 1 Hz audio chunk never
+blocks video and a busy video stream never starves audio.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from config import settings
+from .protocol import seq_newer
+
+logger = logging.getLogger("behavior-analysis.ingest")
+
+SnapshotCallback = Callable[[str, object], Awaitable[None]]
+FlowCallback = Callable[[str, bool], Awaitable[None]]      # (session_id, paused)
+
+
+class SessionIngest:
+    """Latest-wins video mailbox + flow-controlled audio lane for one session."""
+
+    EWMA_ALPHA = 0.1
+
+    def __init__(self, session_id: str, executor, on_snapshot: SnapshotCallback,
+                 on_flow: Optional[FlowCallback] = None, audio_lane_size: Optional[int] = None):
+        self.session_id = session_id
+        self._executor = executor
+        self._on_snapshot = on_snapshot
+        self._on_flow = on_flow
+
+        self._video_slot: Optional[tuple] = None   # (payload, received_at)
+        self._video_ready = asyncio.Event()
+        self._audio_high = audio_lane_size or settings.AUDIO_LANE_SIZE
+        self._audio_low = max(1, self._audio_high // 2)
+        self._audio_lane: asyncio.Queue = asyncio.Queue(maxsize=self._audio_high * 4)
+        self._audio_paused = False
+        self._audio_held: Optional[tuple] = None   # combined item taken while coalescing
+        self._last_video_seq: Optional[int] = None
+        self._tasks: list = []
+
+        # Stats
+        self.frames_received: int = 0
+        self.frames_dropped: int = 0
+        self.frames_processed: int = 0
+        self.audio_received: int = 0
+        self.audio_processed: int = 0
+        self.audio_dropped: int = 0
+        self.video_lag_ms: float = 0.0
+        self.audio_lag_ms: float = 0.0
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────────
+
+    def start(self):
+        self._tasks = [
+            asyncio.create_task(self._video_loop(), name=f"ingest-video-{self.session_id}"),
+            asyncio.create_task(self._audio_loop(), name=f"ingest-audio-{self.session_id}"),
+        ]
+
+    async def close(self):
+        """Stop both lanes; pending input is discarded."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ── Producers (called from the receive loop) ─────────────────────────────────
+
+    def offer_video(self, frame: bytes, received_at: Optional[float] = None, seq: Optional[int] = None):
+        """Replace whatever frame is waiting; the replaced one is dropped."""
+        self.frames_received += 1
+        if seq is not None:
+            # Out-of-order binary frame: older than one we already accepted
+            if self._last_video_seq is not None and not seq_newer(seq, self._last_video_seq):
+                self.frames_dropped += 1
+                return
+            self._last_video_seq = seq
+        if self._video_slot is not None:
+            self.frames_dropped += 1
+        self._video_slot = (frame, received_at or time.time())
+        self._video_ready.set()
+
+    async def offer_audio(self, audio: bytes, received_at: Optional[float] = None, video: Optional[bytes] = None):
+        """Enqueue an audio chunk (optionally with its paired video frame); never blocks.
+
+        At the hard cap the oldest queued chunk makes room for this one.
+        """
+        self.audio_received += 1
+        if self._audio_lane.full():
+            self._audio_lane.get_nowait()
+            self.audio_dropped += 1
+            if self.audio_dropped == 1 or self.audio_dropped % 100 == 0:
+                logger.warning(f"[{self.session_id}] audio lane full, {self.audio_dropped} chunk(s) dropped")
+        self._audio_lane.put_nowait((audio, video, received_at or time.time()))
+        if not self._audio_paused and self._audio_lane.qsize() >= self._audio_high:
+            await self._signal_flow(True)
+
+    # ── Lanes ────────────────────────────────────────────────────────────────────
+
+    async def _video_loop(self):
+        while True:
+            await self._video_ready.wait()
+            self._video_ready.clear()
+            item, self._video_slot = self._video_slot, None
+            if item is None:
+                continue
+            frame, received_at = item
+            try:
+                snapshot = await self._executor.run(
+                    self.session_id, "process_video_frame", self.session_id, frame, received_at=received_at,
+                )
+                self.frames_processed += 1
+                self.video_lag_ms = self._ewma(self.video_lag_ms, received_at, self.frames_processed)
+                if snapshot:
+                    await self._on_snapshot(self.session_id, snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{self.session_id}] video frame failed: {e}")
+
+    async def _audio_loop(self):
+        while True:
+            if self._audio_held is not None:
+                (audio, video, received_at), self._audio_held = self._audio_held, None
+            else:
+                audio, video, received_at = await self._audio_lane.get()
+            chunks = 1
+            if video is None and settings.AUDIO_STREAMING:
+                audio, chunks = self._coalesce_audio(audio)
+            if self._audio_paused and self._audio_lane.qsize() <= self._audio_low:
+                await self._signal_flow(False)
+            try:
+                if video is not None:
+                    snapshot = await self._executor.run(
+                        self.session_id, "process_combined", self.session_id, video, audio,
+                        received_at=received_at,
+                    )
+                else:
+                    snapshot = await self._executor.run(
+                        self.session_id, "process_audio_chunk", self.session_id, audio,
+                        received_at=received_at, chunks=chunks,
+                    )
+                self.audio_processed += chunks
+                self.audio_lag_ms = self._ewma(self.audio_lag_ms, received_at, self.audio_processed)
+                if snapshot:
+                    await self._on_snapshot(self.session_id, snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{self.session_id}] audio chunk failed: {e}")
+
+    def _coalesce_audio(self, audio: bytes) -> tuple:
+        """Join the audio-only chunks queued right behind `audio` (PCM16 concatenates)."""
+        parts = [audio]
+        while not self._audio_lane.empty():
+            item = self._audio_lane.get_nowait()
+            if item[1] is not None:
+                self._audio_held = item     # combined chunk: keeps its place, runs next
+                break
+            parts.append(item[0])
+        return (b''.join(parts) if len(parts) > 1 else audio), len(parts)
+
+    async def _signal_flow(self, paused: bool):
+        self._audio_paused = paused
+        if self._on_flow:
+            try:
+                await self._on_flow(self.session_id, paused)
+            except Exception as e:
+                logger.debug(f"[{self.session_id}] flow signal failed: {e}")
+
+    def _ewma(self, current: float, received_at: float, count: int) -> float:
+        lag_ms = (time.time() - received_at) * 1000
+        if count <= 1:
+            return lag_ms
+        return current + self.EWMA_ALPHA * (lag_ms - current)
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "frames_received": self.frames_received,
+            "frames_dropped": self.frames_dropped,
+            "frames_processed": self.frames_processed,
+            "audio_received": self.audio_received,
+            "audio_processed": self.audio_processed,
+            "audio_dropped": self.audio_dropped,
+            "audio_queued": self._audio_lane.qsize(),
+            "audio_paused": self._audio_paused,
+            "video_lag_ms": round(self.video_lag_ms, 1),
+            "audio_lag_ms": round(self.audio_lag_ms, 1),
+        }
@@ -0,0 +1,112 @@
+"""
+Binary Ingest Protocol — Versioned framing for video/audio payloads.
+
+Replaces base64-in-JSON for media: the raw JPEG / PCM16 bytes follow a
+small fixed header and are handed to the decoders as a `memoryview`
+slice of the received message (no base64 pass, no extra copy).
+
+Frame layout (network byte order):
+
+    offset  size  field
+    0       2     magic            b"BA"
+    2       1     version          1
+    3       1     message type     1 = video_frame, 2 = audio_chunk
+    4       2     session id len   N (0 → connection's default session)
+    6       4     sequence number  uint32, per session & type
+    10      8     capture ts       float64, client epoch seconds
+    18      4     payload length   uint32
+    22      N     session id       UTF-8
+    22+N    ...   payload          JPEG / PCM16 LE mono
+
+Control messages (start / stop) and legacy clients keep using JSON.
+"""
+
+import struct
+import time
+from dataclasses import dataclass
+from typing import Optional, Union
+
+MAGIC = b"BA"
+VERSION = 1
+
+MSG_VIDEO_FRAME = 1
+MSG_AUDIO_CHUNK = 2
+
+MESSAGE_TYPES = {
+    MSG_VIDEO_FRAME: "video_frame",
+    MSG_AUDIO_CHUNK: "audio_chunk",
+}
+
+HEADER = struct.Struct("!2sBBHIdI")
+
+SEQ_MODULUS = 1 << 32       # sequence numbers are uint32 and wrap
+
+
+class ProtocolError(ValueError):
+    """Malformed or unsupported binary frame."""
+
+
+@dataclass(frozen=True)
+class BinaryFrame:
+    """A decoded binary message; `payload` is a view into the original buffer."""
+    msg_type: int
+    session_id: Optional[str]
+    seq: int
+    capture_ts: float
+    payload: memoryview
+
+    @property
+    def type_name(self) -> str:
+        return MESSAGE_TYPES[self.msg_type]
+
+
+def is_binary_frame(buf: Union[bytes, memoryview]) -> bool:
+    """Cheap check: does the buffer start with the frame magic?"""
+    return len(buf) >= HEADER.size and bytes(buf[:2]) == MAGIC
+
+
+def decode_frame(buf: Union[bytes, memoryview]) -> BinaryFrame:
+    """Parse header + session id; the payload is returned as a zero-copy view."""
+    view = memoryview(buf)
+    if len(view) < HEADER.size:
+        raise ProtocolError("Frame shorter than header")
+
+    magic, version, msg_type, sid_len, seq, capture_ts, payload_len = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ProtocolError("Bad frame magic")
+    if version != VERSION:
+        raise ProtocolError(f"Unsupported frame version: {version}")
+    if msg_type not in MESSAGE_TYPES:
+        raise ProtocolError(f"Unknown frame type: {msg_type}")
+
+    sid_end = HEADER.size + sid_len
+    if len(view) != sid_end + payload_len:
+        raise ProtocolError(
+            f"Frame length mismatch: got {len(view)}, header says {sid_end + payload_len}"
+        )
+
+    session_id = bytes(view[HEADER.size:sid_end]).decode("utf-8") if sid_len else None
+    return BinaryFrame(
+        msg_type=msg_type,
+        session_id=session_id,
+        seq=seq,
+        capture_ts=capture_ts,
+        payload=view[sid_end:],
+    )
+
+
+def seq_newer(seq: int, last: int) -> bool:
+    """Is `seq` after `last`? Serial-number arithmetic (RFC 1982), so the uint32 wrap is no reordering."""
+    delta = (seq - last) % SEQ_MODULUS
+    return 0 < delta < SEQ_MODULUS // 2
+
+
+def encode_frame(msg_type: int, payload: bytes, session_id: Optional[str] = None,
+                 seq: int = 0, capture_ts: Optional[float] = None) -> bytes:
+    """Build a binary frame (for Python clients and tooling)."""
+    sid = session_id.encode("utf-8") if session_id else b""
+    header = HEADER.pack(
+        MAGIC, VERSION, msg_type, len(sid), seq & 0xFFFFFFFF,
+        capture_ts if capture_ts is not None else time.time(), len(payload),
+    )
+    return b"".join((header, sid, payload))
@@ -4,11 +4,14 @@ Session Orchestrator — Manages per-session analyzer pipelines.
 Each WebSocket client gets an isolated session with its own:
   - FaceAnalyzer
   - HandGestureAnalyzer
+  - HolisticAnalyzer (HOLISTIC_MODE: one graph feeds face, hand and posture metrics)
   - AudioAnalyzer
   - StressHeatmapGenerator
   - ConfidenceStressEngine
 
-Orchestrates the analysis pipeline per-frame.
+Orchestrates the analysis pipeline per-frame: each stage (face, hands,
+heatmap, fusion) runs at its own adaptive rate via StageScheduler, and a
+tick where a stage is not due reuses that stage's latest result.
 """
 
 import asyncio
@@ -17,7 +20,6 @@ import time
 from dataclasses import dataclass, field
 from typing import Optional, Dict
 
-import cv2
 import numpy as np
 
 from analyzers import (
@@ -27,8 +29,19 @@ from analyzers import (
     StressHeatmapGenerator,
     ConfidenceStressEngine,
     BehaviorSnapshot,
+    FramePreprocessor,
+    HolisticAnalyzer,
+    LandmarkPredictor,
+    face_mesh_pool,
+    face_detection_pool,
+    get_backend,
+    hands_pool,
+    holistic_pool,
 )
 from config import settings
+from session_stats import SessionStats
+from stage_scheduler import StageScheduler
+from storage.snapshot_store import SnapshotStore
 
 
 @dataclass
@@ -38,45 +51,162 @@ class SessionState:
     user_id: str
     gto_session_id: Optional[str]   # linked GTO simulation session
     started_at: float
-    frame_count: int = 0
-    audio_chunk_count: int = 0
 
-    # Analyzers (created per session)
-    face_analyzer: FaceAnalyzer = field(default_factory=lambda: FaceAnalyzer(
-        max_faces=settings.FACE_MESH_MAX_FACES,
-        min_detection=settings.FACE_MESH_MIN_DETECTION_CONFIDENCE,
-        min_tracking=settings.FACE_MESH_MIN_TRACKING_CONFIDENCE,
-    ))
-    hand_analyzer: HandGestureAnalyzer = field(default_factory=lambda: HandGestureAnalyzer(
-        max_hands=settings.HAND_MAX_HANDS,
-        min_detection=settings.HAND_MIN_DETECTION_CONFIDENCE,
-        min_tracking=settings.HAND_MIN_TRACKING_CONFIDENCE,
+    # Analyzers (created per session; MediaPipe graphs come from the shared pools)
+    face_analyzer: FaceAnalyzer
+    hand_analyzer: HandGestureAnalyzer
+    holistic_analyzer: Optional[HolisticAnalyzer] = None   # HOLISTIC_MODE only
+
+    analysis_width: int = 0         # frames are decoded/resized down to this width
+    frame_count: int = 0
+    audio_chunk_count: int = 0      # client audio chunks received
+    audio_windows: int = 0          # audio windows analyzed (one per chunk, or per hop when streaming)
+    forced_inferences: int = 0      # predictions rejected by their error bound
+    audio_analyzer: AudioAnalyzer = field(default_factory=lambda: AudioAnalyzer(
+        sample_rate=16000,
+        pitch_engine=settings.PITCH_ENGINE,
+        hop_ms=settings.AUDIO_HOP_MS,
+        vad=settings.AUDIO_VAD,
     ))
-    audio_analyzer: AudioAnalyzer = field(default_factory=lambda: AudioAnalyzer(sample_rate=16000))
     heatmap_gen: StressHeatmapGenerator = field(default_factory=lambda: StressHeatmapGenerator(
         resolution=settings.HEATMAP_RESOLUTION,
+        half_life_s=settings.HEATMAP_HALF_LIFE_MS / 1000,
     ))
     confidence_engine: ConfidenceStressEngine = field(default_factory=ConfidenceStressEngine)
 
     # Accumulated data
-    snapshots: list = field(default_factory=list)
+    snapshots: SnapshotStore = field(init=False)
     all_alerts: list = field(default_factory=list)
+    stats: SessionStats = field(default_factory=SessionStats)
+
+    # Latest stage results; stages run at their own cadence and reuse these between ticks
+    scheduler: StageScheduler = field(init=False)
+    last_face: Optional[tuple] = None       # (FaceSnapshot, at)
+    last_hands: Optional[tuple] = None      # (HandMetrics, at)
+    last_audio: Optional[tuple] = None      # (AudioMetrics, at)
+    last_posture: Optional[tuple] = None    # (PostureMetrics, at), holistic mode only
+    last_heatmap: Optional[object] = None
+
+    def __post_init__(self):
+        self.snapshots = SnapshotStore(self.session_id)
+        self.scheduler = StageScheduler(
+            {
+                'face': settings.FACE_RATE_HZ,
+                'hands': settings.HANDS_RATE_HZ,
+                'heatmap': settings.HEATMAP_RATE_HZ,
+                'fusion': settings.FUSION_RATE_HZ,
+            },
+            lag_budget_ms=settings.SCHED_LAG_BUDGET_MS,
+            cpu_budget=settings.SCHED_CPU_BUDGET,
+            min_scale=settings.SCHED_MIN_SCALE,
+        )
 
 
 class SessionOrchestrator:
     """Manages analysis sessions."""
 
-    def __init__(self):
+    MIN_ANALYSIS_WIDTH = 160
+    MAX_ANALYSIS_WIDTH = 1920
+
+    def __init__(self, pool_size: Optional[int] = None):
         self._sessions: Dict[str, SessionState] = {}
+        self._preprocessor = FramePreprocessor(settings.ANALYSIS_WIDTH)
+        pool_size = pool_size or settings.MODEL_POOL_SIZE or 1
+        # Holistic is MediaPipe-only, so it overrides INFERENCE_BACKEND
+        self._backend = get_backend(
+            'mediapipe' if settings.HOLISTIC_MODE else settings.INFERENCE_BACKEND,
+            model_dir=settings.INFERENCE_MODEL_DIR,
+            int8=settings.INFERENCE_INT8,
+            threads=settings.INFERENCE_THREADS,
+            providers=[p.strip() for p in settings.INFERENCE_PROVIDERS.split(',') if p.strip()],
+            # Batches can only fill from concurrently running lanes, i.e. with several graphs
+            max_batch=settings.INFERENCE_MAX_BATCH if pool_size > 1 else 1,
+            batch_wait_ms=settings.INFERENCE_BATCH_WAIT_MS,
+        )
+        self._face_pool = face_mesh_pool(
+            pool_size,
+            max_faces=settings.FACE_MESH_MAX_FACES,
+            min_detection=settings.FACE_MESH_MIN_DETECTION_CONFIDENCE,
+            min_tracking=settings.FACE_MESH_MIN_TRACKING_CONFIDENCE,
+            backend=self._backend,
+        )
+        self._face_probe_pool = face_detection_pool(
+            pool_size,
+            min_detection=settings.FACE_MESH_MIN_DETECTION_CONFIDENCE,
+            backend=self._backend,
+        )
+        self._hands_pool = hands_pool(
+            pool_size,
+            max_hands=settings.HAND_MAX_HANDS,
+            min_detection=settings.HAND_MIN_DETECTION_CONFIDENCE,
+            min_tracking=settings.HAND_MIN_TRACKING_CONFIDENCE,
+            backend=self._backend,
+        )
+        self._holistic_pool = holistic_pool(
+            pool_size,
+            min_detection=settings.POSE_MIN_DETECTION_CONFIDENCE,
+            min_tracking=settings.POSE_MIN_TRACKING_CONFIDENCE,
+            model_complexity=settings.HOLISTIC_MODEL_COMPLEXITY,
+            backend=self._backend,
+        ) if settings.HOLISTIC_MODE else None
+
+    @property
+    def _pools(self) -> dict:
+        """The shared pools this deployment actually runs inference on."""
+        if self._holistic_pool is not None:
+            return {'holistic': self._holistic_pool}
+        return {
+            'face_mesh': self._face_pool,
+            'face_detection': self._face_probe_pool,
+            'hands': self._hands_pool,
+        }
+
+    def warm_models(self) -> dict:
+        """Build and warm the shared inference graphs (idempotent)."""
+        for pool in self._pools.values():
+            pool.warm()
+        return self.model_stats()
+
+    def model_stats(self) -> dict:
+        stats = {name: pool.stats() for name, pool in self._pools.items()}
+        batching = self._backend.batching_stats()
+        if batching:
+            stats['batching'] = batching
+        return stats
 
-    def create_session(self, session_id: str, user_id: str, gto_session_id: Optional[str] = None) -> SessionState:
-        """Create a new analysis session."""
+    @property
+    def models_ready(self) -> bool:
+        return all(pool.ready for pool in self._pools.values())
+
+    def create_session(self, session_id: str, user_id: str, gto_session_id: Optional[str] = None,
+                       analysis_width: Optional[int] = None) -> SessionState:
+        """Create a new analysis session (optionally with its own analysis width)."""
+        width = int(analysis_width or settings.ANALYSIS_WIDTH)
         state = SessionState(
             session_id=session_id,
             user_id=user_id,
             gto_session_id=gto_session_id,
             started_at=time.time(),
+            analysis_width=min(self.MAX_ANALYSIS_WIDTH, max(self.MIN_ANALYSIS_WIDTH, width)),
+            face_analyzer=FaceAnalyzer(
+                pool=self._face_pool,
+                predictor=LandmarkPredictor(max_error=settings.PREDICTION_MAX_ERROR),
+                detector_pool=self._face_probe_pool,
+                absent_after=settings.FACE_ABSENT_AFTER_MISSES,
+                probe_interval_s=settings.FACE_PROBE_INTERVAL_MS / 1000,
+            ),
+            hand_analyzer=HandGestureAnalyzer(
+                pool=self._hands_pool,
+                max_prediction_error=settings.PREDICTION_MAX_ERROR,
+                absent_after=settings.HAND_ABSENT_AFTER_MISSES,
+                probe_interval_s=settings.HAND_PROBE_INTERVAL_MS / 1000,
+                roi_margin=settings.HAND_ROI_MARGIN,
+            ),
         )
+        if self._holistic_pool is not None:
+            state.holistic_analyzer = HolisticAnalyzer(
+                state.face_analyzer, state.hand_analyzer, pool=self._holistic_pool,
+            )
         self._sessions[session_id] = state
         return state
 
@@ -89,83 +219,193 @@ class SessionOrchestrator:
         if state:
             state.face_analyzer.release()
             state.hand_analyzer.release()
+            if state.holistic_analyzer is not None:
+                state.holistic_analyzer.release()
+            state.snapshots.close()
         return state
 
-    def process_video_frame(self, session_id: str, frame_bytes: bytes) -> Optional[BehaviorSnapshot]:
+    def finish_session(self, session_id: str) -> Optional[dict]:
+        """Summarize and end a session in one call (returns the final summary)."""
+        summary = self.get_session_summary(session_id)
+        self.end_session(session_id)
+        return summary
+
+    def describe_sessions(self, session_ids: Optional[list] = None) -> list:
+        """Lightweight per-session status rows for the /sessions endpoint (`session_ids` → only those)."""
+        now = time.time()
+        if session_ids is None:
+            states = list(self._sessions.items())
+        else:
+            states = [(sid, self._sessions[sid]) for sid in session_ids if sid in self._sessions]
+        return [
+            {
+                "session_id": sid,
+                "user_id": state.user_id,
+                "gto_session_id": state.gto_session_id,
+                "frame_count": state.frame_count,
+                "audio_chunks": state.audio_chunk_count,
+                "audio_windows": state.audio_windows,
+                "alerts": len(state.all_alerts),
+                "duration_sec": round(now - state.started_at, 1),
+                "analysis_width": state.analysis_width,
+                "history": state.snapshots.stats(),
+                "scheduler": state.scheduler.stats(),
+                "forced_inferences": state.forced_inferences,
+                "face_gate": {
+                    "absent": state.face_analyzer.face_absent,
+                    "probes": state.face_analyzer.probes,
+                    "gated_frames": state.face_analyzer.gated_frames,
+                },
+                "hand_gate": {
+                    "absent": state.hand_analyzer.hands_absent,
+                    "probes": state.hand_analyzer.probes,
+                    "gated_frames": state.hand_analyzer.gated_frames,
+                    "roi_frames": state.hand_analyzer.roi_frames,
+                    "full_frames": state.hand_analyzer.full_frames,
+                },
+                "audio_gate": state.audio_analyzer.vad_stats(),
+            }
+            for sid, state in states
+        ]
+
+    def process_video_frame(self, session_id: str, frame_bytes: bytes,
+                            received_at: Optional[float] = None) -> Optional[BehaviorSnapshot]:
         """
         Process a single video frame (JPEG or raw BGR).
-        Returns a BehaviorSnapshot or None if session not found.
+        `frame_bytes` may be any buffer (bytes or a zero-copy memoryview).
+        Returns a BehaviorSnapshot when the fusion stage was due, else None.
         """
         state = self._sessions.get(session_id)
         if not state:
             return None
 
-        # Decode frame
-        nparr = np.frombuffer(frame_bytes, np.uint8)
-        frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if frame is None:
-            return None
-
+        started = time.perf_counter()
+        now = time.time()
         state.frame_count += 1
+        self._analyze_video(state, frame_bytes, now)
+        snapshot = self._fuse(state, now)
+        state.scheduler.record(time.time(), time.perf_counter() - started, received_at)
+        return snapshot
 
-        # ── Run face analysis ────────────────────────────────────────────
-        face_snap = state.face_analyzer.process_frame(frame)
-
-        # Get raw face landmarks for hand-to-face touch detection
-        face_lm = None
-        # We pass the frame to the face mesh separately for hand analysis
-        # to avoid double processing — the face_snap already has the data
-
-        # ── Run hand analysis ────────────────────────────────────────────
-        hand_metrics = state.hand_analyzer.process_frame(frame, face_lm)
-
-        # ── Generate stress heatmap ──────────────────────────────────────
-        heatmap = state.heatmap_gen.generate(face_snap, hand_metrics, None)
-
-        # ── Compute confidence/stress ────────────────────────────────────
-        snapshot = state.confidence_engine.compute(face_snap, hand_metrics, None, heatmap)
+    def _analyze_video(self, state: SessionState, frame_bytes, now: float):
+        if state.holistic_analyzer is not None:
+            self._analyze_holistic(state, frame_bytes, now)
+        else:
+            self._analyze_frame(state, frame_bytes, now)
 
-        # Store
-        state.snapshots.append(snapshot)
-        if snapshot.alerts:
-            state.all_alerts.extend(snapshot.alerts)
+    def _analyze_holistic(self, state: SessionState, frame_bytes, now: float):
+        """
+        Holistic mode: whenever the face or the hand stage is due, one graph
+        call refreshes face, hands and posture together. Between inferences
+        (if LANDMARK_PREDICTION) face and hands are extrapolated as usual.
+        """
+        scheduler = state.scheduler
+        face_snap = hand_metrics = None
+        infer = scheduler.due('face', now) | scheduler.due('hands', now)   # count both ticks
+        if not infer and settings.LANDMARK_PREDICTION:
+            face_snap = state.face_analyzer.predict_frame(now)
+            landmarks = face_snap.landmarks if face_snap is not None else None
+            hand_metrics = state.hand_analyzer.predict_frame(landmarks, now)
+            infer = face_snap is None or hand_metrics is None
+            state.forced_inferences += infer
+        if infer:
+            frame = self._preprocessor.decode(frame_bytes, target_width=state.analysis_width)
+            if frame is None:
+                return
+            face_snap, hand_metrics, posture = state.holistic_analyzer.process_frame(frame, now)
+            state.last_posture = (posture, now)
+
+        if face_snap is not None:
+            state.last_face = (face_snap, now)
+        if hand_metrics is not None:
+            state.last_hands = (hand_metrics, now)
+
+    def _analyze_frame(self, state: SessionState, frame_bytes, now: float):
+        """
+        Run the face / hand stages that are due. Between inferences (if
+        LANDMARK_PREDICTION) the analyzers extrapolate landmarks instead; a
+        prediction whose error bound is too large forces a real inference.
+        The frame is only decoded if some stage actually needs inference;
+        while no face / hands are in view, ticks between presence probes need none.
+        """
+        scheduler = state.scheduler
+        predict = settings.LANDMARK_PREDICTION
+        decoded = []
 
-        return snapshot
+        def frame():
+            if not decoded:
+                decoded.append(self._preprocessor.decode(frame_bytes, target_width=state.analysis_width))
+            return decoded[0]
 
-    def process_audio_chunk(self, session_id: str, audio_bytes: bytes, sample_rate: int = 16000) -> Optional[BehaviorSnapshot]:
+        # ── Run face analysis (or extrapolate between inferences) ────────
+        face_snap = None
+        infer = scheduler.due('face', now)
+        if not infer and predict:
+            face_snap = state.face_analyzer.predict_frame(now)
+            infer = face_snap is None
+            state.forced_inferences += infer
+        if infer:
+            face_snap = state.face_analyzer.absent_snapshot(now)
+        if infer and face_snap is None and frame() is not None:
+            face_snap = state.face_analyzer.process_frame(frame(), now)
+
+        # ── Run hand analysis (face landmarks enable precise hand-to-face touch) ──
+        face_ref = face_snap if face_snap is not None else self._fresh(state.last_face, now)
+        landmarks = face_ref.landmarks if face_ref is not None else None
+        hand_metrics = None
+        infer = scheduler.due('hands', now)
+        if not infer and predict:
+            hand_metrics = state.hand_analyzer.predict_frame(landmarks, now)
+            infer = hand_metrics is None
+            state.forced_inferences += infer
+        if infer:
+            hand_metrics = state.hand_analyzer.absent_metrics(now)
+        if infer and hand_metrics is None and frame() is not None:
+            hand_metrics = state.hand_analyzer.process_frame(frame(), landmarks, now)
+
+        if face_snap is not None:
+            state.last_face = (face_snap, now)
+        if hand_metrics is not None:
+            state.last_hands = (hand_metrics, now)
+
+    def process_audio_chunk(self, session_id: str, audio_bytes: bytes, sample_rate: int = 16000,
+                            received_at: Optional[float] = None, chunks: int = 1) -> Optional[BehaviorSnapshot]:
         """
         Process an audio chunk (raw PCM int16 or float32).
-        Usually called at ~1Hz.
+        Usually called at ~1Hz; with AUDIO_STREAMING, chunks may be any size and
+        `chunks` client chunks may arrive coalesced into one call (see pipeline/ingest.py).
         """
         state = self._sessions.get(session_id)
         if not state:
             return None
 
-        state.audio_chunk_count += 1
-
-        # Decode audio
-        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-
-        # ── Run audio analysis ───────────────────────────────────────────
-        audio_metrics = state.audio_analyzer.process_chunk(audio)
-
-        # ── Generate heatmap with audio data ─────────────────────────────
-        heatmap = state.heatmap_gen.generate(None, None, audio_metrics)
-
-        # ── Compute confidence/stress with audio ─────────────────────────
-        snapshot = state.confidence_engine.compute(None, None, audio_metrics, heatmap)
-
-        state.snapshots.append(snapshot)
-        if snapshot.alerts:
-            state.all_alerts.extend(snapshot.alerts)
-
+        started = time.perf_counter()
+        now = time.time()
+        self._analyze_audio(state, audio_bytes, now, chunks)
+        snapshot = self._fuse(state, now)
+        state.scheduler.record(time.time(), time.perf_counter() - started, received_at)
         return snapshot
 
+    def _analyze_audio(self, state: SessionState, audio_bytes, now: float, chunks: int = 1):
+        """Audio runs on every chunk (~1 Hz), or every hop when streaming; it is never rate-limited."""
+        state.audio_chunk_count += chunks
+        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
+        audio *= 1.0 / 32768.0
+        if settings.AUDIO_STREAMING:
+            results = state.audio_analyzer.push(audio, now)
+            if results:
+                state.audio_windows += len(results)
+                state.last_audio = (results[-1], now)
+        else:
+            state.audio_windows += 1
+            state.last_audio = (state.audio_analyzer.process_chunk(audio), now)
+
     def process_combined(
         self,
         session_id: str,
         frame_bytes: Optional[bytes],
         audio_bytes: Optional[bytes],
+        received_at: Optional[float] = None,
     ) -> Optional[BehaviorSnapshot]:
         """
         Process video + audio together for synchronized analysis.
@@ -175,44 +415,54 @@ class SessionOrchestrator:
         if not state:
             return None
 
-        face_snap = None
-        hand_metrics = None
-        audio_metrics = None
-
-        # ── Video ────────────────────────────────────────────────────────
+        started = time.perf_counter()
+        now = time.time()
         if frame_bytes:
-            nparr = np.frombuffer(frame_bytes, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            if frame is not None:
-                state.frame_count += 1
-                face_snap = state.face_analyzer.process_frame(frame)
-                hand_metrics = state.hand_analyzer.process_frame(frame, None)
-
-        # ── Audio ────────────────────────────────────────────────────────
+            state.frame_count += 1
+            self._analyze_video(state, frame_bytes, now)
         if audio_bytes:
-            state.audio_chunk_count += 1
-            audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-            audio_metrics = state.audio_analyzer.process_chunk(audio)
+            self._analyze_audio(state, audio_bytes, now)
+        snapshot = self._fuse(state, now)
+        state.scheduler.record(time.time(), time.perf_counter() - started, received_at)
+        return snapshot
+
+    # ── Heatmap & fusion (from the latest modality results) ─────────────────────
 
-        # ── Heatmap & confidence ─────────────────────────────────────────
-        heatmap = state.heatmap_gen.generate(face_snap, hand_metrics, audio_metrics)
-        snapshot = state.confidence_engine.compute(face_snap, hand_metrics, audio_metrics, heatmap)
+    @staticmethod
+    def _fresh(entry: Optional[tuple], now: float):
+        """The stored result if it is recent enough to still describe the candidate."""
+        return entry[0] if entry and now - entry[1] <= settings.STAGE_RESULT_TTL_S else None
 
+    def _fuse(self, state: SessionState, now: float) -> Optional[BehaviorSnapshot]:
+        """Run the heatmap / fusion stages if due; returns a snapshot only on fusion ticks."""
+        face = self._fresh(state.last_face, now)
+        hands = self._fresh(state.last_hands, now)
+        audio = self._fresh(state.last_audio, now)
+        posture = self._fresh(state.last_posture, now)
+
+        # ── Generate stress heatmap ──────────────────────────────────────
+        if state.scheduler.due('heatmap', now) or state.last_heatmap is None:
+            state.last_heatmap = state.heatmap_gen.generate(face, hands, audio, now=now)
+
+        # ── Compute confidence/stress ────────────────────────────────────
+        if not state.scheduler.due('fusion', now):
+            return None
+        snapshot = state.confidence_engine.compute(face, hands, audio, state.last_heatmap, posture)
+        self._record(state, snapshot)
+        return snapshot
+
+    def _record(self, state: SessionState, snapshot: BehaviorSnapshot):
         state.snapshots.append(snapshot)
         if snapshot.alerts:
             state.all_alerts.extend(snapshot.alerts)
-
-        return snapshot
+        state.stats.update(snapshot)
 
     def get_session_summary(self, session_id: str) -> Optional[dict]:
-        """Get aggregated session metrics for post-analysis."""
+        """Aggregated session metrics; O(1) from running stats, safe to poll mid-session."""
         state = self._sessions.get(session_id)
-        if not state or not state.snapshots:
+        if not state or not state.stats.snapshot_count:
             return None
 
-        confidences = [s.confidence.overall_confidence for s in state.snapshots]
-        stresses = [s.confidence.stress_index for s in state.snapshots]
-
         return {
             'session_id': session_id,
             'user_id': state.user_id,
@@ -220,24 +470,10 @@ class SessionOrchestrator:
             'duration_sec': round(time.time() - state.started_at, 1),
             'total_frames': state.frame_count,
             'total_audio_chunks': state.audio_chunk_count,
-            'total_snapshots': len(state.snapshots),
-            'total_alerts': len(state.all_alerts),
-            'confidence_avg': round(float(np.mean(confidences)), 1),
-            'confidence_min': round(float(np.min(confidences)), 1),
-            'confidence_max': round(float(np.max(confidences)), 1),
-            'stress_avg': round(float(np.mean(stresses)), 1),
-            'stress_max': round(float(np.max(stresses)), 1),
-            'stress_trend': state.snapshots[-1].confidence.stress_trend if state.snapshots else 'STABLE',
-            'alert_breakdown': self._count_alerts(state.all_alerts),
+            'total_audio_windows': state.audio_windows,
+            **state.stats.to_dict(),
         }
 
-    def _count_alerts(self, alerts: list) -> dict:
-        counts = {}
-        for a in alerts:
-            key = a.alert_type
-            counts[key] = counts.get(key, 0) + 1
-        return counts
-
     @property
     def active_sessions(self) -> int:
         return len(self._sessions)
@@ -0,0 +1,127 @@
+"""
+Session Stats — Running aggregates for O(1) session summaries.
+
+Updated once per BehaviorSnapshot, so a summary never rescans the session:
+
+  - Welford mean / variance, min / max
+  - Streaming p50 / p90 / p99 from a fixed 0.1-wide histogram over the
+    0-100 score range (exact to the bin width, constant memory)
+  - Time spent in each stress band (the interval up to the next snapshot
+    is credited to the band of the current one)
+  - Alert breakdown by type
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# Stress bands: (name, lower bound inclusive); upper bound is the next band's lower
+STRESS_BANDS = (
+    ('LOW', 0.0),
+    ('MODERATE', 30.0),
+    ('ELEVATED', 50.0),
+    ('HIGH', 70.0),        # matches the STRESS_SPIKE alert threshold
+)
+
+QUANTILES = (50, 90, 99)
+
+
+class RunningStat:
+    """Welford mean/variance + min/max + histogram quantiles for a 0-100 score."""
+
+    def __init__(self, lo: float = 0.0, hi: float = 100.0, bin_width: float = 0.1):
+        self.count: int = 0
+        self.mean: float = 0.0
+        self._m2: float = 0.0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+        self._lo = lo
+        self._bin_width = bin_width
+        self._hist = np.zeros(int(round((hi - lo) / bin_width)) + 1, dtype=np.int64)
+
+    def add(self, value: float):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        idx = int((value - self._lo) / self._bin_width + 0.5)
+        self._hist[min(len(self._hist) - 1, max(0, idx))] += 1
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.count) if self.count > 1 else 0.0
+
+    def quantile(self, q: float) -> float:
+        """q in [0, 100]; value of the bin holding the q-th percentile."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        idx = int(np.searchsorted(np.cumsum(self._hist), rank))
+        return self._lo + idx * self._bin_width
+
+    def to_dict(self, prefix: str) -> dict:
+        out = {
+            f'{prefix}_avg': round(self.mean, 1),
+            f'{prefix}_min': round(self.min, 1),
+            f'{prefix}_max': round(self.max, 1),
+            f'{prefix}_std': round(self.std, 1),
+        }
+        for q in QUANTILES:
+            out[f'{prefix}_p{q}'] = round(self.quantile(q), 1)
+        return out
+
+
+class SessionStats:
+    """All running aggregates for one session."""
+
+    def __init__(self):
+        self.confidence = RunningStat()
+        self.stress = RunningStat()
+        self.snapshot_count: int = 0
+        self.alert_count: int = 0
+        self.alert_breakdown: Dict[str, int] = {}
+        self.band_seconds: Dict[str, float] = {name: 0.0 for name, _ in STRESS_BANDS}
+        self.stress_trend: str = 'STABLE'
+        self._last_ts: Optional[float] = None
+        self._last_band: Optional[str] = None
+
+    @staticmethod
+    def stress_band(stress: float) -> str:
+        band = STRESS_BANDS[0][0]
+        for name, lower in STRESS_BANDS:
+            if stress >= lower:
+                band = name
+        return band
+
+    def update(self, snapshot):
+        """Fold one BehaviorSnapshot into the aggregates."""
+        confidence = snapshot.confidence
+        self.snapshot_count += 1
+        self.confidence.add(confidence.overall_confidence)
+        self.stress.add(confidence.stress_index)
+        self.stress_trend = confidence.stress_trend
+
+        ts = snapshot.timestamp
+        if self._last_band is not None and ts > self._last_ts:
+            self.band_seconds[self._last_band] += ts - self._last_ts
+        self._last_ts = ts
+        self._last_band = self.stress_band(confidence.stress_index)
+
+        for alert in snapshot.alerts:
+            self.alert_count += 1
+            self.alert_breakdown[alert.alert_type] = self.alert_breakdown.get(alert.alert_type, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            'total_snapshots': self.snapshot_count,
+            'total_alerts': self.alert_count,
+            **self.confidence.to_dict('confidence'),
+            **self.stress.to_dict('stress'),
+            'stress_trend': self.stress_trend,
+            'stress_band_sec': {k: round(v, 1) for k, v in self.band_seconds.items()},
+            'alert_breakdown': dict(self.alert_breakdown),
+        }
@@ -0,0 +1,99 @@
+"""
+Stage Scheduler — Per-session multi-rate cadence for the analysis stages.
+
+Each stage has its own target rate (face, hands, heatmap, fusion); a tick
+that is not due reuses the stage's last result. A closed-loop controller
+scales all rates together:
+
+  - every CONTROL_PERIOD_S it compares the session's processing lag
+    (receive → done) and CPU share (seconds its analysis occupied a lane
+    per wall second; MediaPipe runs on its own threads, so per-thread CPU
+    clocks would undercount) against their budgets
+  - over budget → multiplicative decrease (×0.8, floored at min_scale)
+  - comfortably under both budgets → gentle increase (×1.1, up to 1.0)
+"""
+
+from typing import Dict, Optional
+
+STAGES = ('face', 'hands', 'heatmap', 'fusion')
+
+
+class StageScheduler:
+    """Decides which stages run on a tick and adapts their rates to load."""
+
+    CONTROL_PERIOD_S = 1.0
+    DECREASE = 0.8
+    INCREASE = 1.1
+    EWMA_ALPHA = 0.2
+
+    def __init__(self, rates_hz: Dict[str, float], lag_budget_ms: float = 250.0,
+                 cpu_budget: float = 0.25, min_scale: float = 0.25):
+        self.base_rates = {stage: max(0.1, float(rates_hz[stage])) for stage in STAGES}
+        self.lag_budget_s = lag_budget_ms / 1000
+        self.cpu_budget = cpu_budget
+        self.min_scale = min_scale
+        self.scale: float = 1.0
+        self._next_at: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+
+        # Controller state
+        self.lag_s: float = 0.0
+        self.cpu_share: float = 0.0
+        self._window_start: Optional[float] = None
+        self._window_cpu: float = 0.0
+        self._window_lag_max: float = 0.0
+
+        # Stats
+        self.runs: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.skips: Dict[str, int] = {stage: 0 for stage in STAGES}
+
+    # ── Cadence ──────────────────────────────────────────────────────────────────
+
+    def rate(self, stage: str) -> float:
+        return self.base_rates[stage] * self.scale
+
+    def due(self, stage: str, now: float) -> bool:
+        """True if `stage` should run now; counts the tick as run or skipped."""
+        if now >= self._next_at[stage]:
+            # Anchor to the previous slot so the average rate holds despite jitter
+            period = 1.0 / self.rate(stage)
+            self._next_at[stage] = max(self._next_at[stage] + period, now + period / 2)
+            self.runs[stage] += 1
+            return True
+        self.skips[stage] += 1
+        return False
+
+    # ── Controller ───────────────────────────────────────────────────────────────
+
+    def record(self, now: float, cpu_s: float, received_at: Optional[float] = None):
+        """Feed one processed tick: its busy time and (if known) when its input arrived."""
+        if self._window_start is None:
+            self._window_start = now
+        self._window_cpu += cpu_s
+        if received_at is not None:
+            self._window_lag_max = max(self._window_lag_max, now - received_at)
+
+        elapsed = now - self._window_start
+        if elapsed < self.CONTROL_PERIOD_S:
+            return
+
+        self.cpu_share += self.EWMA_ALPHA * (self._window_cpu / elapsed - self.cpu_share)
+        self.lag_s += self.EWMA_ALPHA * (self._window_lag_max - self.lag_s)
+        self._window_start, self._window_cpu, self._window_lag_max = now, 0.0, 0.0
+
+        if self.lag_s > self.lag_budget_s or self.cpu_share > self.cpu_budget:
+            self.scale = max(self.min_scale, self.scale * self.DECREASE)
+        elif self.lag_s < self.lag_budget_s / 2 and self.cpu_share < self.cpu_budget * 0.7:
+            self.scale = min(1.0, self.scale * self.INCREASE)
+
+    # ── Stats ────────────────────────────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            'scale': round(self.scale, 3),
+            'rates_hz': {stage: round(self.rate(stage), 2) for stage in STAGES},
+            'lag_ms': round(self.lag_s * 1000, 1),
+            'cpu_share': round(self.cpu_share, 3),
+            'runs': dict(self.runs),
+            'skips': dict(self.skips),
+        }
+
@@ -1,4 +1,5 @@
 """Encrypted Storage Package."""
 from .encrypted_store import EncryptedMetricsStore
+from .snapshot_store import SnapshotStore
 
-__all__ = ["EncryptedMetricsStore"]
+__all__ = ["EncryptedMetricsStore", "SnapshotStore"]
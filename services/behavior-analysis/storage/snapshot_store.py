@@ -0,0 +1,250 @@
+"""
+Snapshot Store — Bounded-memory, struct-of-arrays history of one session.
+
+Replaces the per-session list of BehaviorSnapshot objects (dataclasses,
+metric dict copies and a 3,072-element heatmap list each) with:
+
+  - One preallocated NumPy column per scalar metric, grown by doubling
+  - Heatmaps kept only as uint8 keyframes every SNAPSHOT_HEATMAP_INTERVAL
+    snapshots (plus the row they belong to)
+  - Past SNAPSHOT_MAX_ROWS in-memory rows, columns spill to memory-mapped
+    .npy files under SNAPSHOT_SPILL_DIR (system temp dir if empty); with
+    spilling disabled the history is decimated 2:1 instead, so memory
+    stays bounded and the whole session remains covered at lower resolution
+
+Raw per-analyzer metric dicts are not retained; they are persisted by the
+emitter for every update that goes out.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger("behavior-analysis.snapshot-store")
+
+TRENDS = ('STABLE', 'INCREASING', 'DECREASING', 'VOLATILE')
+TREND_CODES = {name: i for i, name in enumerate(TRENDS)}
+
+# Modality bitmask
+HAS_FACE, HAS_HANDS, HAS_AUDIO = 1, 2, 4
+
+SNAPSHOT_COLUMNS = {
+    'timestamp': np.float64,
+    'visual': np.float32,
+    'vocal': np.float32,
+    'gestural': np.float32,
+    'emotional': np.float32,
+    'overall': np.float32,
+    'stress': np.float32,
+    'stress_facial': np.float32,     # NaN when the component was absent
+    'stress_vocal': np.float32,
+    'stress_gestural': np.float32,
+    'stress_spatial': np.float32,
+    'trend': np.uint8,               # index into TRENDS
+    'modalities': np.uint8,          # HAS_FACE | HAS_HANDS | HAS_AUDIO
+    'alerts': np.uint16,
+}
+
+
+class _Columns:
+    """Named growable arrays sharing a leading dimension; optionally memmap-backed."""
+
+    def __init__(self, schema: Dict[str, tuple], capacity: int = 1024):
+        self._schema = schema                     # name -> (dtype, trailing shape)
+        self.size: int = 0
+        self.spill_dir: Optional[str] = None
+        self.arrays: Dict[str, np.ndarray] = {
+            name: np.empty((capacity, *shape), dtype=dtype) for name, (dtype, shape) in schema.items()
+        }
+
+    @property
+    def capacity(self) -> int:
+        return len(next(iter(self.arrays.values())))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a[:self.size].nbytes for a in self.arrays.values())
+
+    def reserve_row(self, max_rows: int, prefix: str) -> int:
+        """Make room for one more row (spilling once `max_rows` are in memory); returns its index."""
+        if self.size == self.capacity:
+            if self.spill_dir is None and self.capacity >= max_rows:
+                self.spill_dir = tempfile.mkdtemp(prefix=prefix, dir=settings.SNAPSHOT_SPILL_DIR or None)
+                logger.info(f"Spilling {prefix.rstrip('-')} to {self.spill_dir}")
+            new_capacity = self.capacity * 2
+            if self.spill_dir is None:
+                new_capacity = max(self.size + 1, min(new_capacity, max_rows))
+            self._grow(new_capacity)
+        self.size += 1
+        return self.size - 1
+
+    def _grow(self, capacity: int):
+        for name, (dtype, shape) in self._schema.items():
+            old = self.arrays[name]
+            if self.spill_dir is not None:
+                path = os.path.join(self.spill_dir, f"{name}.{capacity}.npy")
+                new = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(capacity, *shape))
+            else:
+                new = np.empty((capacity, *shape), dtype=dtype)
+            new[:self.size] = old[:self.size]
+            self.arrays[name] = new
+            self._discard(old)
+
+    def compact(self, keep: np.ndarray):
+        """Keep only the rows where the boolean mask `keep` is set (in place)."""
+        idx = np.flatnonzero(keep[:self.size])
+        for arr in self.arrays.values():
+            arr[:idx.size] = arr[idx]
+        self.size = idx.size
+
+    @staticmethod
+    def _discard(arr: np.ndarray):
+        if isinstance(arr, np.memmap) and arr.filename:
+            filename = arr.filename
+            del arr
+            try:
+                os.remove(filename)
+            except OSError:
+                pass
+
+    def close(self):
+        self.arrays.clear()
+        if self.spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+
+class SnapshotStore:
+    """Compact in-session history: scalar columns + periodic heatmap keyframes."""
+
+    def __init__(self, session_id: str = "", heatmap_interval: Optional[int] = None,
+                 max_rows: Optional[int] = None, spill: Optional[bool] = None,
+                 heatmap_resolution: tuple = settings.HEATMAP_RESOLUTION):
+        width, height = heatmap_resolution
+        self.session_id = session_id
+        self.heatmap_interval = max(1, heatmap_interval or settings.SNAPSHOT_HEATMAP_INTERVAL)
+        self.max_rows = max(1024, max_rows or settings.SNAPSHOT_MAX_ROWS)
+        self.spill = settings.SNAPSHOT_SPILL if spill is None else spill
+        self._rows = _Columns({name: (dtype, ()) for name, dtype in SNAPSHOT_COLUMNS.items()})
+        self._heatmaps = _Columns({
+            'row': (np.int64, ()),
+            'timestamp': (np.float64, ()),
+            'pixels': (np.uint8, (height, width)),
+        }, capacity=64)
+        self._appended: int = 0
+        self._stride: int = 1          # keep every Nth snapshot (doubles per decimation)
+
+    # ── Writes ───────────────────────────────────────────────────────────────────
+
+    def append(self, snapshot):
+        """Record one BehaviorSnapshot."""
+        self._appended += 1
+        if (self._appended - 1) % self._stride:
+            return
+        if not self.spill and self._rows.size >= self.max_rows:
+            self._decimate()
+
+        prefix = f"ba-{self.session_id}-"
+        i = self._rows.reserve_row(self.max_rows, prefix)
+        c = snapshot.confidence
+        components = c.stress_components
+        cols = self._rows.arrays
+        cols['timestamp'][i] = snapshot.timestamp
+        cols['visual'][i] = c.visual_confidence
+        cols['vocal'][i] = c.vocal_confidence
+        cols['gestural'][i] = c.gestural_confidence
+        cols['emotional'][i] = c.emotional_confidence
+        cols['overall'][i] = c.overall_confidence
+        cols['stress'][i] = c.stress_index
+        cols['stress_facial'][i] = components.get('facial', np.nan)
+        cols['stress_vocal'][i] = components.get('vocal', np.nan)
+        cols['stress_gestural'][i] = components.get('gestural', np.nan)
+        cols['stress_spatial'][i] = components.get('spatial', np.nan)
+        cols['trend'][i] = TREND_CODES.get(c.stress_trend, 0)
+        cols['modalities'][i] = (
+            (HAS_FACE if snapshot.face_metrics else 0)
+            | (HAS_HANDS if snapshot.hand_metrics else 0)
+            | (HAS_AUDIO if snapshot.audio_metrics else 0)
+        )
+        cols['alerts'][i] = min(len(snapshot.alerts), 0xFFFF)
+
+        # Keyframes sit on rows that are multiples of the interval
+        heatmap = snapshot.heatmap
+        if heatmap is not None and i % self.heatmap_interval == 0:
+            if heatmap.pixels.shape == self._heatmaps.arrays['pixels'].shape[1:]:
+                k = self._heatmaps.reserve_row(self.max_rows // self.heatmap_interval + 1, prefix + "hm-")
+                self._heatmaps.arrays['row'][k] = i
+                self._heatmaps.arrays['timestamp'][k] = heatmap.timestamp
+                self._heatmaps.arrays['pixels'][k] = heatmap.pixels
+
+    def _decimate(self):
+        """Halve the retained history 2:1 and the sampling rate from here on."""
+        self._rows.compact(np.arange(self._rows.capacity) % 2 == 0)
+        rows = self._heatmaps.arrays['row']
+        self._heatmaps.compact(rows % (2 * self.heatmap_interval) == 0)
+        rows[:self._heatmaps.size] //= 2
+        self._stride *= 2
+
+    def close(self):
+        """Release columns and any spill files."""
+        self._rows.close()
+        self._heatmaps.close()
+
+    # ── Reads ────────────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._rows.size
+
+    @property
+    def appended(self) -> int:
+        """Snapshots ever appended (len() can be smaller after decimation)."""
+        return self._appended
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of one column for the retained rows."""
+        view = self._rows.arrays[name][:self._rows.size].view()
+        view.flags.writeable = False
+        return view
+
+    def trends(self) -> np.ndarray:
+        """Stress trend names per row."""
+        return np.asarray(TRENDS)[self.column('trend')]
+
+    def window(self, since: float) -> Dict[str, np.ndarray]:
+        """All columns for rows with timestamp >= `since`."""
+        start = int(np.searchsorted(self.column('timestamp'), since))
+        return {name: self.column(name)[start:] for name in SNAPSHOT_COLUMNS}
+
+    def latest(self) -> Optional[dict]:
+        if not self._rows.size:
+            return None
+        i = self._rows.size - 1
+        row = {name: self._rows.arrays[name][i].item() for name in SNAPSHOT_COLUMNS}
+        row['trend'] = TRENDS[row['trend']]
+        return row
+
+    def heatmap_keyframes(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(timestamps, uint8 frames of shape (K, H, W)) for the retained keyframes."""
+        n = self._heatmaps.size
+        return self._heatmaps.arrays['timestamp'][:n], self._heatmaps.arrays['pixels'][:n]
+
+    def heatmap_at(self, timestamp: float) -> Optional[np.ndarray]:
+        """Most recent heatmap keyframe at or before `timestamp`."""
+        times, frames = self.heatmap_keyframes()
+        k = int(np.searchsorted(times, timestamp, side='right')) - 1
+        return frames[k] if k >= 0 else None
+
+    def stats(self) -> dict:
+        return {
+            'rows': self._rows.size,
+            'appended': self._appended,
+            'heatmap_keyframes': self._heatmaps.size,
+            'bytes': self._rows.nbytes + self._heatmaps.nbytes,
+            'spilled': self._rows.spill_dir is not None,
+        }
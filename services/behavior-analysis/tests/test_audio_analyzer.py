@@ -0,0 +1,75 @@
+"""AudioAnalyzer voice tremor score."""
+
+import numpy as np
+import pytest
+
+from analyzers.audio_analyzer import AudioAnalyzer
+
+SAMPLE_RATE = 16000
+
+
+def voice(f0: float, vibrato: float = 0.0, amplitude_tremor: float = 0.0, seed: int = 0) -> np.ndarray:
+    """1 s harmonic voice, optionally with 6 Hz F0 and 7 Hz amplitude modulation."""
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    inst = f0 * (1 + vibrato * np.sin(2 * np.pi * 6 * t))
+    phase = 2 * np.pi * np.cumsum(inst) / SAMPLE_RATE
+    signal = sum(np.sin(k * phase) / k for k in range(1, 8))
+    signal *= 1 + amplitude_tremor * np.sin(2 * np.pi * 7 * t)
+    noise = 0.003 * np.random.default_rng(seed).standard_normal(SAMPLE_RATE)
+    return (0.3 * signal / np.abs(signal).max() + noise).astype(np.float32)
+
+
+@pytest.fixture
+def analyzer():
+    return AudioAnalyzer(pitch_engine='yin')
+
+
+def test_tremor_score_is_zero_at_steady_voice_levels(analyzer):
+    assert analyzer._compute_tremor_score(0.3, 1.0) == 0.0
+    assert analyzer._compute_tremor_score(0.0, 0.0) == 0.0
+
+
+def test_tremor_score_is_bounded_and_monotonic(analyzer):
+    jitters = np.linspace(0, 10, 21)
+    scores = [analyzer._compute_tremor_score(j, 5.0) for j in jitters]
+    assert all(0 <= s <= 100 for s in scores)
+    assert scores == sorted(scores)
+    shimmers = np.linspace(0, 40, 21)
+    scores = [analyzer._compute_tremor_score(1.0, s) for s in shimmers]
+    assert scores == sorted(scores)
+    assert analyzer._compute_tremor_score(50.0, 100.0) == 100.0
+
+
+def test_process_chunk_scores_modulated_voice_above_steady_one(analyzer):
+    steady = analyzer.process_chunk(voice(160), timestamp=1000.0)
+    shaky = analyzer.process_chunk(voice(160, vibrato=0.06, amplitude_tremor=0.3), timestamp=1001.0)
+    assert steady.pitch_mean_hz == pytest.approx(160, abs=2)
+    assert steady.voice_tremor_score == 0.0
+    assert shaky.voice_tremor_score > 20
+
+
+# ── Streaming ingest (push) ─────────────────────────────────────────────
+
+def test_push_publishes_once_per_hop_for_any_chunk_size():
+    signal = np.concatenate([voice(150.0, seed=s) for s in range(2)])
+    counts = {}
+    for chunk in (320, 1000, 4000, 16000):      # 20 ms WebRTC frames … full windows
+        analyzer = AudioAnalyzer(pitch_engine='yin', hop_ms=250)
+        results = []
+        for start in range(0, len(signal), chunk):
+            results += analyzer.push(signal[start:start + chunk], timestamp=(start + chunk) / SAMPLE_RATE)
+        counts[chunk] = len(results)
+        stamps = [m.timestamp for m in results]
+        np.testing.assert_allclose(stamps, 0.25 * np.arange(1, len(stamps) + 1))
+    assert set(counts.values()) == {8}
+
+
+def test_push_carries_overlap_across_chunks():
+    signal = voice(150.0)
+    whole = AudioAnalyzer(pitch_engine='yin', hop_ms=250).push(signal, timestamp=1.0)
+    pieces = AudioAnalyzer(pitch_engine='yin', hop_ms=250)
+    split = []
+    for start in range(0, SAMPLE_RATE, 320):
+        split += pieces.push(signal[start:start + 320], timestamp=(start + 320) / SAMPLE_RATE)
+    assert [m.pitch_mean_hz for m in split] == pytest.approx([m.pitch_mean_hz for m in whole])
+    assert split[-1].pitch_mean_hz == pytest.approx(150.0, rel=0.02)
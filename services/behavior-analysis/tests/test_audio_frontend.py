@@ -0,0 +1,66 @@
+"""AudioRingBuffer wraparound and overflow."""
+
+import numpy as np
+import pytest
+
+from analyzers.audio_frontend import AudioRingBuffer
+
+
+def ramp(start: int, n: int) -> np.ndarray:
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_partial_fill():
+    ring = AudioRingBuffer(8)
+    assert ring.latest().size == 0
+    ring.write(ramp(0, 3))
+    assert ring.filled == 3 and ring.total == 3
+    np.testing.assert_array_equal(ring.latest(), ramp(0, 3))
+    np.testing.assert_array_equal(ring.latest(2), ramp(1, 2))
+    np.testing.assert_array_equal(ring.latest(50), ramp(0, 3))     # clipped to what is buffered
+    assert ring.latest(0).size == 0
+
+
+def test_wraparound_keeps_order():
+    ring = AudioRingBuffer(8)
+    ring.write(ramp(0, 6))
+    ring.write(ramp(6, 5))          # crosses the end of the buffer
+    assert ring.filled == 8 and ring.total == 11
+    np.testing.assert_array_equal(ring.latest(), ramp(3, 8))
+    np.testing.assert_array_equal(ring.latest(3), ramp(8, 3))
+    np.testing.assert_array_equal(ring.latest(5), ramp(6, 5))
+
+
+@pytest.mark.parametrize('n', [8, 9, 30])
+def test_overflow_keeps_newest_capacity(n):
+    ring = AudioRingBuffer(8)
+    ring.write(ramp(0, 5))
+    ring.write(ramp(5, n))          # one write at or over capacity
+    np.testing.assert_array_equal(ring.latest(), ramp(5 + n - 8, 8))
+    assert ring.total == 5 + n
+    ring.write(ramp(5 + n, 3))      # and writes after it continue from the right slot
+    np.testing.assert_array_equal(ring.latest(), ramp(n, 8))
+
+
+def test_many_small_writes_match_a_linear_buffer():
+    rng = np.random.default_rng(0)
+    ring = AudioRingBuffer(100)
+    written = np.empty(0, dtype=np.float32)
+    for _ in range(200):
+        chunk = rng.standard_normal(int(rng.integers(0, 37))).astype(np.float32)
+        ring.write(chunk)
+        written = np.concatenate((written, chunk))
+        for n in (None, 1, 17, 100):
+            expect = written[-min(n or 100, len(written)):] if len(written) else written
+            np.testing.assert_array_equal(ring.latest(n), expect)
+
+
+def test_latest_is_a_copy_and_clear_empties():
+    ring = AudioRingBuffer(4)
+    ring.write(ramp(0, 4))
+    out = ring.latest()
+    out[:] = -1
+    np.testing.assert_array_equal(ring.latest(), ramp(0, 4))
+    ring.clear()
+    assert ring.filled == 0 and ring.latest().size == 0
+    assert ring.total == 4
@@ -0,0 +1,73 @@
+"""OutboundEmitter interval negotiation and unchanged-snapshot skipping."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import orjson
+
+from config import settings
+from pipeline.emitter import MAX_EMIT_INTERVAL_MS, MIN_EMIT_INTERVAL_MS, OutboundEmitter
+
+
+def snapshot(ts: float, stress: float = 40.0, volume=-20.0, alerts=()):
+    confidence = SimpleNamespace(
+        timestamp=ts, visual_confidence=70.0, vocal_confidence=60.0, gestural_confidence=50.0,
+        emotional_confidence=55.0, overall_confidence=62.0, stress_index=stress,
+        stress_trend="STABLE", stress_components={},
+    )
+    return SimpleNamespace(
+        confidence=confidence, face_metrics=None, hand_metrics=None,
+        audio_metrics={"volume_rms": volume}, posture_metrics=None,
+        heatmap=None, alerts=list(alerts),
+    )
+
+
+def test_clamp_interval_honours_client_request():
+    assert OutboundEmitter.clamp_interval(100) == 100
+    assert OutboundEmitter.clamp_interval(1) == MIN_EMIT_INTERVAL_MS
+    assert OutboundEmitter.clamp_interval(10 ** 6) == MAX_EMIT_INTERVAL_MS
+    assert OutboundEmitter.clamp_interval(None) == settings.METRICS_EMIT_INTERVAL_MS
+
+
+def test_unchanged_metrics_are_not_resent():
+    sent = []
+
+    async def send(data: bytes):
+        sent.append(orjson.loads(data))
+
+    async def run():
+        emitter = OutboundEmitter("s1", send, interval_ms=50, envelope=True)
+        emitter.push(snapshot(1.0))
+        await emitter._flush()
+        emitter.push(snapshot(1.5))                 # same metrics, newer timestamp
+        await emitter._flush()
+        emitter.push(snapshot(2.0, alerts=[SimpleNamespace(
+            alert_type="ANOMALY", severity="HIGH", indicator="x", value=1, threshold=0,
+            description="d", recommendation="r")]))
+        await emitter._flush()
+        emitter.push(snapshot(2.5, stress=55.0))
+        await emitter._flush()
+        return emitter
+
+    emitter = asyncio.run(run())
+    assert [m["data"]["metrics"]["timestamp"] for m in sent] == [1.0, 2.0, 2.5]
+    assert len(sent[1]["data"]["alerts"]) == 1
+    assert emitter.unchanged_skipped == 1
+    assert emitter.stats()["emit_interval_ms"] == 50
+
+
+def test_numpy_scalars_serialize():
+    sent = []
+
+    async def send(data: bytes):
+        sent.append(orjson.loads(data))
+
+    async def run():
+        emitter = OutboundEmitter("s1", send)
+        emitter.push(snapshot(1.0, volume=np.float64(-18.5)))
+        await emitter._flush()
+
+    asyncio.run(run())
+    assert sent[0]["type"] == "metrics"
+    assert sent[0]["data"]["audio"]["volume_rms"] == -18.5
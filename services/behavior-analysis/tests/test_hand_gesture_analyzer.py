@@ -0,0 +1,58 @@
+"""HandGestureAnalyzer history minimums and time-based windows."""
+
+import numpy as np
+import pytest
+
+from analyzers.hand_gesture_analyzer import HandGestureAnalyzer
+
+W, H = 640, 480
+
+
+def oscillating_hand(i: int) -> np.ndarray:
+    """All 21 points jump ±6 px in x and ±4 px in y on every sample."""
+    return np.tile([300 + 6 * (-1) ** i, 200 + 4 * (-1) ** i, 0.0], (21, 1))
+
+
+def feed(analyzer: HandGestureAnalyzer, samples: int, rate_hz: float):
+    metrics = None
+    for i in range(samples):
+        metrics = analyzer.process_landmarks({0: oscillating_hand(i)}, None, W, H, 1000.0 + i / rate_hz)
+    return metrics
+
+
+@pytest.mark.parametrize('rate_hz', [30.0, 10.0])
+def test_tremor_fidget_and_tapping_need_ten_samples(rate_hz):
+    analyzer = HandGestureAnalyzer()
+    m = feed(analyzer, 9, rate_hz)          # 9 tip samples, 8 speeds
+    assert m.tremor_score == 0 and m.fidgeting_score == 0 and not m.tapping_detected
+    assert m.jitter_score == 0              # constant speed: gated in, but no spread
+
+    m = feed(analyzer, 2, rate_hz)          # continues the same alternation: 11 tips, 10 speeds
+    assert m.tremor_score > 0 and m.fidgeting_score > 0
+
+
+def test_jitter_and_gesturing_need_five_samples():
+    analyzer = HandGestureAnalyzer()
+    assert analyzer.JITTER_MIN_SAMPLES == analyzer.GESTURE_MIN_SAMPLES == 5
+    for i in range(5):                      # 4 speeds
+        analyzer.process_landmarks({0: np.tile([100.0 + 40 * i, 200.0, 0.0], (21, 1))}, None, W, H, 1000.0 + i / 30)
+    assert not analyzer._detect_active_gesturing({0: None}, 1000.0 + 4 / 30)
+    analyzer.process_landmarks({0: np.tile([300.0, 200.0, 0.0], (21, 1))}, None, W, H, 1000.0 + 5 / 30)
+    assert analyzer._detect_active_gesturing({0: None}, 1000.0 + 5 / 30)
+
+
+def test_slow_rate_widens_the_window_to_the_minimum():
+    analyzer = HandGestureAnalyzer()
+    feed(analyzer, 20, 10.0)
+    now = 1000.0 + 19 / 10.0
+    # TAP_WINDOW_S (1/3 s) holds only 4 samples at 10 Hz; the 10 most recent are used
+    tips, times = analyzer._recent(analyzer._finger_tip_history[0], analyzer._tip_times[0], now,
+                                   analyzer.TAP_WINDOW_S, analyzer.TAP_MIN_SAMPLES)
+    assert len(tips) == 10 and times[-1] == pytest.approx(now)
+    # at 30 fps the window itself already spans the minimum
+    analyzer = HandGestureAnalyzer()
+    feed(analyzer, 40, 30.0)
+    now = 1000.0 + 39 / 30.0
+    tips, _ = analyzer._recent(analyzer._finger_tip_history[0], analyzer._tip_times[0], now,
+                               analyzer.TREMOR_WINDOW_S, analyzer.TREMOR_MIN_SAMPLES)
+    assert len(tips) == 15
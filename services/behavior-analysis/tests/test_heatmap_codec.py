@@ -0,0 +1,117 @@
+"""Heatmap wire formats: RLE and keyframe/delta round trips."""
+
+import base64
+import zlib
+
+import numpy as np
+import pytest
+
+from analyzers.stress_heatmap import HeatmapFrame
+from pipeline.heatmap_codec import HeatmapEncoder, apply_delta, rle_decode, rle_encode
+
+ROWS, COLS = 48, 64
+
+
+def frame(pixels: np.ndarray) -> HeatmapFrame:
+    return HeatmapFrame(
+        timestamp=0.0, pixels=pixels, resolution=(pixels.shape[1], pixels.shape[0]),
+        peak_zones=[], overall_stress_level=0.0, dominant_indicator="none",
+    )
+
+
+class Client:
+    """Reference decoder, as a client would implement it."""
+
+    def __init__(self):
+        self.keyframe = None
+
+    def decode(self, payload: dict) -> np.ndarray:
+        data = base64.b64decode(payload["data"])
+        width, height = payload["resolution"]
+        if payload["encoding"] == "delta-rle":
+            body = rle_decode(data)
+        else:
+            body = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+        body = body.reshape(height, width)
+        if payload["keyframe"]:
+            self.keyframe = body.copy()
+            return body
+        return apply_delta(self.keyframe, body)
+
+
+def sequence(seed: int = 0, n: int = 12) -> list:
+    """Smoothly changing heatmaps with hot spots, values across the whole 0-255 range."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:ROWS, 0:COLS]
+    frames = []
+    for i in range(n):
+        cy, cx = 10 + i, 20 + 2 * i
+        blob = 255 * np.exp(-((y - cy) ** 2 + (x - cx) ** 2) / 60.0)
+        noise = rng.integers(0, 3, size=(ROWS, COLS))
+        frames.append(np.clip(blob + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+@pytest.mark.parametrize("data", [
+    np.zeros(0, dtype=np.uint8),
+    np.array([7], dtype=np.uint8),
+    np.zeros(1000, dtype=np.uint8),                       # one run split into 255-pieces
+    np.repeat(np.arange(10, dtype=np.uint8), [1, 255, 256, 510, 511, 2, 3, 1, 0, 300]),
+    np.random.default_rng(1).integers(0, 256, 4096).astype(np.uint8),
+])
+def test_rle_round_trip(data):
+    encoded = rle_encode(data)
+    assert len(encoded) % 2 == 0
+    assert all(run > 0 for run in encoded[0::2])
+    np.testing.assert_array_equal(rle_decode(encoded), data)
+
+
+@pytest.mark.parametrize("fmt", ["delta-rle", "delta-zlib"])
+def test_delta_round_trip(fmt):
+    encoder = HeatmapEncoder(fmt, keyframe_interval=5)
+    client = Client()
+    keyframes = []
+    for pixels in sequence():
+        payload = encoder.encode(frame(pixels))
+        keyframes.append(payload["keyframe"])
+        np.testing.assert_array_equal(client.decode(payload), pixels)
+    assert keyframes == [True, False, False, False, False] * 2 + [True, False]
+
+
+@pytest.mark.parametrize("fmt", ["delta-rle", "delta-zlib"])
+def test_delta_wraps_mod_256(fmt):
+    encoder = HeatmapEncoder(fmt, keyframe_interval=10)
+    client = Client()
+    key = np.full((ROWS, COLS), 250, dtype=np.uint8)
+    later = key.copy()
+    later[:, :10] = 3                                    # negative delta
+    later[:, 10:20] = 255
+    for pixels in (key, later, key):
+        np.testing.assert_array_equal(client.decode(encoder.encode(frame(pixels))), pixels)
+
+
+@pytest.mark.parametrize("fmt", ["delta-rle", "delta-zlib"])
+def test_resolution_change_and_reset_force_keyframe(fmt):
+    encoder = HeatmapEncoder(fmt, keyframe_interval=100)
+    client = Client()
+    small = np.arange(12 * 16, dtype=np.uint8).reshape(12, 16)
+    assert encoder.encode(frame(sequence()[0]))["keyframe"]
+    payload = encoder.encode(frame(small))
+    assert payload["keyframe"]
+    np.testing.assert_array_equal(client.decode(payload), small)
+    assert not encoder.encode(frame(small))["keyframe"]
+    encoder.reset()
+    assert encoder.encode(frame(small))["keyframe"]
+
+
+def test_raw_and_list_formats():
+    pixels = sequence()[3]
+    raw = HeatmapEncoder("raw").encode(frame(pixels))
+    decoded = np.frombuffer(base64.b64decode(raw["data"]), dtype=np.uint8).reshape(ROWS, COLS)
+    np.testing.assert_array_equal(decoded, pixels)
+    assert HeatmapEncoder("list").encode(frame(pixels))["grid"] == pixels.tolist()
+
+
+def test_unknown_format_rejected():
+    with pytest.raises(ValueError):
+        HeatmapEncoder("gif")
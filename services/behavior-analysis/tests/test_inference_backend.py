@@ -0,0 +1,290 @@
+"""
+Backend contract and parity: MediaPipe vs ONNX on stubbed ORT sessions.
+
+The frame encodes each pixel's own coordinates (R = x, G = y, B = 255
+inside the image), so a stub landmark model can recover where its crop
+came from by fitting an affine to the crop's pixels, independently of the
+backend's ROI code, and report the ground-truth landmarks in crop
+coordinates. Projection back to normalized image coordinates must then
+reproduce the ground truth, on detection and on tracked frames.
+"""
+
+import math
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from analyzers import inference_backend, onnx_backend
+from analyzers.inference_backend import InferenceBackend, Landmarks, MediaPipeBackend
+from analyzers.micro_batcher import MicroBatcher
+
+W, H = 256, 192
+SIDE = max(W, H)
+PAD_X, PAD_Y = (SIDE - W) // 2, (SIDE - H) // 2
+
+
+def coordinate_frame() -> np.ndarray:
+    ys, xs = np.mgrid[0:H, 0:W]
+    return np.dstack([xs, ys, np.full_like(xs, 255)]).astype(np.uint8)
+
+
+def truth_hand() -> np.ndarray:
+    """21 normalized points: wrist below, fingers pointing up and slightly right."""
+    rng = np.random.default_rng(1)
+    pts = np.zeros((21, 3))
+    pts[0] = (0.45, 0.70, 0.0)
+    for finger in range(5):
+        for joint in range(4):
+            i = 1 + finger * 4 + joint
+            pts[i, 0] = 0.38 + 0.035 * finger + 0.01 * joint
+            pts[i, 1] = 0.60 - 0.05 * joint
+    pts[9] = (0.46, 0.58, 0.0)      # middle-finger MCP
+    pts[:, 2] = rng.uniform(-0.05, 0.05, 21)
+    return pts
+
+
+def truth_face() -> np.ndarray:
+    """478 normalized points on a slightly tilted ellipse; 33 / 263 are the eye corners."""
+    rng = np.random.default_rng(2)
+    t = rng.uniform(0, 2 * np.pi, 478)
+    r = np.sqrt(rng.uniform(0, 1, 478))
+    pts = np.column_stack([0.5 + 0.12 * r * np.cos(t), 0.5 + 0.16 * r * np.sin(t), rng.uniform(-0.05, 0.05, 478)])
+    pts[33] = (0.44, 0.45, 0.0)
+    pts[263] = (0.56, 0.47, 0.0)
+    return pts
+
+
+# ── Stub ORT sessions ────────────────────────────────────────────────────────────
+
+class _Session:
+    def __init__(self, shape):
+        self._input = SimpleNamespace(name='input', shape=shape)
+
+    def get_inputs(self):
+        return [self._input]
+
+    def get_providers(self):
+        return ['CPUExecutionProvider']
+
+
+class DetectorSession(_Session):
+    """One detection built from the ground truth, or none on a blank frame."""
+
+    def __init__(self, size, strides, box_points, keypoints):
+        super().__init__(['N', size, size, 3])
+        self.size = size
+        self.anchors = onnx_backend.ssd_anchors(size, strides)
+        self.box_points, self.keypoints = box_points, keypoints
+        self.calls = 0
+
+    def run(self, _, feeds):
+        self.calls += 1
+        x = feeds['input']
+        n = len(self.anchors)
+        k = len(self.keypoints)
+        regs = np.zeros((1, n, 4 + 2 * k), dtype=np.float32)
+        scores = np.full((1, n, 1), -10.0, dtype=np.float32)
+        if x.max() > x.min():
+            # Ground truth → letterboxed square (normalized) → model pixels relative to anchor 0
+            sq = lambda p: (p * (W, H) + (PAD_X, PAD_Y)) / SIDE
+            box = sq(self.box_points)
+            lo, hi = box.min(axis=0), box.max(axis=0)
+            anchor = self.anchors[0]
+            regs[0, 0, :2] = ((lo + hi) / 2 - anchor) * self.size
+            regs[0, 0, 2:4] = (hi - lo) * self.size
+            regs[0, 0, 4:] = ((sq(self.keypoints) - anchor) * self.size).ravel()
+            scores[0, 0, 0] = 5.0
+        return [regs, scores]
+
+
+class LandmarkSession(_Session):
+    """Reports the ground truth in the coordinates of whatever crop it is given."""
+
+    def __init__(self, size, truth, extra):
+        super().__init__(['N', size, size, 3])
+        self.truth = truth
+        self.extra = extra          # per-item outputs after the points, e.g. presence / handedness
+
+    def run(self, _, feeds):
+        points = [self._locate(crop * 255.0) for crop in feeds['input']]
+        batch = len(points)
+        outputs = [np.stack(points).reshape(batch, -1).astype(np.float32)]
+        outputs += [np.full((batch, 1), v, dtype=np.float32) for v in self.extra]
+        return outputs
+
+    def _locate(self, crop: np.ndarray) -> np.ndarray:
+        inside = crop[..., 2] > 254.5
+        vs, us = np.nonzero(inside)
+        design = np.column_stack([us, vs, np.ones_like(us)])
+        fit, *_ = np.linalg.lstsq(design, crop[vs, us, :2], rcond=None)     # crop → image pixels
+        to_image = np.vstack([fit.T, [0, 0, 1]])
+        to_crop = np.linalg.inv(to_image)
+        img = self.truth[:, :2] * (W, H)
+        uv = (np.column_stack([img, np.ones(len(img))]) @ to_crop.T)[:, :2]
+        scale = math.sqrt(abs(np.linalg.det(to_crop[:2, :2])))              # crop px per image px
+        return np.column_stack([uv, self.truth[:, 2] * W * scale])
+
+
+@pytest.fixture
+def stub_sessions(tmp_path, monkeypatch):
+    """Stub ORT sessions by model file, served from tmp_path by a stub onnxruntime."""
+    hand, face = truth_hand(), truth_face()
+    sessions = {
+        onnx_backend.PALM_DETECTOR: DetectorSession(192, (8, 16, 16, 16), hand[[0, 1, 5, 9, 13, 17], :2],
+                                                    hand[[0, 5, 9, 13, 17, 1, 2], :2]),
+        onnx_backend.HAND_LANDMARKS: LandmarkSession(224, hand, (0.98, 0.9)),
+        onnx_backend.FACE_DETECTOR: DetectorSession(128, (8, 16, 16, 16), face[:, :2],
+                                                    face[[33, 263, 1, 13, 234, 454], :2]),
+        onnx_backend.FACE_LANDMARKS: LandmarkSession(192, face, (4.0,)),
+    }
+    for name in onnx_backend.MODELS:
+        (tmp_path / name).write_bytes(b'')
+    fake_ort = SimpleNamespace(
+        SessionOptions=SimpleNamespace,
+        ExecutionMode=SimpleNamespace(ORT_SEQUENTIAL=0),
+        GraphOptimizationLevel=SimpleNamespace(ORT_ENABLE_ALL=99),
+        InferenceSession=lambda path, sess_options=None, providers=None: sessions[os.path.basename(path)],
+    )
+    monkeypatch.setattr(onnx_backend, 'HAS_ORT', True)
+    monkeypatch.setattr(onnx_backend, 'ort', fake_ort, raising=False)
+    return sessions
+
+
+@pytest.fixture
+def onnx(stub_sessions, tmp_path):
+    """OnnxBackend on stub sessions; returns (backend, sessions by model file)."""
+    return onnx_backend.OnnxBackend(model_dir=str(tmp_path)), stub_sessions
+
+
+def mediapipe_results(points: np.ndarray, **fields) -> SimpleNamespace:
+    landmark_list = SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points])
+    return SimpleNamespace(**{k: v(landmark_list) for k, v in fields.items()})
+
+
+def assert_roi(roi: tuple, truth: np.ndarray, angle: float):
+    """Tracking ROI: rotated by `angle` and covering every ground-truth point."""
+    cx, cy, size, roi_angle = roi
+    assert roi_angle == pytest.approx(angle, abs=1e-3)
+    xy = truth[:, :2] * (W, H) - (cx, cy)
+    u = xy @ (math.cos(angle), math.sin(angle))
+    v = xy @ (-math.sin(angle), math.cos(angle))
+    assert np.abs(u).max() < size / 2 and np.abs(v).max() < size / 2
+
+
+def assert_contract(results, n_points):
+    assert isinstance(results, list)
+    for lm in results:
+        assert isinstance(lm, Landmarks)
+        assert lm.points.shape == (n_points, 3)
+        assert 0.0 <= lm.score <= 1.0
+
+
+# ── Contract ─────────────────────────────────────────────────────────────────────
+
+def test_backend_is_abstract():
+    with pytest.raises(TypeError):
+        InferenceBackend()
+
+    class Partial(InferenceBackend):
+        def face_detector(self, min_detection=0.5):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_onnx_backend_fails_fast_on_configuration(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_backend, 'HAS_ORT', False)
+    with pytest.raises(RuntimeError, match='requirements-onnx.txt'):
+        onnx_backend.OnnxBackend(model_dir=str(tmp_path))
+    monkeypatch.setattr(onnx_backend, 'HAS_ORT', True)
+    (tmp_path / onnx_backend.FACE_DETECTOR).write_bytes(b'')
+    with pytest.raises(FileNotFoundError, match=onnx_backend.HAND_LANDMARKS):
+        onnx_backend.OnnxBackend(model_dir=str(tmp_path))
+
+
+# ── Parity ───────────────────────────────────────────────────────────────────────
+
+def test_hand_landmarks_match_mediapipe(onnx):
+    backend, sessions = onnx
+    truth = truth_hand()
+    reference = inference_backend._hands(mediapipe_results(
+        truth,
+        multi_hand_landmarks=lambda lms: [lms],
+        multi_handedness=lambda _: [SimpleNamespace(classification=[SimpleNamespace(label='Right', score=0.9)])],
+    ))
+
+    graph = backend.hand_landmarker(max_hands=1)
+    frame = coordinate_frame()
+    detected = graph.process(frame)
+    tracked = graph.process(frame)
+    assert sessions[onnx_backend.PALM_DETECTOR].calls == 1        # second frame tracks from landmarks
+    dx, dy = (truth[9, :2] - truth[0, :2]) * (W, H)
+    assert_roi(graph._rois[0], truth, math.atan2(dx, -dy))        # wrist → middle MCP points up
+    for results in (reference, detected, tracked):
+        assert_contract(results, 21)
+        assert [lm.label for lm in results] == ['Right']
+        np.testing.assert_allclose(results[0].points, reference[0].points, atol=2e-3)
+
+
+def test_face_landmarks_match_mediapipe(onnx):
+    backend, sessions = onnx
+    truth = truth_face()
+    reference = inference_backend._faces(mediapipe_results(truth, multi_face_landmarks=lambda lms: [lms]))
+
+    graph = backend.face_landmarker()
+    frame = coordinate_frame()
+    detected = graph.process(frame)
+    tracked = graph.process(frame)
+    assert sessions[onnx_backend.FACE_DETECTOR].calls == 1
+    dx, dy = (truth[263, :2] - truth[33, :2]) * (W, H)
+    assert_roi(graph._rois[0], truth, math.atan2(dy, dx))         # eye line level
+    for results in (reference, detected, tracked):
+        assert_contract(results, 478)
+        np.testing.assert_allclose(results[0].points, reference[0].points, atol=2e-3)
+
+
+def test_face_detector_keypoints_match_mediapipe(onnx):
+    backend, _ = onnx
+    truth = truth_face()[[33, 263, 1, 13, 234, 454]]
+    reference = inference_backend._detections(SimpleNamespace(detections=[SimpleNamespace(
+        score=[0.99],
+        location_data=SimpleNamespace(relative_keypoints=[SimpleNamespace(x=x, y=y) for x, y, _ in truth]),
+    )]))
+    detected = backend.face_detector().process(coordinate_frame())
+    for results in (reference, detected):
+        assert_contract(results, 6)
+        np.testing.assert_allclose(results[0].points[:, :2], truth[:, :2], atol=1e-5)
+        assert (results[0].points[:, 2] == 0).all()
+
+
+@pytest.mark.parametrize('build', ['face_detector', 'face_landmarker', 'hand_landmarker'])
+def test_blank_frame_finds_nothing_on_either_backend(onnx, build):
+    backend, _ = onnx
+    blank = np.zeros((H, W, 3), dtype=np.uint8)
+    assert getattr(backend, build)().process(blank) == []
+    graph = getattr(MediaPipeBackend(), build)()
+    try:
+        assert graph.process(blank) == []
+    finally:
+        graph.close()
+
+
+# ── Batching ─────────────────────────────────────────────────────────────────────
+
+def test_only_dynamic_batch_models_are_batched(stub_sessions, tmp_path):
+    stub_sessions[onnx_backend.PALM_DETECTOR].get_inputs()[0].shape = [1, 192, 192, 3]   # tf2onnx default
+    backend = onnx_backend.OnnxBackend(model_dir=str(tmp_path), max_batch=4)
+    backend.hand_landmarker()
+    assert isinstance(backend._models[onnx_backend.HAND_LANDMARKS], MicroBatcher)
+    assert not isinstance(backend._models[onnx_backend.PALM_DETECTOR], MicroBatcher)
+    assert list(backend.batching_stats()) == [onnx_backend.HAND_LANDMARKS]
+
+
+def test_batching_off_by_default_and_on_mediapipe(stub_sessions, tmp_path):
+    backend = onnx_backend.OnnxBackend(model_dir=str(tmp_path))
+    backend.hand_landmarker()
+    assert backend.batching_stats() == {}
+    assert inference_backend.get_backend('mediapipe', max_batch=8).batching_stats() == {}
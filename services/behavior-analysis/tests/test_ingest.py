@@ -0,0 +1,54 @@
+"""SessionIngest producer side: video sequence ordering and the audio hard cap."""
+
+import asyncio
+
+from pipeline.ingest import SessionIngest
+from pipeline.protocol import SEQ_MODULUS
+
+
+def make_ingest(**kwargs) -> SessionIngest:
+    async def on_snapshot(session_id, snapshot):
+        pass
+    return SessionIngest("s1", executor=None, on_snapshot=on_snapshot, **kwargs)
+
+
+def test_video_rejects_stale_and_duplicate_seq():
+    ingest = make_ingest()
+    ingest.offer_video(b"a", seq=10)
+    ingest.offer_video(b"b", seq=9)
+    ingest.offer_video(b"c", seq=10)
+    assert ingest.frames_dropped == 2
+    assert ingest._video_slot[0] == b"a"
+
+
+def test_video_seq_survives_uint32_wrap():
+    ingest = make_ingest()
+    ingest.offer_video(b"last", seq=SEQ_MODULUS - 1)
+    ingest._video_slot = None
+    ingest.offer_video(b"wrapped", seq=0)
+    ingest._video_slot = None
+    ingest.offer_video(b"next", seq=1)
+    assert ingest.frames_dropped == 0
+    assert ingest._video_slot[0] == b"next"
+    ingest.offer_video(b"stale", seq=SEQ_MODULUS - 2)
+    assert ingest.frames_dropped == 1
+
+
+def test_audio_lane_drops_oldest_at_hard_cap_without_blocking():
+    flow = []
+
+    async def on_flow(session_id, paused):
+        flow.append(paused)
+
+    async def run():
+        ingest = make_ingest(audio_lane_size=2, on_flow=on_flow)     # hard cap 8
+        for i in range(10):
+            await asyncio.wait_for(ingest.offer_audio(bytes([i]), received_at=1.0), timeout=0.5)
+        return ingest
+
+    ingest = asyncio.run(run())
+    queued = [ingest._audio_lane.get_nowait()[0] for _ in range(ingest._audio_lane.qsize())]
+    assert queued == [bytes([i]) for i in range(2, 10)]
+    assert ingest.audio_dropped == 2
+    assert ingest.stats()["audio_dropped"] == 2
+    assert flow == [True]
@@ -0,0 +1,114 @@
+"""ModelPool warm-up, affinity, and importing without mediapipe."""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from analyzers.model_pool import ModelPool
+
+
+class FakeGraph:
+    def __init__(self):
+        self.processed = self.resets = 0
+        self.closed = False
+
+    def process(self, rgb):
+        self.processed += 1
+        return []
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_warm_builds_graphs_outside_the_lock():
+    pool = None
+    lock_free = []
+
+    def probe():
+        if pool._cond.acquire(timeout=1.0):
+            pool._cond.release()
+            lock_free.append(True)
+
+    def factory():
+        # Another thread can take the pool lock while a graph is being built
+        t = threading.Thread(target=probe)
+        t.start()
+        t.join()
+        return FakeGraph()
+
+    pool = ModelPool('fake', factory, size=3)
+    pool.warm()
+    assert lock_free == [True] * 3
+    assert pool.ready and pool.stats()['size'] == 3
+    assert all(slot.graph.processed == 1 and slot.graph.resets == 1 for slot in pool._slots)
+
+
+def test_concurrent_warm_builds_each_graph_once():
+    built = []
+
+    def factory():
+        time.sleep(0.02)
+        built.append(FakeGraph())
+        return built[-1]
+
+    pool = ModelPool('fake', factory, size=2)
+    threads = [threading.Thread(target=pool.warm) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 2 and len(pool._slots) == 2 and pool.ready
+
+
+def test_failed_warm_keeps_built_graphs_and_retries_the_rest():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("model file missing")
+        return FakeGraph()
+
+    pool = ModelPool('fake', factory, size=2)
+    with pytest.raises(RuntimeError):
+        pool.warm()
+    assert not pool.ready and len(pool._slots) == 1
+    pool.warm()
+    assert pool.ready and len(pool._slots) == 2 and len(calls) == 3
+
+
+def test_checkout_affinity_and_owner_switch_reset():
+    pool = ModelPool('fake', FakeGraph, size=1)
+    a, b = object(), object()
+    with pool.checkout(a) as graph:
+        pass
+    with pool.checkout(a) as again:
+        assert again is graph
+    assert graph.resets == 1                     # warm-up only
+    with pool.checkout(b):
+        pass
+    assert graph.resets == 2 and pool.stats()['owner_switches'] == 1
+    pool.close()
+    assert graph.closed and not pool.ready
+
+
+def test_analyzers_import_without_mediapipe():
+    code = (
+        "import sys; sys.modules['mediapipe'] = None\n"
+        "import analyzers\n"
+        "from analyzers import get_backend\n"
+        "try:\n"
+        "    get_backend('mediapipe')\n"
+        "except RuntimeError as e:\n"
+        "    print(e)\n"
+    )
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert "needs the mediapipe package" in out.stdout
@@ -0,0 +1,95 @@
+"""Binary ingest framing: 22-byte header round trip and malformed frames."""
+
+import struct
+
+import pytest
+
+from pipeline.protocol import (
+    HEADER, MAGIC, MSG_AUDIO_CHUNK, MSG_VIDEO_FRAME, SEQ_MODULUS, VERSION,
+    ProtocolError, decode_frame, encode_frame, is_binary_frame, seq_newer,
+)
+
+
+def test_header_is_22_bytes():
+    assert HEADER.format == "!2sBBHIdI"
+    assert HEADER.size == 22
+
+
+@pytest.mark.parametrize("msg_type", [MSG_VIDEO_FRAME, MSG_AUDIO_CHUNK])
+@pytest.mark.parametrize("session_id", [None, "s-1", "séance-ü"])
+def test_round_trip(msg_type, session_id):
+    payload = bytes(range(256)) * 3
+    buf = encode_frame(msg_type, payload, session_id=session_id, seq=42, capture_ts=1234.5)
+    assert is_binary_frame(buf)
+    sid_len = len(session_id.encode("utf-8")) if session_id else 0
+    assert len(buf) == HEADER.size + sid_len + len(payload)
+
+    frame = decode_frame(buf)
+    assert frame.msg_type == msg_type
+    assert frame.session_id == session_id
+    assert frame.seq == 42
+    assert frame.capture_ts == 1234.5
+    assert isinstance(frame.payload, memoryview)
+    assert bytes(frame.payload) == payload
+
+
+def test_empty_payload_and_memoryview_input():
+    buf = encode_frame(MSG_AUDIO_CHUNK, b"", session_id="s", seq=1, capture_ts=0.0)
+    frame = decode_frame(memoryview(buf))
+    assert bytes(frame.payload) == b""
+    assert frame.type_name == "audio_chunk"
+
+
+def test_seq_is_truncated_to_uint32():
+    frame = decode_frame(encode_frame(MSG_VIDEO_FRAME, b"x", seq=SEQ_MODULUS + 5, capture_ts=0.0))
+    assert frame.seq == 5
+
+
+def _raw(magic=MAGIC, version=VERSION, msg_type=MSG_VIDEO_FRAME, sid=b"", payload=b"jpeg", payload_len=None):
+    length = len(payload) if payload_len is None else payload_len
+    return HEADER.pack(magic, version, msg_type, len(sid), 0, 0.0, length) + sid + payload
+
+
+def test_bad_magic():
+    buf = _raw(magic=b"XX")
+    assert not is_binary_frame(buf)
+    with pytest.raises(ProtocolError, match="magic"):
+        decode_frame(buf)
+
+
+def test_unsupported_version():
+    with pytest.raises(ProtocolError, match="version"):
+        decode_frame(_raw(version=VERSION + 1))
+
+
+def test_unknown_message_type():
+    with pytest.raises(ProtocolError, match="type"):
+        decode_frame(_raw(msg_type=9))
+
+
+def test_short_buffer():
+    buf = _raw()[:HEADER.size - 1]
+    assert not is_binary_frame(buf)
+    with pytest.raises(ProtocolError, match="shorter"):
+        decode_frame(buf)
+
+
+@pytest.mark.parametrize("payload_len", [3, 5])
+def test_length_mismatch(payload_len):
+    with pytest.raises(ProtocolError, match="length"):
+        decode_frame(_raw(payload=b"jpeg", payload_len=payload_len))
+
+
+def test_protocol_error_is_value_error():
+    assert issubclass(ProtocolError, ValueError)
+    with pytest.raises(ValueError):
+        decode_frame(struct.pack("!2s", MAGIC) + b"\0" * 30)
+
+
+def test_seq_newer_serial_arithmetic():
+    assert seq_newer(1, 0)
+    assert not seq_newer(0, 0)
+    assert not seq_newer(0, 1)
+    assert seq_newer(0, SEQ_MODULUS - 1)
+    assert seq_newer(3, SEQ_MODULUS - 2)
+    assert not seq_newer(SEQ_MODULUS - 2, 3)
@@ -0,0 +1,77 @@
+"""Running session aggregates: Welford moments and histogram quantiles."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from session_stats import QUANTILES, RunningStat, SessionStats
+
+
+@pytest.fixture(params=[0, 1, 2])
+def scores(request) -> np.ndarray:
+    rng = np.random.default_rng(request.param)
+    return [
+        rng.uniform(0, 100, 5000),
+        np.clip(rng.normal(42, 12, 5000), 0, 100),
+        np.concatenate([np.full(900, 12.34), rng.uniform(80, 100, 100)]),
+    ][request.param]
+
+
+def fill(values) -> RunningStat:
+    stat = RunningStat()
+    for v in values:
+        stat.add(v)
+    return stat
+
+
+def test_mean_var_min_max_match_numpy(scores):
+    stat = fill(scores)
+    assert stat.count == len(scores)
+    assert stat.mean == pytest.approx(np.mean(scores), rel=1e-12, abs=1e-9)
+    assert stat.std == pytest.approx(np.std(scores), rel=1e-9, abs=1e-9)      # population std
+    assert stat.min == scores.min()
+    assert stat.max == scores.max()
+
+
+def test_quantiles_within_half_a_bin(scores):
+    stat = fill(scores)
+    for q in (1, 10, 25) + QUANTILES + (100,):
+        exact = np.percentile(scores, q, method='inverted_cdf')
+        assert abs(stat.quantile(q) - exact) <= stat._bin_width / 2 + 1e-9, q
+
+
+def test_empty_and_single_value():
+    stat = RunningStat()
+    assert stat.quantile(50) == 0.0
+    assert stat.std == 0.0
+    stat.add(73.0)
+    assert stat.std == 0.0
+    assert stat.quantile(1) == stat.quantile(99) == pytest.approx(73.0)
+    assert stat.to_dict('x')['x_p90'] == 73.0
+
+
+def test_out_of_range_values_clamp_to_end_bins():
+    stat = fill([-5.0, 150.0])
+    assert stat.quantile(1) == pytest.approx(0.0)
+    assert stat.quantile(100) == pytest.approx(100.0)
+    assert stat.mean == pytest.approx(72.5)
+
+
+def test_session_stats_bands_and_alerts():
+    def snap(ts, stress, alerts=()):
+        confidence = SimpleNamespace(overall_confidence=100 - stress, stress_index=stress, stress_trend='RISING')
+        return SimpleNamespace(timestamp=ts, confidence=confidence,
+                               alerts=[SimpleNamespace(alert_type=a) for a in alerts])
+
+    stats = SessionStats()
+    for ts, stress, alerts in [(0.0, 10, ()), (2.0, 55, ('STRESS',)), (3.5, 75, ('STRESS', 'ANOMALY')), (4.0, 20, ())]:
+        stats.update(snap(ts, stress, alerts))
+    out = stats.to_dict()
+    assert out['total_snapshots'] == 4
+    assert out['total_alerts'] == 3
+    assert out['alert_breakdown'] == {'STRESS': 2, 'ANOMALY': 1}
+    assert out['stress_band_sec'] == {'LOW': 2.0, 'MODERATE': 0.0, 'ELEVATED': 1.5, 'HIGH': 0.5}
+    assert out['stress_avg'] == 40.0
+    assert SessionStats.stress_band(30.0) == 'MODERATE'
+    assert SessionStats.stress_band(29.99) == 'LOW'
@@ -0,0 +1,99 @@
+"""SnapshotStore: column round trip, 2:1 decimation and memmap spill at capacity."""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from config import settings
+from storage.snapshot_store import HAS_AUDIO, HAS_FACE, SnapshotStore
+
+RES = (8, 6)
+
+
+def snap(i: int, heatmap: bool = True, alerts: int = 0):
+    confidence = SimpleNamespace(
+        visual_confidence=50.0, vocal_confidence=40.0, gestural_confidence=30.0,
+        emotional_confidence=20.0, overall_confidence=float(i % 100), stress_index=float(i % 97),
+        stress_trend='VOLATILE' if i % 2 else 'STABLE', stress_components={'vocal': 12.5},
+    )
+    pixels = np.full((RES[1], RES[0]), i % 256, dtype=np.uint8)
+    return SimpleNamespace(
+        timestamp=1000.0 + i, confidence=confidence,
+        face_metrics={'x': 1}, hand_metrics=None, audio_metrics={'y': 2},
+        heatmap=SimpleNamespace(timestamp=1000.0 + i, pixels=pixels) if heatmap else None,
+        alerts=[None] * alerts,
+    )
+
+
+def fill(store: SnapshotStore, n: int) -> SnapshotStore:
+    for i in range(n):
+        store.append(snap(i, alerts=i % 3))
+    return store
+
+
+def test_columns_round_trip():
+    store = fill(SnapshotStore("s", heatmap_interval=10, heatmap_resolution=RES), 25)
+    assert len(store) == store.appended == 25
+    np.testing.assert_array_equal(store.column('timestamp'), 1000.0 + np.arange(25))
+    np.testing.assert_array_equal(store.column('alerts'), np.arange(25) % 3)
+    assert np.isnan(store.column('stress_facial')).all()
+    assert (store.column('stress_vocal') == 12.5).all()
+    assert (store.column('modalities') == HAS_FACE | HAS_AUDIO).all()
+    assert store.latest()['trend'] == 'STABLE' and store.latest()['timestamp'] == 1024.0
+    assert list(store.trends()[:2]) == ['STABLE', 'VOLATILE']
+    assert not store.column('stress').flags.writeable
+    assert len(store.window(1020.0)['timestamp']) == 5
+
+    times, frames = store.heatmap_keyframes()
+    np.testing.assert_array_equal(times, [1000.0, 1010.0, 1020.0])
+    assert frames.shape == (3, RES[1], RES[0])
+    assert store.heatmap_at(1015.5)[0, 0] == 10
+    assert store.heatmap_at(999.0) is None
+    store.close()
+
+
+def test_heatmap_with_other_resolution_is_skipped():
+    store = SnapshotStore("s", heatmap_interval=1, heatmap_resolution=(4, 4))
+    store.append(snap(0))
+    assert store.heatmap_keyframes()[1].shape[0] == 0
+    assert len(store) == 1
+
+
+def test_decimation_keeps_memory_bounded_and_covers_session():
+    store = fill(SnapshotStore("s", heatmap_interval=16, max_rows=1024, spill=False, heatmap_resolution=RES), 5000)
+    ts = store.column('timestamp')
+    assert store.appended == 5000
+    assert len(store) <= 1024
+    assert store._rows.capacity <= 1024
+    assert ts[0] == 1000.0 and ts[-1] >= 1000.0 + 5000 - store._stride
+    assert (np.diff(ts) == store._stride).all()                # evenly decimated, in order
+    assert not store.stats()['spilled']
+
+    # Keyframes still sit on retained rows, and point at the right frame
+    times, frames = store.heatmap_keyframes()
+    rows = store._heatmaps.arrays['row'][:len(times)]
+    np.testing.assert_array_equal(ts[rows], times)
+    np.testing.assert_array_equal(frames[:, 0, 0], (times - 1000.0).astype(int) % 256)
+    store.close()
+
+
+def test_spill_to_memmap_at_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'SNAPSHOT_SPILL_DIR', str(tmp_path))
+    store = fill(SnapshotStore("spill", heatmap_interval=4, max_rows=1024, spill=True, heatmap_resolution=RES), 3000)
+    assert len(store) == 3000
+    assert store.stats()['spilled']
+    spill_dir = store._rows.spill_dir
+    assert spill_dir.startswith(str(tmp_path))
+    assert isinstance(store._rows.arrays['timestamp'], np.memmap)
+    np.testing.assert_array_equal(store.column('timestamp'), 1000.0 + np.arange(3000))
+    np.testing.assert_array_equal(store.column('overall'), (np.arange(3000) % 100).astype(np.float32))
+    # Only the live generation of each column stays on disk
+    assert sorted(os.listdir(spill_dir)) == sorted(f"{name}.4096.npy" for name in store._rows.arrays)
+
+    times, frames = store.heatmap_keyframes()
+    assert len(times) == 750
+    assert frames[-1, 0, 0] == 2996 % 256
+    store.close()
+    assert not os.path.exists(spill_dir)
@@ -0,0 +1,47 @@
+"""StressHeatmapGenerator: shared region kernels and time-based decay."""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from analyzers.stress_heatmap import StressHeatmapGenerator, _region_kernels
+
+
+def test_kernels_are_shared_read_only_and_bounded():
+    _region_kernels.cache_clear()
+    resolutions = [(16 + i, 12 + i) for i in range(12)] * 4
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        generators = list(pool.map(lambda res: StressHeatmapGenerator(res, half_life_s=0.142), resolutions))
+
+    assert _region_kernels.cache_info().currsize <= 8
+    a = StressHeatmapGenerator((64, 48), half_life_s=0.142)
+    b = StressHeatmapGenerator((64, 48), half_life_s=0.142)
+    assert a._masks is b._masks
+    assert not a._masks.flags.writeable
+    for generator, (width, height) in zip(generators, resolutions):
+        assert generator._masks.shape == (len(StressHeatmapGenerator.REGIONS), height, width)
+
+
+def shaky_voice():
+    return SimpleNamespace(
+        voice_tremor_score=90.0, volume_stability=10.0, silence_ratio=0.4,
+        vocal_fry_detected=True, pressed_voice_detected=True,
+    )
+
+
+@pytest.mark.parametrize("half_life_s", [0.142, 0.5])
+def test_grid_halves_after_one_half_life(half_life_s):
+    generator = StressHeatmapGenerator((64, 48), half_life_s=half_life_s)
+    painted = generator.generate(None, None, shaky_voice(), now=100.0)
+    assert painted.pixels.max() > 50
+    grid = generator._current_grid.copy()
+    generator.generate(None, None, None, now=100.0 + half_life_s)
+    np.testing.assert_allclose(generator._current_grid, grid * 0.5, rtol=1e-5, atol=1e-4)
+
+
+def test_half_life_is_required():
+    with pytest.raises(TypeError):
+        StressHeatmapGenerator((64, 48))
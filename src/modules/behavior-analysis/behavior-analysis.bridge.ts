@@ -6,11 +6,36 @@ import { EventEmitter } from 'events';
 /**
  * NestJS Bridge to the Python Behavior Analysis Microservice.
  *
- * Maintains a persistent WebSocket connection to the Python service
- * and proxies video/audio frames from the frontend → Python,
- * and metrics/alerts from Python → frontend.
+ * Maintains a single persistent WebSocket connection to the Python service
+ * and multiplexes every candidate session over it: each outbound message
+ * carries its session_id and every inbound message is tagged with one, so
+ * events are emitted as (data, sessionId) for the gateway to route.
+ *
+ * Flow control is per session: when Python signals `flow_control: pause`
+ * for a session's audio lane, further chunks for that session are held
+ * locally and flushed on `resume`.
  */
 
+// Binary ingest framing (mirrors services/behavior-analysis/pipeline/protocol.py)
+const FRAME_MAGIC = 0x4241; // "BA"
+const FRAME_VERSION = 1;
+const FRAME_HEADER_SIZE = 22;
+const MSG_VIDEO_FRAME = 1;
+const MSG_AUDIO_CHUNK = 2;
+
+function encodeBinaryFrame(msgType: number, sessionId: string, seq: number, payload: Buffer): Buffer {
+    const sid = Buffer.from(sessionId, 'utf8');
+    const header = Buffer.allocUnsafe(FRAME_HEADER_SIZE);
+    header.writeUInt16BE(FRAME_MAGIC, 0);
+    header.writeUInt8(FRAME_VERSION, 2);
+    header.writeUInt8(msgType, 3);
+    header.writeUInt16BE(sid.length, 4);
+    header.writeUInt32BE(seq >>> 0, 6);
+    header.writeDoubleBE(Date.now() / 1000, 10);
+    header.writeUInt32BE(payload.length, 18);
+    return Buffer.concat([header, sid, payload]);
+}
+
 export interface BehaviorMetrics {
     timestamp: number;
     confidence: {
@@ -41,7 +66,13 @@ export interface BehaviorAlert {
 }
 
 export interface HeatmapData {
-    grid: number[][];
+    /** Present for the legacy 'list' format. */
+    grid?: number[][];
+    /** Compact formats: 'raw' | 'delta-rle' | 'delta-zlib' | 'png' | 'webp' (base64 in `data`). */
+    encoding?: string;
+    data?: string;
+    /** Delta formats: true when `data` is a full keyframe rather than a delta. */
+    keyframe?: boolean;
     resolution: [number, number];
     peak_zones: Array<{ zone: string; intensity: number; x: number; y: number }>;
     overall_stress: number;
@@ -55,13 +86,23 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
     private reconnectTimer: NodeJS.Timeout | null = null;
     private isConnected = false;
     private pythonUrl: string;
+    private binaryFrames: boolean;
+    private emitIntervalMs: number;
+    private heatmapFormat: string;
+    private frameSeq: Map<string, number> = new Map();
+
+    // Session mapping: sessionId → start parameters (replayed on reconnect)
+    private activeSessions: Map<string, { userId: string; gtoSessionId?: string }> = new Map();
 
-    // Session mapping: clientSessionId → python session
-    private activeSessions: Map<string, string> = new Map();
+    // Audio chunks held back while Python has paused a session's audio lane
+    private pausedAudio: Map<string, string[]> = new Map();
 
     constructor(private readonly config: ConfigService) {
         super();
         this.pythonUrl = this.config.get<string>('BA_MICROSERVICE_URL', 'ws://localhost:8100/ws/analyze');
+        this.binaryFrames = this.config.get<string>('BA_BINARY_FRAMES', 'true') !== 'false';
+        this.emitIntervalMs = Number(this.config.get<string>('BA_EMIT_INTERVAL_MS', '500'));
+        this.heatmapFormat = this.config.get<string>('BA_HEATMAP_FORMAT', 'list');
     }
 
     async onModuleInit() {
@@ -82,6 +123,11 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
             this.ws.on('open', () => {
                 this.isConnected = true;
                 this.logger.log('Connected to Python Behavior Analysis service');
+                this.pausedAudio.clear();
+                // Re-open sessions that were live before a reconnect
+                for (const [sessionId, s] of this.activeSessions) {
+                    this.sendStart(sessionId, s.userId, s.gtoSessionId);
+                }
                 this.emit('bridge:connected');
             });
 
@@ -126,16 +172,23 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
     startSession(sessionId: string, userId: string, gtoSessionId?: string): boolean {
         if (!this.isConnected || !this.ws) return false;
 
-        this.activeSessions.set(sessionId, userId);
-        this.ws.send(JSON.stringify({
+        this.activeSessions.set(sessionId, { userId, gtoSessionId });
+        this.sendStart(sessionId, userId, gtoSessionId);
+
+        this.logger.log(`BA session started: ${sessionId} (${this.activeSessions.size} on connection)`);
+        return true;
+    }
+
+    private sendStart(sessionId: string, userId: string, gtoSessionId?: string) {
+        this.ws?.send(JSON.stringify({
             type: 'start',
             session_id: sessionId,
             user_id: userId,
             gto_session_id: gtoSessionId,
+            emit_interval_ms: this.emitIntervalMs,
+            envelope: true,
+            heatmap_format: this.heatmapFormat,
         }));
-
-        this.logger.log(`BA session started: ${sessionId}`);
-        return true;
     }
 
     /**
@@ -144,6 +197,10 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
      */
     sendVideoFrame(sessionId: string, frameBase64: string) {
         if (!this.isConnected || !this.ws) return;
+        if (this.binaryFrames) {
+            this.sendBinary(MSG_VIDEO_FRAME, sessionId, frameBase64);
+            return;
+        }
         this.ws.send(JSON.stringify({
             type: 'video_frame',
             session_id: sessionId,
@@ -157,6 +214,15 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
      */
     sendAudioChunk(sessionId: string, audioBase64: string) {
         if (!this.isConnected || !this.ws) return;
+        const held = this.pausedAudio.get(sessionId);
+        if (held) {
+            held.push(audioBase64);
+            return;
+        }
+        if (this.binaryFrames) {
+            this.sendBinary(MSG_AUDIO_CHUNK, sessionId, audioBase64);
+            return;
+        }
         this.ws.send(JSON.stringify({
             type: 'audio_chunk',
             session_id: sessionId,
@@ -164,6 +230,16 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
         }));
     }
 
+    /**
+     * Send media as a binary frame: raw bytes after a fixed header, no base64 on the wire.
+     */
+    private sendBinary(msgType: number, sessionId: string, payloadBase64: string) {
+        const key = `${sessionId}:${msgType}`;
+        const seq = (this.frameSeq.get(key) ?? 0) + 1;
+        this.frameSeq.set(key, seq);
+        this.ws?.send(encodeBinaryFrame(msgType, sessionId, seq, Buffer.from(payloadBase64, 'base64')));
+    }
+
     /**
      * Send combined video + audio for synchronized analysis.
      */
@@ -184,36 +260,54 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
         if (!this.isConnected || !this.ws) return;
         this.ws.send(JSON.stringify({ type: 'stop', session_id: sessionId }));
         this.activeSessions.delete(sessionId);
+        this.pausedAudio.delete(sessionId);
+        this.frameSeq.delete(`${sessionId}:${MSG_VIDEO_FRAME}`);
+        this.frameSeq.delete(`${sessionId}:${MSG_AUDIO_CHUNK}`);
         this.logger.log(`BA session stopped: ${sessionId}`);
     }
 
     // ── Receive from Python ───────────────────────────────────────────────────────
 
     private handlePythonMessage(msg: any) {
+        const sessionId: string | undefined = msg.session_id;
+
         switch (msg.type) {
+            case 'update':
+                // Coalesced envelope: latest metrics + optional heatmap + alerts since last update
+                this.emit('ba:metrics', msg.data.metrics as BehaviorMetrics, sessionId);
+                if (msg.data.heatmap) this.emit('ba:heatmap', msg.data.heatmap as HeatmapData, sessionId);
+                for (const alert of msg.data.alerts ?? []) {
+                    this.emit('ba:alert', alert as BehaviorAlert, sessionId);
+                }
+                break;
+
             case 'metrics':
-                this.emit('ba:metrics', msg.data as BehaviorMetrics);
+                this.emit('ba:metrics', msg.data as BehaviorMetrics, sessionId);
                 break;
 
             case 'heatmap':
-                this.emit('ba:heatmap', msg.data as HeatmapData);
+                this.emit('ba:heatmap', msg.data as HeatmapData, sessionId);
                 break;
 
             case 'alert':
-                this.emit('ba:alert', msg.data as BehaviorAlert);
+                this.emit('ba:alert', msg.data as BehaviorAlert, sessionId);
                 break;
 
             case 'session_summary':
-                this.emit('ba:summary', msg.data);
+                this.emit('ba:summary', msg.data, sessionId);
                 break;
 
             case 'session_started':
-                this.emit('ba:session_started', msg);
+                this.emit('ba:session_started', msg, sessionId);
+                break;
+
+            case 'flow_control':
+                this.handleFlowControl(sessionId, msg.action);
                 break;
 
             case 'error':
-                this.logger.error(`Python error: ${msg.message}`);
-                this.emit('ba:error', msg.message);
+                this.logger.error(`Python error${sessionId ? ` [${sessionId}]` : ''}: ${msg.message}`);
+                this.emit('ba:error', msg.message, sessionId);
                 break;
 
             default:
@@ -221,6 +315,17 @@ export class BehaviorAnalysisBridge extends EventEmitter implements OnModuleInit
         }
     }
 
+    private handleFlowControl(sessionId: string | undefined, action: 'pause' | 'resume') {
+        if (!sessionId) return;
+        if (action === 'pause') {
+            if (!this.pausedAudio.has(sessionId)) this.pausedAudio.set(sessionId, []);
+            return;
+        }
+        const held = this.pausedAudio.get(sessionId) ?? [];
+        this.pausedAudio.delete(sessionId);
+        for (const chunk of held) this.sendAudioChunk(sessionId, chunk);
+    }
+
     // ── Status ────────────────────────────────────────────────────────────────────
 
     get connected(): boolean {
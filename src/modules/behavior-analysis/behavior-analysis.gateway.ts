@@ -48,30 +48,40 @@ export class BehaviorAnalysisGateway implements OnGatewayConnection, OnGatewayDi
     @WebSocketServer() server: Server;
     private readonly logger = new Logger(BehaviorAnalysisGateway.name);
 
+    // BA sessionId → Socket.IO client id (bridge events are routed per session)
+    private readonly sessionClients: Map<string, string> = new Map();
+
     constructor(
         private readonly jwtService: JwtService,
         private readonly config: ConfigService,
         private readonly prisma: PrismaService,
         private readonly bridge: BehaviorAnalysisBridge,
     ) {
-        // Listen to bridge events and forward to appropriate clients
-        this.bridge.on('ba:metrics', (data: BehaviorMetrics) => {
-            this.server?.emit('ba:metrics', data);
+        // Listen to bridge events and forward to the client owning the session
+        this.bridge.on('ba:metrics', (data: BehaviorMetrics, sessionId?: string) => {
+            this.forward(sessionId, 'ba:metrics', data);
         });
 
-        this.bridge.on('ba:heatmap', (data: HeatmapData) => {
-            this.server?.emit('ba:heatmap', data);
+        this.bridge.on('ba:heatmap', (data: HeatmapData, sessionId?: string) => {
+            this.forward(sessionId, 'ba:heatmap', data);
         });
 
-        this.bridge.on('ba:alert', (data: BehaviorAlert) => {
-            this.server?.emit('ba:alert', data);
+        this.bridge.on('ba:alert', (data: BehaviorAlert, sessionId?: string) => {
+            this.forward(sessionId, 'ba:alert', data);
         });
 
-        this.bridge.on('ba:summary', (data: any) => {
-            this.server?.emit('ba:session_summary', data);
+        this.bridge.on('ba:summary', (data: any, sessionId?: string) => {
+            this.forward(sessionId, 'ba:session_summary', data);
+            if (sessionId) this.sessionClients.delete(sessionId);
         });
     }
 
+    private forward(sessionId: string | undefined, event: string, data: any) {
+        const clientId = sessionId ? this.sessionClients.get(sessionId) : undefined;
+        if (!clientId) return;
+        this.server?.to(clientId).emit(event, data);
+    }
+
     // ── Connection ────────────────────────────────────────────────────────────────
 
     async handleConnection(client: BaSocket) {
@@ -96,6 +106,7 @@ export class BehaviorAnalysisGateway implements OnGatewayConnection, OnGatewayDi
     handleDisconnect(client: BaSocket) {
         if (client.baSessionId) {
             this.bridge.stopSession(client.baSessionId);
+            this.sessionClients.delete(client.baSessionId);
         }
         this.logger.log(`BA client disconnected: ${client.id}`);
     }
@@ -110,6 +121,7 @@ export class BehaviorAnalysisGateway implements OnGatewayConnection, OnGatewayDi
         const sessionId = `ba-${client.userId}-${Date.now()}`;
         client.baSessionId = sessionId;
         client.gtoSessionId = data.gtoSessionId;
+        this.sessionClients.set(sessionId, client.id);
 
         // Start on Python side
         const started = this.bridge.startSession(sessionId, client.userId, data.gtoSessionId);